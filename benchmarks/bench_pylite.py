@@ -0,0 +1,293 @@
+"""Repeatable performance benchmarks for pylite
+
+Builds a synthetic database by scaling up data/pokemon.sql, then times the SQL file
+reader, .read, .dump, every output mode and interpreter startup.  Results are
+written as JSON so that runs can be compared::
+
+    python benchmarks/bench_pylite.py --scale 50 --output before.json
+    python benchmarks/bench_pylite.py --scale 50 --compare before.json --threshold 0.1
+
+With --compare, the exit status is 1 if any benchmark's median got slower than the
+baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from pylite.commands import handle_dot_command  # noqa: E402
+from pylite.exceptions import REPLResetEvent  # noqa: E402
+from pylite.input import SQLFileReader  # noqa: E402
+from pylite.output import get_valid_output_modes  # noqa: E402
+from pylite.session import PylitePromptSession  # noqa: E402
+
+SEED_FILE = ROOT / "data" / "pokemon.sql"
+
+BENCHMARKS: dict[str, Callable[["BenchContext"], None]] = dict()
+
+
+def benchmark(name: str) -> Callable:
+    def wrapper(func: Callable) -> Callable:
+        BENCHMARKS[name] = func
+
+        return func
+
+    return wrapper
+
+
+class BenchContext:
+    def __init__(self, workdir: Path, scale: int) -> None:
+        self.workdir = workdir
+        self.scale = scale
+        self.sql_file = workdir / "bench.sql"
+        self.db_file = workdir / "bench.db"
+        self.out_file = workdir / "out.txt"
+
+        build_sql_file(self.sql_file, scale)
+
+        with closing(sqlite3.connect(self.db_file)) as connection:
+            connection.executescript(self.sql_file.read_text())
+
+        self.session = new_session(str(self.db_file))
+
+    def dot(self, text: str, session: PylitePromptSession | None = None) -> None:
+        try:
+            handle_dot_command(text, session or self.session)
+        except REPLResetEvent:
+            pass
+
+
+def new_session(database: str) -> PylitePromptSession:
+    return PylitePromptSession(connection=sqlite3.connect(database))
+
+
+def build_sql_file(path: Path, scale: int) -> None:
+    """Write data/pokemon.sql repeated ``scale`` times, keeping names unique"""
+    lines = SEED_FILE.read_text().splitlines()
+    inserts = [line for line in lines if line.startswith("INSERT")]
+    schema = [line for line in lines if not line.startswith(("INSERT", "COMMIT"))]
+    name = re.compile(r"VALUES \((\d+),'")
+
+    with open(path, "w") as out:
+        out.write("\n".join(schema) + "\n")
+
+        for copy in range(scale):
+            suffix = f"{copy} " if copy else ""
+
+            for statement in inserts:
+                statement = name.sub(rf"VALUES (\1,'{suffix}", statement, count=1)
+                out.write(statement + "\n")
+
+        out.write("COMMIT;\n")
+
+
+@benchmark("reader.parse")
+def bench_reader(ctx: BenchContext) -> None:
+    for _ in SQLFileReader(ctx.sql_file):
+        pass
+
+
+@benchmark("dot.read")
+def bench_read(ctx: BenchContext) -> None:
+    ctx.dot(f".read {ctx.sql_file}", new_session(":memory:"))
+
+
+@benchmark("dot.read.bulk")
+def bench_read_bulk(ctx: BenchContext) -> None:
+    ctx.dot(f".read --bulk {ctx.sql_file}", new_session(":memory:"))
+
+
+@benchmark("dot.dump")
+def bench_dump(ctx: BenchContext) -> None:
+    ctx.dot(f".dump --file {os.devnull}")
+
+
+@benchmark("dot.dump.table")
+def bench_dump_table(ctx: BenchContext) -> None:
+    ctx.dot(f".dump --file {os.devnull} pokemon")
+
+
+@benchmark("dot.dump.jobs")
+def bench_dump_jobs(ctx: BenchContext) -> None:
+    ctx.dot(f".dump --jobs 4 --file {os.devnull}")
+
+
+@benchmark("dot.dump.gzip")
+def bench_dump_gzip(ctx: BenchContext) -> None:
+    ctx.dot(f".dump --gzip --file {ctx.out_file}")
+
+
+def register_mode_benchmarks() -> None:
+    for mode in get_valid_output_modes():
+        for target in ("devnull", "file"):
+
+            def bench_mode(ctx: BenchContext, mode: str = mode, target: str = target):
+                dest = os.devnull if target == "devnull" else str(ctx.out_file)
+                ctx.session.mode = mode
+                ctx.session.dest = dest
+
+                try:
+                    result = ctx.session.connection.execute("SELECT * FROM pokemon")
+                    ctx.session.write_result(result)
+                finally:
+                    del ctx.session.dest
+                    del ctx.session.mode
+
+            BENCHMARKS[f"mode.{mode}.{target}"] = bench_mode
+
+
+@benchmark("startup.import")
+def bench_startup_import(ctx: BenchContext) -> None:
+    run_python("import pylite.core")
+
+
+@benchmark("startup.session")
+def bench_startup_session(ctx: BenchContext) -> None:
+    run_python(
+        "import sqlite3; from pylite.session import PylitePromptSession; "
+        "PylitePromptSession(sqlite3.connect(':memory:'))"
+    )
+
+
+def run_python(code: str) -> None:
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def run(ctx: BenchContext, names: list[str], repeat: int) -> dict[str, dict]:
+    results = {}
+
+    for name in names:
+        timings = []
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            BENCHMARKS[name](ctx)
+            timings.append(time.perf_counter() - start)
+
+        results[name] = {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "runs": repeat,
+        }
+
+        print(f"{name:<28} {results[name]['median']:10.4f}s", file=sys.stderr)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a comparison table and return the names of regressed benchmarks"""
+    regressions = []
+
+    print(f"{'benchmark':<28} {'baseline':>10} {'current':>10} {'change':>8}")
+
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+
+        before = baseline[name]["median"]
+        after = current["median"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+
+        print(f"{name:<28} {before:10.4f} {after:10.4f} {change:+8.1%}{flag}")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the pylite benchmarks")
+
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=10,
+        help="Copies of data/pokemon.sql in the synthetic database (default: 10)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per benchmark; the median is reported (default: 3)",
+    )
+    parser.add_argument(
+        "-k",
+        dest="pattern",
+        help="Only run benchmarks whose name matches this regular expression",
+    )
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown relative to the baseline (default: 0.1 = 10%%)",
+    )
+    args = parser.parse_args()
+
+    register_mode_benchmarks()
+    names = [n for n in BENCHMARKS if not args.pattern or re.search(args.pattern, n)]
+
+    with tempfile.TemporaryDirectory(prefix="pylite-bench-") as workdir:
+        ctx = BenchContext(Path(workdir), args.scale)
+        results = run(ctx, names, args.repeat)
+        ctx.session.connection.close()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(report, out, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        if baseline["meta"].get("scale") != args.scale:
+            print("Warning: baseline was run at a different --scale", file=sys.stderr)
+
+        if compare(results, baseline["results"], args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
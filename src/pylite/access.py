@@ -0,0 +1,116 @@
+import sqlite3
+from pathlib import Path
+
+# What a session may do to its main database, from the URI it was opened with
+READ_WRITE = "read-write"
+READ_ONLY = "read-only"
+IMMUTABLE = "immutable"
+
+# Authorizer actions that change a database, and which of their arguments names it
+_WRITE_ACTIONS = {
+    sqlite3.SQLITE_INSERT: 2,
+    sqlite3.SQLITE_UPDATE: 2,
+    sqlite3.SQLITE_DELETE: 2,
+    sqlite3.SQLITE_CREATE_TABLE: 2,
+    sqlite3.SQLITE_CREATE_INDEX: 2,
+    sqlite3.SQLITE_CREATE_TRIGGER: 2,
+    sqlite3.SQLITE_CREATE_VIEW: 2,
+    sqlite3.SQLITE_CREATE_VTABLE: 2,
+    sqlite3.SQLITE_DROP_TABLE: 2,
+    sqlite3.SQLITE_DROP_INDEX: 2,
+    sqlite3.SQLITE_DROP_TRIGGER: 2,
+    sqlite3.SQLITE_DROP_VIEW: 2,
+    sqlite3.SQLITE_DROP_VTABLE: 2,
+    sqlite3.SQLITE_ALTER_TABLE: 0,
+    sqlite3.SQLITE_REINDEX: 2,
+    sqlite3.SQLITE_ANALYZE: 2,
+}
+
+# Writes to the schema table itself are let through: SQLite reports them for some
+# reads, such as of pragma table-valued functions, and real schema changes come with
+# the CREATE, DROP and ALTER actions
+_SCHEMA_TABLES = ("sqlite_master", "sqlite_schema")
+
+
+def database_uri(
+    database: str, readonly: bool = False, immutable: bool = False, uri: bool = False
+) -> str:
+    """A URI that opens ``database`` read-only or immutable, as asked
+
+    ``database`` is a file name, or with ``uri`` a URI whose own parameters (such as
+    nolock=1 or cache=shared) are kept.
+    """
+    if not uri:
+        from urllib.parse import quote
+
+        database = f"file:{quote(str(Path(database).resolve()))}"
+
+    params = []
+
+    if readonly:
+        params.append("mode=ro")
+
+    if immutable:
+        params.append("immutable=1")
+
+    if not params:
+        return database
+
+    separator = "&" if "?" in database else "?"
+
+    return database + separator + "&".join(params)
+
+
+def open_mode(uri: str | None) -> str:
+    """READ_WRITE, READ_ONLY or IMMUTABLE, for a database opened with ``uri``"""
+    if uri is None:
+        return READ_WRITE
+
+    from urllib.parse import parse_qs, urlsplit
+
+    params = parse_qs(urlsplit(uri).query)
+
+    # SQLite takes any of these for a true boolean parameter
+    if params.get("immutable", [""])[-1].lower() in ("1", "yes", "true", "on"):
+        return IMMUTABLE
+
+    if params.get("mode", [""])[-1] == "ro":
+        return READ_ONLY
+
+    return READ_WRITE
+
+
+class ReadOnlyGuard:
+    """Authorizer that refuses statements writing to the main database
+
+    Installed on read-only sessions, so that a write fails as SQLite prepares it
+    rather than once it has started running.  The temp database is left writable.
+    SQLite only reports that a statement wasn't authorized, so the table it would
+    have written to is kept in ``refused``.
+    """
+
+    def __init__(self, schema: str = "main") -> None:
+        self.schema = schema
+        self.refused: str | None = None
+
+    def __call__(
+        self,
+        action: int,
+        arg1: str | None,
+        arg2: str | None,
+        db_name: str | None,
+        trigger: str | None,
+    ) -> int:
+        position = _WRITE_ACTIONS.get(action)
+
+        if position is None:
+            return sqlite3.SQLITE_OK
+
+        args = (arg1, arg2, db_name)
+
+        if args[position] != self.schema or arg1 in _SCHEMA_TABLES:
+            return sqlite3.SQLITE_OK
+
+        self.refused = arg2 if action == sqlite3.SQLITE_ALTER_TABLE else arg1
+
+        return sqlite3.SQLITE_DENY
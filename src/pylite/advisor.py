@@ -0,0 +1,475 @@
+import math
+import re
+import sqlite3
+from collections import Counter
+from collections.abc import Iterable
+from contextlib import suppress
+from sqlite3 import Connection
+
+from pylite.catalog import SchemaCatalog, SchemaObject
+from pylite.explain import (
+    AUTOMATIC_INDEX,
+    TEMP_BTREE,
+    PlanStep,
+    loop_name,
+    query_plan,
+)
+from pylite.sqlutil import normalize_sql, quote_identifier
+
+# Most indexes .recommend-indexes suggests
+DEFAULT_MAX_INDEXES = 5
+
+# Rows an equality lookup is taken to find, as SQLite's planner assumes for an index
+# without statistics, and the share of a table a range constraint is taken to keep
+ROWS_PER_LOOKUP = 10
+RANGE_SELECTIVITY = 0.25
+# Rows assumed for a subquery, CTE or anything else that isn't a known table
+UNKNOWN_ROWS = 1000
+
+# Statements whose plans an index can change
+_WORKLOAD = re.compile(r"(?:SELECT|VALUES|WITH|INSERT|UPDATE|DELETE|REPLACE)\b", re.I)
+# The table a write statement changes
+_WRITE_TARGET = re.compile(
+    r"(?:(?:INSERT|REPLACE)(?:\s+OR\s+\w+)?\s+INTO|UPDATE(?:\s+OR\s+\w+)?"
+    r"|DELETE\s+FROM)\s+[\"`\[]?([\w$]+)",
+    re.IGNORECASE,
+)
+# "col=?", "col>?" and the like in the constraints of a SEARCH step
+_CONSTRAINT = re.compile(r"(\w+)(=|>|<|>=|<=)\?")
+_ORDER_BY = re.compile(
+    r"\b(?:ORDER|GROUP)\s+BY\s+(.+?)(?=\b(?:HAVING|ORDER|LIMIT|WINDOW)\b|\)|$)",
+    re.IGNORECASE,
+)
+_ORDER_TERM = re.compile(r"(?:([\w$]+)\.)?([\w$]+)(?:\s+(ASC|DESC))?$", re.IGNORECASE)
+
+
+class IndexCandidate:
+    def __init__(self, table: str, columns: tuple[str, ...]) -> None:
+        self.table = table
+        # Column names, each possibly followed by " DESC"
+        self.columns = columns
+
+    def key(self) -> tuple[str, tuple[str, ...]]:
+        return (self.table.lower(), tuple(c.lower() for c in self.columns))
+
+    def column_names(self) -> list[str]:
+        return [c.removesuffix(" DESC") for c in self.columns]
+
+    def definition(self, name: str) -> str:
+        columns = ", ".join(
+            quote_identifier(column) + (" DESC" if c.endswith(" DESC") else "")
+            for column, c in zip(self.column_names(), self.columns)
+        )
+        table = quote_identifier(self.table)
+
+        return f"CREATE INDEX {quote_identifier(name)} ON {table}({columns})"
+
+
+class IndexRecommendation:
+    def __init__(
+        self,
+        candidate: IndexCandidate,
+        sql: str,
+        cost_before: float,
+        cost_after: float,
+        write_cost: float,
+    ) -> None:
+        self.candidate = candidate
+        self.sql = sql
+        self.cost_before = cost_before
+        self.cost_after = cost_after
+        self.write_cost = write_cost
+
+    def __str__(self) -> str:
+        saving = 1 - self.cost_after / self.cost_before if self.cost_before else 0
+
+        return (
+            f"{self.sql};  -- est. cost {self.cost_before:,.0f} -> "
+            f"{self.cost_after:,.0f} ({saving:.0%} less), "
+            f"writes +{self.write_cost:,.0f}"
+        )
+
+
+class IndexAdvisor:
+    """Recommends indexes for a workload of SQL statements
+
+    Indexes are tried out on an in-memory copy of the database's schema, which is
+    given the database's statistics, or when it hasn't been analyzed the sizes of
+    the tables the workload mentions, so that SQLite plans statements there as it
+    would for the real data.  Close the advisor, or use it as a context manager,
+    to free the copy.
+    Candidates are built from the columns each statement filters and joins the
+    tables it reads on, the columns of the automatic indexes SQLite would build
+    for it, and its ORDER BY or GROUP BY columns when they need a temporary
+    B-tree.
+
+    A plan's cost is estimated from its steps and the table sizes, multiplying
+    through nested loops.  Indexes are picked greedily, each time the one that
+    saves the most cost across the workload after paying for the extra work it
+    adds to the workload's writes to its table.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+        self.copy = sqlite3.connect(":memory:")
+        self.catalog = SchemaCatalog(self.copy)
+        self.table_rows: dict[str, int] = {}
+        self._copy_schema()
+
+    def __enter__(self) -> "IndexAdvisor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.copy.close()
+
+    def recommend(
+        self, statements: Iterable[str], max_indexes: int = DEFAULT_MAX_INDEXES
+    ) -> list[IndexRecommendation]:
+        workload = Counter(
+            normalize_sql(sql) for sql in statements if _WORKLOAD.match(sql.lstrip())
+        )
+        self._copy_stats(workload)
+        costs = {sql: self._cost(sql) for sql in workload}
+        # Statements the copy of the schema can't plan, e.g. ones using temp tables
+        workload = Counter({sql: n for sql, n in workload.items() if costs[sql]})
+        candidates = {c.key(): c for sql in workload for c in self._candidates(sql)}
+        total = sum(costs[sql] * n for sql, n in workload.items())
+        recommendations: list[IndexRecommendation] = []
+
+        while candidates and len(recommendations) < max_indexes:
+            best = None
+            best_saving = 0.0
+
+            for key, candidate in candidates.items():
+                name = self._index_name(candidate)
+                self.copy.execute(candidate.definition(name))
+                after = self._costs_with_index(workload, costs, candidate.table)
+                self.copy.execute(f"DROP INDEX {quote_identifier(name)}")
+
+                reduction = sum(
+                    (costs[sql] - cost) * n for (sql, n), cost in after.items()
+                )
+                write_cost = self._write_cost(workload, candidate)
+                saving = reduction - write_cost
+
+                if saving > best_saving:
+                    best_saving = saving
+                    best = (key, candidate, reduction, write_cost, after)
+
+            if best is None:
+                break
+
+            key, candidate, reduction, write_cost, after = best
+            definition = candidate.definition(self._index_name(candidate))
+            self.copy.execute(definition)
+            costs.update({sql: cost for (sql, _), cost in after.items()})
+            recommendations.append(
+                IndexRecommendation(
+                    candidate, definition, total, total - reduction, write_cost
+                )
+            )
+            total -= reduction
+            del candidates[key]
+
+        return recommendations
+
+    def _copy_schema(self) -> None:
+        schema = self.connection.execute(
+            "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL "
+            "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' ORDER BY type != 'table', rowid"
+        ).fetchall()
+
+        for (sql,) in schema:
+            # Virtual tables whose module isn't available here, and what uses them
+            with suppress(sqlite3.Error):
+                self.copy.execute(sql)
+
+        self.catalog.refresh()
+
+    def _copy_stats(self, workload: Iterable[str]) -> None:
+        analyzed = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        # Only the tables the workload mentions are sized, as counting the rows of
+        # every table of a big database could take a while
+        text = "\n".join(workload)
+        tables = [
+            t
+            for t in self.catalog.find("table")
+            if re.search(rf"\b{re.escape(t.name)}\b", text, re.IGNORECASE)
+        ]
+
+        for table in tables:
+            rows = self._row_count(table, analyzed is not None)
+            self.table_rows[table.name.lower()] = rows
+
+        # An analyzed database's statistics cover its indexes too; otherwise the
+        # planner is at least told how big each table is
+        self.copy.execute("ANALYZE")
+        self.copy.execute("DELETE FROM sqlite_stat1")
+
+        if analyzed:
+            stats = self.connection.execute("SELECT * FROM sqlite_stat1").fetchall()
+        else:
+            stats = [
+                (t.name, None, str(self.table_rows[t.name.lower()])) for t in tables
+            ]
+
+        self.copy.executemany("INSERT INTO sqlite_stat1 VALUES (?, ?, ?)", stats)
+        self.copy.execute("ANALYZE sqlite_schema")
+        self.copy.commit()
+
+    def _row_count(self, table: SchemaObject, analyzed: bool) -> int:
+        if analyzed:
+            sql = "SELECT stat FROM sqlite_stat1 WHERE tbl = ? AND idx IS NULL"
+            row = self.connection.execute(sql, (table.name,)).fetchone()
+
+            if row is None:
+                sql = "SELECT stat FROM sqlite_stat1 WHERE tbl = ?"
+                row = self.connection.execute(sql, (table.name,)).fetchone()
+
+            if row is not None:
+                return int(row[0].split()[0])
+
+        sql = f"SELECT count(*) FROM {quote_identifier(table.name)}"
+
+        return self.connection.execute(sql).fetchone()[0]
+
+    def _cost(self, sql: str) -> float:
+        try:
+            plan = query_plan(self.copy, sql)
+        except sqlite3.Error:
+            return 0.0
+
+        self.catalog.refresh()
+
+        return max(self._plan_cost(plan, sql)[0], 1.0)
+
+    def _plan_cost(
+        self, steps: list[PlanStep], sql: str, outer: float = 1.0
+    ) -> tuple[float, float]:
+        """Cost of running ``steps`` ``outer`` times, and the rows they produce"""
+        cost = 0.0
+        rows = outer
+
+        for step in steps:
+            name = loop_name(step)
+
+            if name is not None:
+                table_rows = float(max(self._rows(name, sql), 1))
+                lookup = math.log2(table_rows + 1)
+
+                if AUTOMATIC_INDEX in step.flags:
+                    # Built once from the whole table, then searched
+                    cost += table_rows * lookup
+                elif step.detail.startswith("SCAN"):
+                    cost += rows * table_rows
+                    rows *= table_rows
+                    continue
+
+                matched = _search_rows(step.detail, table_rows)
+                cost += rows * (lookup + matched)
+                rows *= matched
+            elif TEMP_BTREE in step.flags:
+                cost += rows * math.log2(rows + 1)
+            elif step.children:
+                # Subqueries run once, or once per row if they're correlated
+                runs = rows if "CORRELATED" in step.detail else 1.0
+                cost += self._plan_cost(step.children, sql, runs)[0]
+
+        return cost, rows
+
+    def _rows(self, name: str, sql: str) -> int:
+        table = self.catalog.table_or_alias(name, sql)
+
+        if table is None or table.type != "table":
+            return UNKNOWN_ROWS
+
+        return self.table_rows.get(table.name.lower(), UNKNOWN_ROWS)
+
+    def _costs_with_index(
+        self, workload: Counter[str], costs: dict[str, float], table: str
+    ) -> dict[tuple[str, int], float]:
+        """New costs of the statements that mention ``table``"""
+        pattern = re.compile(rf"\b{re.escape(table)}\b", re.IGNORECASE)
+
+        return {
+            (sql, n): self._cost(sql) or costs[sql]
+            for sql, n in workload.items()
+            if pattern.search(sql)
+        }
+
+    def _write_cost(self, workload: Counter[str], candidate: IndexCandidate) -> float:
+        """Extra work the index adds to the workload's writes to its table"""
+        rows = self.table_rows.get(candidate.table.lower(), UNKNOWN_ROWS)
+        columns = [re.escape(c) for c in candidate.column_names()]
+        touches_columns = re.compile(rf"\bSET\b.*\b(?:{'|'.join(columns)})\b", re.I)
+        cost = 0.0
+
+        for sql, n in workload.items():
+            target = _WRITE_TARGET.match(sql)
+
+            if target is None or target.group(1).lower() != candidate.table.lower():
+                continue
+
+            if sql[:6].upper() == "UPDATE" and not touches_columns.search(sql):
+                continue
+
+            cost += n * math.log2(rows + 1)
+
+        return cost
+
+    def _candidates(self, sql: str) -> list[IndexCandidate]:
+        try:
+            plan = query_plan(self.copy, sql)
+        except sqlite3.Error:
+            return []
+
+        candidates = []
+
+        for step in _walk(plan):
+            name = loop_name(step)
+            table = self.catalog.table_or_alias(name, sql) if name else None
+
+            if table is None or table.type != "table":
+                continue
+
+            if AUTOMATIC_INDEX in step.flags:
+                constraints = _CONSTRAINT.findall(step.detail)
+                columns = [c for c, op in constraints if op == "="]
+                columns += [c for c, op in constraints if op != "="][:1]
+                candidates.append(IndexCandidate(table.name, tuple(columns)))
+
+            # Also for tables already searched through an index, since another one
+            # may let the planner drive the statement from a different table
+            candidates += self._column_candidates(table, name or "", sql, plan)
+
+        return candidates
+
+    def _column_candidates(
+        self, table: SchemaObject, alias: str, sql: str, plan: list[PlanStep]
+    ) -> list[IndexCandidate]:
+        equal, ranged = [], []
+        # Leave out the result columns, and the assignments of an UPDATE
+        clause = " WHERE " if sql[:6].upper() == "UPDATE" else " FROM "
+        start = sql.upper().find(clause)
+        tail = sql[start:] if start >= 0 else ""
+
+        for column in self.catalog.columns(table):
+            ref = rf"(?:(?:{re.escape(alias)}|{re.escape(table.name)})\.)?{re.escape(column)}"
+            left = rf"(?<![\w.$]){ref}\s*"
+            right = rf"\s*(?<![\w.$]){ref}(?![\w$])"
+
+            if re.search(
+                rf"{left}(?:==?|\bIN\b|\bIS\b)|(?<![<>!])==?{right}", tail, re.I
+            ):
+                equal.append(column)
+            elif re.search(rf"{left}(?:[<>]=?|\bBETWEEN\b)|[<>]=?{right}", tail, re.I):
+                ranged.append(column)
+
+        candidates = []
+
+        if equal or ranged:
+            candidates.append(IndexCandidate(table.name, tuple(equal + ranged[:1])))
+
+        candidates += [IndexCandidate(table.name, (c,)) for c in equal + ranged]
+
+        if any(TEMP_BTREE in step.flags for step in _walk(plan)):
+            order = self._order_columns(table, alias, tail)
+
+            if order:
+                candidates.append(IndexCandidate(table.name, tuple(equal + order)))
+
+        return [c for c in candidates if c.columns and not self._indexed(c)]
+
+    def _order_columns(self, table: SchemaObject, alias: str, tail: str) -> list[str]:
+        """Columns of ``table`` that ORDER BY or GROUP BY lists, if it lists only those"""
+        match = _ORDER_BY.search(tail)
+
+        if match is None:
+            return []
+
+        columns = {c.lower(): c for c in self.catalog.columns(table)}
+        order = []
+
+        for term in match.group(1).split(","):
+            parts = _ORDER_TERM.match(term.strip())
+
+            if parts is None:
+                return []
+
+            qualifier, column, direction = parts.groups()
+
+            if qualifier and qualifier.lower() not in (
+                alias.lower(),
+                table.name.lower(),
+            ):
+                return []
+
+            if column.lower() not in columns:
+                return []
+
+            desc = direction is not None and direction.upper() == "DESC"
+            order.append(columns[column.lower()] + (" DESC" if desc else ""))
+
+        return order
+
+    def _indexed(self, candidate: IndexCandidate) -> bool:
+        """Whether an existing index starts with the candidate's columns"""
+        wanted = [c.lower() for c in candidate.column_names()]
+        sql = "SELECT name FROM pragma_index_list(?)"
+
+        for (index,) in self.copy.execute(sql, (candidate.table,)).fetchall():
+            info = "SELECT name FROM pragma_index_info(?)"
+            columns = [(r[0] or "").lower() for r in self.copy.execute(info, (index,))]
+
+            if columns[: len(wanted)] == wanted:
+                return True
+
+        return False
+
+    def _index_name(self, candidate: IndexCandidate) -> str:
+        base = re.sub(
+            r"\W", "_", "_".join([candidate.table, *candidate.column_names()])
+        )
+        base = f"idx_{base}"
+        name = base
+        suffix = 2
+
+        while self.catalog.table(name) is not None or self._index_exists(name):
+            name = f"{base}_{suffix}"
+            suffix += 1
+
+        return name
+
+    def _index_exists(self, name: str) -> bool:
+        sql = "SELECT 1 FROM sqlite_master WHERE name = ? COLLATE NOCASE"
+
+        return self.copy.execute(sql, (name,)).fetchone() is not None
+
+
+def _search_rows(detail: str, table_rows: float) -> float:
+    """Rows a SEARCH step is taken to find each time it runs"""
+    constraints = _CONSTRAINT.findall(detail)
+
+    if not constraints:  # e.g. an index used only for its order
+        return table_rows
+
+    rows = table_rows
+
+    if any(op == "=" for _, op in constraints):
+        rows = min(rows, ROWS_PER_LOOKUP)
+
+    if any(op != "=" for _, op in constraints):
+        rows *= RANGE_SELECTIVITY
+
+    return max(rows, 1.0)
+
+
+def _walk(steps: list[PlanStep]) -> Iterable[PlanStep]:
+    for step in steps:
+        yield step
+        yield from _walk(step.children)
@@ -0,0 +1,246 @@
+import re
+from sqlite3 import Connection, Cursor
+from typing import Any, Sequence
+
+# Rows handed to a single executemany() call
+DEFAULT_BULK_BATCH_SIZE = 10000
+
+# Settings applied for the duration of a load when asked for.  The previous values are
+# read back first and restored afterwards.
+LOAD_PRAGMAS = {
+    "synchronous": "OFF",
+    "temp_store": "MEMORY",
+    "cache_size": "-65536",  # 64 MiB
+}
+
+_TRANSACTION_CONTROL = re.compile(
+    r"(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/)*(?:BEGIN|COMMIT|END)(?:\s+(?:DEFERRED|IMMEDIATE|EXCLUSIVE))?"
+    r"(?:\s+TRANSACTION)?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# An INSERT of a single row of literals, as written by .dump and iterdump()
+_LITERAL_INSERT = re.compile(
+    r"\s*INSERT\s+INTO\s+(\"(?:[^\"]|\"\")+\"|[A-Za-z_][\w$]*)\s*VALUES\s*\(",
+    re.IGNORECASE,
+)
+_LITERAL = re.compile(
+    r"\s*(?:'((?:[^']|'')*)'|[xX]'([0-9a-fA-F]*)'|(NULL)"
+    r"|([-+]?\d+)(?![\w.])|([-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)(?![\w.]))"
+    r"\s*([,)])",
+    re.IGNORECASE,
+)
+_STATEMENT_END = re.compile(r"\s*;?\s*$")
+
+# Integers SQLite keeps as such; larger literals become REAL
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+
+def is_transaction_control(sql: str) -> bool:
+    return _TRANSACTION_CONTROL.match(sql) is not None
+
+
+def parse_literal_insert(sql: str) -> tuple[str, list[Any]] | None:
+    """Split an INSERT of one row of literals into a statement with parameters
+
+    Returns the statement, with one placeholder per value, and the values, or None
+    for any other statement.
+    """
+    match = _LITERAL_INSERT.match(sql)
+
+    if match is None:
+        return None
+
+    values: list[Any] = []
+    position = match.end()
+
+    while True:
+        literal = _LITERAL.match(sql, position)
+
+        if literal is None:
+            return None
+
+        text, blob, null, integer, real, end = literal.groups()
+
+        if text is not None:
+            values.append(text.replace("''", "'"))
+        elif blob is not None:
+            if len(blob) % 2:
+                return None
+
+            values.append(bytes.fromhex(blob))
+        elif null is not None:
+            values.append(None)
+        elif integer is not None:
+            value = int(integer)
+
+            if not _INT64_MIN <= value <= _INT64_MAX:
+                return None
+
+            values.append(value)
+        else:
+            values.append(float(real))
+
+        position = literal.end()
+
+        if end == ")":
+            break
+
+    if _STATEMENT_END.fullmatch(sql, position) is None:
+        return None
+
+    placeholders = ",".join("?" * len(values))
+
+    return f"INSERT INTO {match.group(1)} VALUES({placeholders})", values
+
+
+class BulkLoader:
+    """Run a stream of statements and rows as a single write transaction
+
+    Rows passed to ``insert()`` are collected and sent to ``executemany()`` on one
+    prepared statement until the statement text changes or ``batch_size`` rows have
+    piled up.  Statements passed to ``execute()`` that insert a row of literals are
+    batched the same way, and other statements run as they are; BEGIN and COMMIT
+    statements in the input are dropped since the load has its own transaction.  That transaction is committed and reopened every ``commit_every``
+    rows or statements when that is non-zero.  Used as a context manager; the
+    transaction is rolled back if the block raises.
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE,
+        commit_every: int = 0,
+        load_pragmas: bool = False,
+    ) -> None:
+        self.connection = connection
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self.load_pragmas = load_pragmas
+        self.rows_written = 0
+        self._pending_sql: str | None = None
+        self._pending: list[Sequence[Any]] = []
+        self._rows_since_commit = 0
+        self._saved_pragmas: dict[str, Any] = {}
+
+    def __enter__(self) -> "BulkLoader":
+        if self.connection.in_transaction:
+            self.connection.commit()
+
+        if self.load_pragmas:
+            for pragma, value in LOAD_PRAGMAS.items():
+                saved = self.connection.execute(f"PRAGMA {pragma}").fetchone()
+                self._saved_pragmas[pragma] = saved[0]
+                self.connection.execute(f"PRAGMA {pragma} = {value}")
+
+        self.connection.execute("BEGIN")
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if exc_type is None:
+                try:
+                    # The last batch is only sent now, so it can still fail
+                    self.flush()
+                except BaseException:
+                    self.connection.rollback()
+                    raise
+
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            for pragma, value in self._saved_pragmas.items():
+                self.connection.execute(f"PRAGMA {pragma} = {value}")
+
+            self._saved_pragmas.clear()
+
+    def insert(self, sql: str, params: Sequence[Any]) -> None:
+        if sql != self._pending_sql:
+            self.flush()
+            self._pending_sql = sql
+
+        self._pending.append(params)
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def execute(self, sql: str) -> Cursor | None:
+        """Run a single statement as part of the load
+
+        Returns None for BEGIN/COMMIT statements, which are skipped, and for
+        INSERTs of literals, which are batched.
+        """
+        if is_transaction_control(sql):
+            return None
+
+        insert = parse_literal_insert(sql)
+
+        if insert is not None:
+            self.insert(*insert)
+
+            return None
+
+        self.flush()
+        result = self.connection.execute(sql)
+        self._count_written(1)
+
+        if result.rowcount > 0:
+            self.rows_written += result.rowcount
+
+        return result
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+
+        assert self._pending_sql is not None  # to appease mypy
+
+        self.connection.executemany(self._pending_sql, self._pending)
+        self.rows_written += len(self._pending)
+        self._count_written(len(self._pending))
+        self._pending = []
+
+    def _count_written(self, count: int) -> None:
+        self._rows_since_commit += count
+
+        if self.commit_every and self._rows_since_commit >= self.commit_every:
+            self.connection.commit()
+            self.connection.execute("BEGIN")
+            self._rows_since_commit = 0
+
+
+def infer_column_types(sample: Sequence[Sequence[Any]], width: int) -> list[str]:
+    """Pick INTEGER, REAL or TEXT for each column based on a sample of its values
+
+    Empty values and NULLs don't count against a type.
+    """
+    types = []
+
+    for i in range(width):
+        values = [row[i] for row in sample if i < len(row) and row[i] not in ("", None)]
+
+        if values and all(_parses_as(int, v) for v in values):
+            types.append("INTEGER")
+        elif values and all(_parses_as(float, v) for v in values):
+            types.append("REAL")
+        else:
+            types.append("TEXT")
+
+    return types
+
+
+def _parses_as(kind: type, value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+
+    if isinstance(value, (int, float)):
+        return kind is float or isinstance(value, kind)
+
+    try:
+        kind(value)
+    except (TypeError, ValueError):
+        return False
+
+    return True
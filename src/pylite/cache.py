@@ -0,0 +1,221 @@
+import re
+from collections import OrderedDict
+from sqlite3 import Connection, Cursor
+from typing import Any
+
+from pylite.sqlutil import (
+    CachedCursor,
+    CachedResult,
+    ResultCursor,
+    is_normalized_query,
+    normalize_sql,
+    quote_identifier,
+)
+
+# Limits on everything held by a ResultCache.  A single result bigger than either
+# limit is passed through without being cached.
+DEFAULT_CACHE_MAX_ROWS = 100_000
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Queries whose result can change while the database doesn't
+_VOLATILE = re.compile(
+    r"\b(?:random|randomblob|changes|total_changes|last_insert_rowid)\s*\("
+    r"|\bcurrent_(?:date|time|timestamp)\b|'now'",
+    re.IGNORECASE,
+)
+
+
+def _estimate_size(row: tuple) -> int:
+    # A rough figure that is cheap to compute: the payload of text and blobs, eight
+    # bytes for anything else, plus some overhead for the row itself
+    size = 16
+
+    for value in row:
+        if isinstance(value, (str, bytes)):
+            size += len(value)
+        else:
+            size += 8
+
+    return size
+
+
+class RecordingCursor(ResultCursor):
+    """Passes rows through from a real cursor, keeping a copy for the cache
+
+    The result is stored once the cursor is exhausted, unless it grew past the
+    cache's limits on the way or the database changed underneath it.
+    """
+
+    def __init__(
+        self, cache: "ResultCache", key: tuple, cursor: Cursor, state: tuple
+    ) -> None:
+        self.description = cursor.description
+        self._cache = cache
+        self._key = key
+        self._cursor = cursor
+        self._state = state
+        self._rows: list[tuple] | None = []
+        self._size = 0
+
+    def fetchmany(self, size: int = 1) -> list[tuple]:
+        batch = self._cursor.fetchmany(size)
+
+        if self._rows is None:
+            return batch
+
+        self._rows.extend(batch)
+        self._size += sum(_estimate_size(row) for row in batch)
+
+        if len(self._rows) > self._cache.max_rows or self._size > self._cache.max_bytes:
+            self._rows = None
+        elif len(batch) < size:
+            entry = CachedResult(self.description, self._rows, self._size)
+            self._cache.store(self._key, entry, self._state)
+            self._rows = None
+
+        return batch
+
+
+class ResultCache:
+    """Results of recent queries, keyed on their normalized SQL and parameters
+
+    Entries are only valid for the database state they were read from.  That state
+    is ``PRAGMA data_version``, which changes when another connection commits, and
+    ``PRAGMA schema_version`` of every attached database, temp included, plus the
+    connection's own ``total_changes``; when any of them moves, or a database is
+    attached or detached, the whole cache is dropped.  Beyond that, the least recently
+    used entries are evicted to stay within ``max_rows`` and ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = DEFAULT_CACHE_MAX_ROWS,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[tuple, CachedResult] = OrderedDict()
+        self._rows = 0
+        self._bytes = 0
+        self._state: tuple | None = None
+
+    def execute(
+        self, connection: Connection, sql: str, params: Any = ()
+    ) -> Cursor | ResultCursor:
+        key = self._make_key(sql, params)
+
+        if key is None:
+            return connection.execute(sql, params)
+
+        state = self._check_state(connection)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return CachedCursor(entry)
+
+        self.misses += 1
+        cursor = connection.execute(sql, params)
+
+        if cursor.description is None:
+            return cursor
+
+        return RecordingCursor(self, key, cursor, state)
+
+    def store(self, key: tuple, entry: CachedResult, state: tuple) -> None:
+        if state != self._state or key in self._entries:
+            return
+
+        self._entries[key] = entry
+        self._rows += len(entry.rows)
+        self._bytes += entry.size
+        self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._rows = 0
+        self._bytes = 0
+
+    def resize(self, max_rows: int | None = None, max_bytes: int | None = None) -> None:
+        if max_rows is not None:
+            self.max_rows = max_rows
+
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+        self._evict()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+
+        return {
+            "entries": len(self._entries),
+            "rows": self._rows,
+            "bytes": self._bytes,
+            "max_rows": self.max_rows,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": f"{hit_rate:.1%}",
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _make_key(self, sql: str, params: Any) -> tuple | None:
+        normalized = normalize_sql(sql)
+
+        if not is_normalized_query(normalized) or _VOLATILE.search(normalized):
+            return None
+
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        else:
+            params = tuple(params)
+
+        key = (normalized, params)
+
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
+
+    def _check_state(self, connection: Connection) -> tuple:
+        parts: list[Any] = [connection.total_changes]
+
+        for _, name, file in connection.execute("PRAGMA database_list").fetchall():
+            schema = quote_identifier(name)
+            parts += [
+                name,
+                file,
+                connection.execute(f"PRAGMA {schema}.data_version").fetchone()[0],
+                connection.execute(f"PRAGMA {schema}.schema_version").fetchone()[0],
+            ]
+
+        state = tuple(parts)
+
+        if state != self._state:
+            if self._entries:
+                self.invalidations += 1
+
+            self.clear()
+            self._state = state
+
+        return state
+
+    def _evict(self) -> None:
+        while self._entries and (
+            self._rows > self.max_rows or self._bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._rows -= len(entry.rows)
+            self._bytes -= entry.size
+            self.evictions += 1
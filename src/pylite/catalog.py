@@ -0,0 +1,165 @@
+import re
+from bisect import bisect_left
+from sqlite3 import Connection, DatabaseError
+
+from pylite.sqlutil import quote_identifier
+
+
+def like_to_regex(pattern: str) -> re.Pattern:
+    """Compile a LIKE pattern into the equivalent regular expression
+
+    Like SQLite's LIKE operator, "%" matches any run of characters, "_" any single
+    character, and ASCII letters match case-insensitively.
+    """
+    parts = []
+
+    for char in pattern:
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+
+    return re.compile("".join(parts), re.IGNORECASE | re.ASCII | re.DOTALL)
+
+
+class SchemaObject:
+    def __init__(
+        self, database: str, type: str, name: str, tbl_name: str, sql: str | None
+    ) -> None:
+        self.database = database
+        self.type = type
+        self.name = name
+        self.tbl_name = tbl_name
+        self.sql = sql
+
+
+class SchemaCatalog:
+    """What's defined in each database attached to a connection
+
+    The catalog is read from each schema's sqlite_master table the first time it's
+    needed and then reused until ``PRAGMA schema_version`` of one of the databases
+    changes or a database is attached or detached.  Column names are looked up one
+    table at a time, when first asked for, so that databases with thousands of
+    tables don't pay for columns nobody completes.
+
+    ``find()`` checks for schema changes itself; call ``refresh()`` before the
+    other lookups.  That keeps a burst of lookups, as made while completing a word,
+    down to a single check.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+        self.objects: list[SchemaObject] = []
+        self.databases: list[str] = []
+        self._version: tuple | None = None
+        self._columns: dict[tuple[str, str], list[str]] = {}
+        # (lowercased name, name) for every database, table, view and index, sorted
+        # so that names starting with a prefix can be found by bisection
+        self._names: list[tuple[str, str]] = []
+        self._tables: dict[str, SchemaObject] = {}
+
+    def refresh(self) -> None:
+        """Reload the catalog if the schema changed since it was last read"""
+        databases = self.connection.execute("PRAGMA database_list").fetchall()
+        version = tuple((name, self._schema_version(name)) for _, name, _ in databases)
+
+        if version == self._version:
+            return
+
+        self.databases = [name for _, name, _ in databases]
+        self.objects = []
+
+        for database in self.databases:
+            master = f"{quote_identifier(database)}.sqlite_master"
+            sql = f"SELECT type, name, tbl_name, sql FROM {master}"
+
+            for row in self.connection.execute(sql):
+                self.objects.append(SchemaObject(database, *row))
+
+        names = set(self.databases)
+        names.update(o.name for o in self.objects if o.type != "trigger")
+        self._names = sorted((name.lower(), name) for name in names)
+        # Tables and views by lowercased name; on a clash the first database wins
+        self._tables = {}
+
+        for o in reversed(self.objects):
+            if o.type in ("table", "view"):
+                self._tables[o.name.lower()] = o
+
+        self._columns.clear()
+        self._version = version
+
+    def find(
+        self,
+        type: str | None = None,
+        pattern: str | None = None,
+        database: str = "main",
+    ) -> list[SchemaObject]:
+        """Objects of ``type`` in ``database`` whose name matches LIKE ``pattern``"""
+        self.refresh()
+
+        regex = like_to_regex(pattern) if pattern is not None else None
+
+        return [
+            o
+            for o in self.objects
+            if o.database == database
+            and (type is None or o.type == type)
+            and (regex is None or regex.fullmatch(o.name))
+        ]
+
+    def names_starting_with(self, prefix: str) -> list[str]:
+        """Names of databases, tables, views and indexes, ignoring case"""
+        prefix = prefix.lower()
+        start = bisect_left(self._names, (prefix, ""))
+        names = []
+
+        for lowered, name in self._names[start:]:
+            if not lowered.startswith(prefix):
+                break
+
+            names.append(name)
+
+        return names
+
+    def table(self, name: str) -> SchemaObject | None:
+        """The table or view called ``name``, ignoring case"""
+        return self._tables.get(name.lower())
+
+    def table_or_alias(self, name: str, statement: str) -> SchemaObject | None:
+        """The table or view called ``name`` or aliased as it in ``statement``"""
+        table = self.table(name)
+
+        if table is not None:
+            return table
+
+        pattern = rf"([A-Za-z_][\w$]*)\s+(?:AS\s+)?{re.escape(name)}\b"
+
+        for match in re.finditer(pattern, statement, re.IGNORECASE):
+            table = self.table(match.group(1))
+
+            if table is not None:
+                return table
+
+        return None
+
+    def columns(self, table: SchemaObject) -> list[str]:
+        key = (table.database, table.name)
+
+        if key not in self._columns:
+            sql = "SELECT name FROM pragma_table_info(?, ?)"
+
+            try:
+                rows = self.connection.execute(sql, (table.name, table.database))
+                self._columns[key] = [row[0] for row in rows]
+            except DatabaseError:  # e.g. a view over a table that's gone
+                self._columns[key] = []
+
+        return self._columns[key]
+
+    def _schema_version(self, database: str) -> int:
+        pragma = f"PRAGMA {quote_identifier(database)}.schema_version"
+
+        return self.connection.execute(pragma).fetchone()[0]
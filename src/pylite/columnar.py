@@ -0,0 +1,172 @@
+import struct
+import sys
+from array import array
+from sqlite3 import Cursor
+from typing import IO, Any, Iterable
+
+from pylite.exceptions import PyliteException
+from pylite.sqlutil import ResultCursor
+
+# array typecodes and the NumPy dtypes they're written as
+INT64 = "q"
+FLOAT64 = "d"
+NPY_DESCR = {INT64: "<i8", FLOAT64: "<f8"}
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+class Column:
+    """Values of one result column, kept in a typed array while they allow it
+
+    A column starts out as 64-bit integers, or as floats if its first batch has any.
+    It is widened to floats when a float or a NULL turns up among integers, NULLs
+    becoming NaN, and falls back to a plain list once anything else appears.
+    """
+
+    def __init__(self, name: str, sample: Iterable[Any]) -> None:
+        self.name = name
+        self.values: array | list = self._initial_buffer(sample)
+
+    @staticmethod
+    def _initial_buffer(sample: Iterable[Any]) -> array | list:
+        kinds = {type(v) for v in sample if v is not None}
+
+        if kinds <= {int}:
+            return array(INT64)
+        elif kinds <= {int, float}:
+            return array(FLOAT64)
+
+        return []
+
+    def extend(self, values: tuple) -> None:
+        buffer = self.values
+
+        if isinstance(buffer, list):
+            buffer.extend(values)
+            return
+
+        size = len(buffer)
+
+        try:
+            buffer.extend(values)
+        except (TypeError, OverflowError):
+            # extend() keeps whatever it appended before the bad value
+            del buffer[size:]
+            self._widen(values)
+
+    def _widen(self, values: tuple) -> None:
+        buffer = self.values
+        assert isinstance(buffer, array)  # to appease mypy
+
+        numeric = all(v is None or type(v) in (int, float) for v in values)
+
+        if not numeric:
+            self.values = buffer.tolist() + list(values)
+            return
+
+        if buffer.typecode == INT64:
+            buffer = array(FLOAT64, buffer)
+
+        buffer.extend(float("nan") if v is None else v for v in values)
+        self.values = buffer
+
+
+def fetch_columns(cursor: Cursor | ResultCursor, batch_size: int) -> list[Column]:
+    """Fetch everything left on ``cursor`` into one Column per result column"""
+    names = [d[0] for d in cursor.description or ()]
+    batch = cursor.fetchmany(batch_size)
+    columns = [
+        Column(name, values)
+        for name, values in zip(names, zip(*batch) if batch else [()] * len(names))
+    ]
+
+    while batch:
+        for column, values in zip(columns, zip(*batch)):
+            column.extend(values)
+
+        batch = cursor.fetchmany(batch_size)
+
+    return columns
+
+
+def to_numpy(columns: list[Column]) -> dict[str, Any]:
+    """NumPy arrays of the columns' values; typed columns are not copied"""
+    import numpy  # type: ignore[import-not-found]
+
+    arrays = {}
+
+    for column in columns:
+        if isinstance(column.values, array):
+            dtype = numpy.dtype(column.values.typecode)
+            arrays[column.name] = numpy.frombuffer(column.values, dtype=dtype)
+        else:
+            arrays[column.name] = numpy.array(column.values, dtype=object)
+
+    return arrays
+
+
+def write_npy(dest: IO[bytes], column: Column) -> None:
+    """Write a column to ``dest`` in NumPy's .npy format, without needing NumPy
+
+    Integer and float columns are written as they are held.  Other columns become
+    fixed-width strings: bytes when every value is a blob, Unicode otherwise, with
+    NULL written as an empty string.
+    """
+    values = column.values
+
+    if isinstance(values, array):
+        descr = NPY_DESCR[values.typecode]
+
+        if sys.byteorder == "big":
+            values = array(values.typecode, values)
+            values.byteswap()
+
+        data = values.tobytes()
+    elif values and all(isinstance(v, bytes) for v in values):
+        width = max(1, max(len(v) for v in values))
+        descr = f"|S{width}"
+        data = b"".join(v.ljust(width, b"\0") for v in values)
+    else:
+        strings = ["" if v is None else str(v) for v in values]
+        width = max(1, max((len(s) for s in strings), default=0))
+        descr = f"<U{width}"
+        data = "".join(s.ljust(width, "\0") for s in strings).encode("utf-32-le")
+
+    header = (
+        f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({len(values)},), }}"
+    )
+    # The header is padded so that the data starts on a 64 byte boundary
+    padding = -(len(NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header += " " * padding + "\n"
+
+    dest.write(NPY_MAGIC)
+    dest.write(struct.pack("<H", len(header)))
+    dest.write(header.encode("latin1"))
+    dest.write(data)
+
+
+def write_npz(path: str, columns: list[Column]) -> None:
+    """Write the columns to an uncompressed .npz archive, one .npy per column"""
+    from zipfile import ZIP_STORED, ZipFile
+
+    seen: dict[str, int] = {}
+
+    with ZipFile(path, "w", ZIP_STORED) as archive:
+        for column in columns:
+            # numpy.load() needs unique member names
+            count = seen.get(column.name, 0)
+            seen[column.name] = count + 1
+            name = column.name if count == 0 else f"{column.name}_{count}"
+
+            with archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+                write_npy(member, column)
+
+
+def export_columns(path: str, columns: list[Column]) -> None:
+    """Write columns to ``path``: a single column to a .npy file, or an .npz"""
+    if path.endswith(".npz"):
+        write_npz(path, columns)
+    elif len(columns) != 1:
+        raise PyliteException("Only single column results can be saved as .npy")
+    else:
+        with open(path, "wb") as dest:
+            write_npy(dest, columns[0])
@@ -1,30 +1,62 @@
+import os
 import shlex
-from sqlite3 import OperationalError
-from typing import Callable, Type, TypeVar
-
-from prompt_toolkit import print_formatted_text
-from prompt_toolkit.formatted_text import FormattedText
-
-from pylite.commands.dot_command import DotCommand, DotCommandArgParser
+import sqlite3
+import sys
+import time
+from argparse import REMAINDER, Namespace
+from contextlib import closing
+from itertools import chain, islice
+from pathlib import Path
+from sqlite3 import Connection, DatabaseError, OperationalError
+from typing import Any, Callable, Iterator, Sequence, TextIO, Type, TypeVar
+
+from pylite.advisor import DEFAULT_MAX_INDEXES, IndexAdvisor
+from pylite.bulk import DEFAULT_BULK_BATCH_SIZE, BulkLoader, infer_column_types
+from pylite.cache import ResultCache
+from pylite.columnar import export_columns, fetch_columns
+from pylite.commands.dot_command import (
+    DotCommand,
+    DotCommandArgParser,
+    raw_remainder,
+)
 from pylite.commands.registry import cmd_registry
-from pylite.exceptions import REPLResetEvent, SQLReaderError
+from pylite.dbstat import object_stats, summary
+from pylite.dump import (
+    dump_tables_parallel,
+    iter_full_dump,
+    iter_internal_dump,
+    iter_table_dump,
+    open_dump_dest,
+    write_lines,
+)
+from pylite.exceptions import PyliteException, REPLResetEvent, SQLReaderError
+from pylite.explain import analyze, query_plan, render_plan, render_run
 from pylite.input import SQLFileReader
+from pylite.input.file_reader import READ_CHUNK_SIZE
 from pylite.output import get_valid_output_modes
-from pylite.session import PylitePromptSession
+from pylite.output.destinations import OUTPUT_BUFFER_SIZE
+from pylite.output.writer import DEFAULT_PAGER
+from pylite.session import PylitePromptSession, PyliteSession
+from pylite.sqlutil import CachedCursor, CachedResult, quote_identifier
+from pylite.timer import TIMER_MODES
+from pylite.tuning import TUNING_PROFILES
 
 
-def handle_dot_command(text: str, session: PylitePromptSession):
+def handle_dot_command(text: str, session: PyliteSession):
     tokens = shlex.split(text)
     command = tokens[0]
     cmd_args = tokens[1:]
 
     try:
-        cmd_registry.get(command).execute(cmd_args, session)
+        cmd_registry.get(command).run(text, cmd_args, session)
     except KeyError:
         session.write_error(f"Error: unrecognized command: {command}")
         raise REPLResetEvent
 
 
+# Pages copied per step by .backup and .restore
+DEFAULT_BACKUP_PAGES = 1024
+
 T = TypeVar("T", bound=DotCommand)
 
 
@@ -39,7 +71,7 @@ def cmd(name: str) -> Callable[[Type[T]], Type[T]]:
 
 @cmd(".quit")
 class _DotQuit(DotCommand):
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
         raise EOFError
 
     def get_parser(self) -> DotCommandArgParser:
@@ -55,21 +87,68 @@ class _DotQuit(DotCommand):
 
 @cmd(".read")
 class _DotRead(DotCommand):
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
         c_args = self.parser.parse_args(cmd_args)
         sql_file = c_args.FILE
         reader = SQLFileReader(sql_file)
 
+        if c_args.bulk:
+            self._read_bulk(reader, c_args, session)
+
+            raise REPLResetEvent
+
         try:
             for sql in reader:
-                result = session.connection.execute(sql)
+                session.start_timer()
+
+                try:
+                    with session.timed("execute"):
+                        result = session.execute(sql)
 
-                session.write_result(result)
+                    session.write_result(result)
+                finally:
+                    session.stop_timer()
         except SQLReaderError:
             session.write_error("Error: incomplete statement")
+        finally:
+            # Python opens a transaction before INSERT and the like, which nothing
+            # else commits when pylite exits after this; a BEGIN ... COMMIT in
+            # FILE has already been committed by now
+            if session.connection.in_transaction:
+                session.connection.commit()
 
         raise REPLResetEvent
 
+    def _read_bulk(
+        self, reader: SQLFileReader, c_args: Namespace, session: PyliteSession
+    ) -> None:
+        loader = BulkLoader(
+            session.connection,
+            commit_every=c_args.commit_every,
+            load_pragmas=c_args.load_pragmas,
+        )
+        started = time.perf_counter()
+
+        try:
+            with loader:
+                for sql in reader:
+                    result = loader.execute(sql)
+
+                    if result is not None:
+                        session.write_result(result)
+        except SQLReaderError:
+            session.write_error("Error: incomplete statement")
+        except DatabaseError as e:
+            # Rows are sent in batches, so the statement at fault isn't known
+            session.write_error(f"Error: {e} (load rolled back)")
+        else:
+            elapsed = time.perf_counter() - started
+            print(
+                f"Loaded {loader.rows_written} rows from {c_args.FILE} "
+                f"in {elapsed:.2f}s",
+                file=sys.stderr,
+            )
+
     def get_parser(self) -> DotCommandArgParser:
         parser = DotCommandArgParser(
             prog=self.name,
@@ -78,25 +157,261 @@ class _DotRead(DotCommand):
         )
 
         parser.add_argument("FILE")
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Load FILE in one transaction, batching INSERTs with executemany",
+        )
+        parser.add_argument(
+            "--commit-every",
+            type=int,
+            default=0,
+            metavar="N",
+            help="With --bulk, commit after roughly every N statements",
+        )
+        parser.add_argument(
+            "--load-pragmas",
+            action="store_true",
+            help="With --bulk, relax durability PRAGMAs while loading",
+        )
 
         return parser
 
 
-@cmd(".schema")
-class _DotSchema(DotCommand):
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+@cmd(".import")
+class _DotImport(DotCommand):
+    FORMATS = {
+        ".csv": "csv",
+        ".tsv": "tsv",
+        ".tab": "tsv",
+        ".ndjson": "ndjson",
+        ".jsonl": "ndjson",
+    }
+
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        import csv
+
         c_args = self.parser.parse_args(cmd_args)
-        sql = "SELECT sql from sqlite_master WHERE type = 'table'"
-        pattern = c_args.PATTERN
+        data_file = Path(c_args.FILE)
+        table = c_args.TABLE
+        connection = session.connection
+
+        if c_args.format is None:
+            c_args.format = self.FORMATS.get(data_file.suffix.lower(), "csv")
 
-        if pattern is not None:
-            sql += " AND name LIKE ?"
-            result = session.connection.execute(sql, (pattern,))
+        existing = [
+            row[1]
+            for row in connection.execute(
+                "SELECT * FROM pragma_table_info(?)", (table,)
+            ).fetchall()
+        ]
+
+        # Keys of NDJSON objects that aren't columns of the table, and so are left out
+        dropped: set[str] = set()
+
+        try:
+            with open(data_file, "r", newline="", buffering=READ_CHUNK_SIZE) as df:
+                columns, rows = self._read_rows(
+                    df,
+                    c_args.format,
+                    c_args.no_header,
+                    existing,
+                    c_args.sample,
+                    dropped,
+                )
+                self._load(session, table, columns, rows, existing, c_args)
+        except OSError as e:
+            session.write_error(f"Error: cannot open {data_file}: {e}")
+        except (csv.Error, ValueError) as e:
+            session.write_error(f"Error: {data_file}: {e}")
+        except DatabaseError as e:
+            session.write_error(f"Error: {e} (import rolled back)")
         else:
-            result = session.connection.execute(sql)
+            if dropped:
+                session.write_error(
+                    f"Warning: keys that aren't columns of {table} were left out: "
+                    + ", ".join(sorted(dropped))
+                )
+
+        raise REPLResetEvent
 
-        for schema in result.fetchall():
-            session.write_result(schema[0] + ";", mode="meta")
+    def _read_rows(
+        self,
+        df: TextIO,
+        fmt: str,
+        no_header: bool,
+        existing: list[str],
+        sample: int,
+        dropped: set[str],
+    ) -> tuple[list[str], Iterator[Sequence[Any]]]:
+        import csv
+        import json
+
+        if fmt == "ndjson":
+
+            def ndjson_objects() -> Iterator[dict]:
+                for number, line in enumerate(df, start=1):
+                    if not line.strip():
+                        continue
+
+                    try:
+                        obj = json.loads(line)
+                    except ValueError as e:
+                        raise ValueError(f"line {number}: {e}") from e
+
+                    if not isinstance(obj, dict):
+                        raise ValueError(f"line {number}: not a JSON object")
+
+                    yield obj
+
+            objects = ndjson_objects()
+            # A new table gets a column for every key found in the first objects
+            head = list(islice(objects, max(sample, 1)))
+
+            if not head:
+                return existing, iter(())
+
+            columns = existing or list(dict.fromkeys(chain.from_iterable(head)))
+            known = set(columns)
+
+            def ndjson_rows() -> Iterator[tuple]:
+                for obj in chain(head, objects):
+                    if not known.issuperset(obj):
+                        dropped.update(obj.keys() - known)
+
+                    yield tuple(
+                        json.dumps(v) if isinstance(v, (dict, list)) else v
+                        for v in map(obj.get, columns)
+                    )
+
+            return columns, ndjson_rows()
+
+        reader = csv.reader(df, delimiter="\t" if fmt == "tsv" else ",")
+        header = next(reader, None)
+
+        if header is None:
+            return existing, iter(())
+
+        if no_header:
+            columns = existing or [f"c{i}" for i in range(1, len(header) + 1)]
+
+            return columns, chain([header], reader)
+
+        return existing or header, reader
+
+    def _load(
+        self,
+        session: PyliteSession,
+        table: str,
+        columns: list[str],
+        rows: Iterator[Sequence[Any]],
+        existing: list[str],
+        c_args: Namespace,
+    ) -> None:
+        if not columns:
+            return
+
+        started = time.perf_counter()
+        loader = BulkLoader(session.connection, batch_size=c_args.batch_size)
+        placeholders = ",".join("?" * len(columns))
+        insert_sql = f"INSERT INTO {quote_identifier(table)} VALUES ({placeholders})"
+        imported = 0
+
+        with loader:
+            if not existing:
+                if c_args.infer_types:
+                    sample = list(islice(rows, c_args.sample))
+                    types = infer_column_types(sample, len(columns))
+                elif c_args.format == "ndjson":
+                    # JSON values already carry their types, so leave columns untyped
+                    sample, types = [], [""] * len(columns)
+                else:
+                    sample, types = [], ["TEXT"] * len(columns)
+
+                column_defs = ", ".join(
+                    f"{quote_identifier(c)} {t}".rstrip()
+                    for c, t in zip(columns, types)
+                )
+                loader.execute(
+                    f"CREATE TABLE {quote_identifier(table)} ({column_defs})"
+                )
+                rows = chain(sample, rows)
+
+            for imported, row in enumerate(rows, start=1):
+                loader.insert(insert_sql, row)
+
+                if c_args.progress and imported % c_args.progress == 0:
+                    self._report(imported, started)
+
+        self._report(imported, started, table=table)
+
+    def _report(self, rows: int, started: float, table: str | None = None) -> None:
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        into = f" into {table}" if table else ""
+
+        print(
+            f"Imported {rows} rows{into} in {elapsed:.2f}s ({rate:,.0f} rows/s)",
+            file=sys.stderr,
+        )
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Import data from a CSV, TSV or NDJSON FILE into TABLE",
+        )
+
+        parser.add_argument("FILE")
+        parser.add_argument("TABLE")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "tsv", "ndjson"],
+            help="Input format, guessed from the file extension by default",
+        )
+        parser.add_argument(
+            "--no-header",
+            action="store_true",
+            help="The first row is data rather than column names",
+        )
+        parser.add_argument(
+            "--infer-types",
+            action="store_true",
+            help="Pick column types from a sample when creating TABLE",
+        )
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=1000,
+            metavar="ROWS",
+            help="Number of rows examined by --infer-types, and of NDJSON objects "
+            "whose keys become the columns of a new table",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BULK_BATCH_SIZE,
+            metavar="ROWS",
+            help="Rows inserted per executemany() call",
+        )
+        parser.add_argument(
+            "--progress",
+            type=int,
+            default=100000,
+            metavar="ROWS",
+            help="Report progress every ROWS rows, 0 to disable",
+        )
+
+        return parser
+
+
+@cmd(".schema")
+class _DotSchema(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+
+        for table in session.catalog.find("table", c_args.PATTERN):
+            session.write_result(f"{table.sql};", mode="meta")
 
         raise REPLResetEvent
 
@@ -118,19 +433,11 @@ class _DotSchema(DotCommand):
 
 @cmd(".tables")
 class _DotTables(DotCommand):
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
         c_args = self.parser.parse_args(cmd_args)
-        sql = "SELECT name FROM sqlite_master WHERE type = 'table'"
-        table = c_args.TABLE
-
-        if table is not None:
-            sql += " AND name LIKE ?"
-            result = session.connection.execute(sql, (table,))
-        else:
-            result = session.connection.execute(sql)
 
-        for row in result.fetchall():
-            session.write_result(row[0], mode="meta")
+        for table in session.catalog.find("table", c_args.TABLE):
+            session.write_result(table.name, mode="meta")
 
         raise REPLResetEvent
 
@@ -148,11 +455,14 @@ class _DotTables(DotCommand):
 
 @cmd(".prompt")
 class _DotPrompt(DotCommand):
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
         c_args = self.parser.parse_args(cmd_args)
         new_message = c_args.PROMPT
         new_continuation = c_args.CONTINUATION
 
+        if not isinstance(session, PylitePromptSession):
+            raise REPLResetEvent  # no prompt to change when running non-interactively
+
         if new_message is not None:
             session.message = new_message
 
@@ -176,7 +486,7 @@ class _DotPrompt(DotCommand):
 
 @cmd(".mode")
 class _DotMode(DotCommand):
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
         c_args = self.parser.parse_args(cmd_args)
         mode = c_args.MODE
 
@@ -201,11 +511,426 @@ class _DotMode(DotCommand):
         return parser
 
 
+@cmd(".timer")
+class _DotTimer(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+        mode = c_args.MODE
+
+        if mode is not None:
+            session.timer_mode = mode
+        else:
+            session.write_result(f"Timer: {session.timer_mode}", mode="meta")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Report how long each statement takes, phase by phase",
+        )
+
+        parser.add_argument("MODE", nargs="?", default=None, choices=TIMER_MODES)
+
+        return parser
+
+
+@cmd(".cache")
+class _DotCache(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+        action = c_args.ACTION
+
+        if action == "on":
+            if session.cache is None:
+                session.cache = ResultCache()
+        elif action == "off":
+            session.cache = None
+        elif session.cache is None:
+            session.write_result("Cache: off", mode="meta")
+        elif action == "clear":
+            session.cache.clear()
+        elif action == "size":
+            session.cache.resize(c_args.rows, c_args.bytes)
+
+            for name in ("rows", "max_rows", "bytes", "max_bytes"):
+                value = session.cache.stats()[name]
+                session.write_result(f"{name}: {value}", mode="meta")
+        elif action == "stats":
+            for name, value in session.cache.stats().items():
+                session.write_result(f"{name}: {value}", mode="meta")
+        else:
+            session.write_result("Cache: on", mode="meta")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Reuse the results of queries while the database is unchanged",
+        )
+
+        parser.add_argument(
+            "ACTION",
+            nargs="?",
+            default=None,
+            choices=("on", "off", "stats", "clear", "size"),
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=None,
+            metavar="N",
+            help="With size, hold at most N rows in total",
+        )
+        parser.add_argument(
+            "--bytes",
+            type=int,
+            default=None,
+            metavar="N",
+            help="With size, hold roughly N bytes of values in total",
+        )
+
+        return parser
+
+
+@cmd(".progress")
+class _DotProgress(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+
+        if c_args.MODE is not None:
+            session.show_progress = c_args.MODE == "on"
+        else:
+            state = "on" if session.show_progress else "off"
+            session.write_result(f"Progress: {state}", mode="meta")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Show the progress of statements that run for a while",
+        )
+
+        parser.add_argument("MODE", nargs="?", default=None, choices=("on", "off"))
+
+        return parser
+
+
+@cmd(".atomic")
+class _DotAtomic(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+
+        if c_args.MODE is not None:
+            session.atomic_batches = c_args.MODE == "on"
+        else:
+            state = "on" if session.atomic_batches else "off"
+            session.write_result(f"Atomic: {state}", mode="meta")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Run input holding several statements as one transaction, "
+            "rolled back if any of them fails, instead of committing each statement",
+        )
+
+        parser.add_argument("MODE", nargs="?", default=None, choices=("on", "off"))
+
+        return parser
+
+
+@cmd(".querytimeout")
+class _DotQueryTimeout(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+        seconds = c_args.SECONDS
+
+        if seconds is not None:
+            session.statement_timeout = seconds if seconds > 0 else None
+        elif session.statement_timeout is None:
+            session.write_result("Query timeout: off", mode="meta")
+        else:
+            timeout = session.statement_timeout
+            session.write_result(f"Query timeout: {timeout:g}s", mode="meta")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Cancel statements that run longer than SECONDS, 0 for no limit",
+        )
+
+        parser.add_argument("SECONDS", nargs="?", default=None, type=float)
+
+        return parser
+
+
+@cmd(".parallel")
+class _DotParallel(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        # Imported here since pylite.runner imports this module
+        from pylite.runner import run_queries
+
+        c_args = self.parser.parse_args(cmd_args)
+        action = c_args.ACTION
+
+        if action == "begin":
+            session.parallel = []
+            session.parallel_jobs = c_args.jobs
+        elif action == "end":
+            if session.parallel is None:
+                session.write_error("Error: no .parallel block is open")
+            else:
+                queries, session.parallel = session.parallel, None
+                run_queries(session, queries, session.parallel_jobs)
+        elif session.parallel is None:
+            session.write_result("Parallel: off", mode="meta")
+        else:
+            count = len(session.parallel)
+            jobs = session.parallel_jobs
+            message = f"Parallel: {count} queries collected, {jobs} jobs"
+            session.write_result(message, mode="meta")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Collect queries between begin and end, then run them side "
+            "by side on read-only connections",
+        )
+
+        parser.add_argument("ACTION", nargs="?", default=None, choices=("begin", "end"))
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=os.cpu_count() or 4,
+            metavar="N",
+            help="Run up to N queries at once (default: the number of CPUs)",
+        )
+
+        return parser
+
+
+@cmd(".pager")
+class _DotPager(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+        setting = shlex.join(c_args.SETTING) if c_args.SETTING else None
+
+        if setting == "on":
+            session.writer.pager = os.environ.get("PAGER") or DEFAULT_PAGER
+        elif setting == "off":
+            session.writer.pager = None
+        elif setting is not None:
+            session.writer.pager = setting
+        elif session.writer.pager is None:
+            session.write_result("Pager: off", mode="meta")
+        else:
+            session.write_result(f"Pager: {session.writer.pager}", mode="meta")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Show results on the terminal through a pager, which "
+            "fetches rows as you scroll.  on uses $PAGER or " + DEFAULT_PAGER,
+        )
+
+        parser.add_argument(
+            "SETTING",
+            nargs=REMAINDER,
+            help="on, off, or the pager command to use",
+        )
+
+        return parser
+
+
+@cmd(".export")
+class _DotExport(DotCommand):
+    def run(self, text: str, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+        path = c_args.FILE
+        # Taken as typed, since splitting it would drop the quotes of its literals
+        sql = raw_remainder(text, 1 + len(cmd_args) - len(c_args.SQL))
+
+        if not sql:
+            self.parser.error("SQL is required")
+
+        if not path.endswith((".npy", ".npz")):
+            session.write_error("Error: FILE must end in .npy or .npz")
+            raise REPLResetEvent
+
+        start = time.perf_counter()
+
+        try:
+            columns = fetch_columns(session.execute(sql), session.writer.batch_size)
+            export_columns(path, columns)
+        except (DatabaseError, PyliteException, OSError) as e:
+            session.write_error(f"Error: {e}")
+            raise REPLResetEvent
+
+        elapsed = time.perf_counter() - start
+
+        if not c_args.quiet:
+            rows = len(columns[0].values) if columns else 0
+            message = f"Exported {rows} rows x {len(columns)} columns to {path}"
+            session.write_result(f"{message} in {elapsed:.2f}s", mode="meta")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Save the result of SQL column by column in NumPy's format: "
+            "a .npz archive with one array per column, or a .npy file for a single "
+            "column.  NumPy is not needed to write them",
+        )
+
+        parser.add_argument("--quiet", action="store_true", help="Don't report")
+        parser.add_argument("FILE")
+        parser.add_argument(
+            "SQL",
+            nargs=REMAINDER,
+            help="The query",
+        )
+
+        return parser
+
+
+@cmd(".explain")
+class _DotExplain(DotCommand):
+    def run(self, text: str, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+        # Taken as typed, since splitting it would drop the quotes of its literals
+        sql = raw_remainder(text, 1 + len(cmd_args) - len(c_args.SQL)).rstrip(";")
+
+        if not sql:
+            self.parser.error("SQL is required")
+
+        try:
+            plan = query_plan(session.connection, sql)
+
+            if c_args.analyze:
+                run = analyze(
+                    session.connection,
+                    session.catalog,
+                    sql,
+                    plan,
+                    session.new_progress(),
+                    session.writer.batch_size,
+                )
+        except DatabaseError as e:
+            session.write_error(f"Error: {e}")
+            raise REPLResetEvent
+
+        session.write_result(render_plan(plan), mode="meta")
+
+        if c_args.analyze:
+            session.write_result(render_run(run), mode="meta")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Show the query plan of SQL as a tree, flagging full table "
+            "scans, temporary B-trees and automatic indexes",
+        )
+
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Also run SQL and report rows, timings and the rows full scans "
+            "read.  Statements other than queries are rolled back",
+        )
+        parser.add_argument(
+            "SQL",
+            nargs=REMAINDER,
+            help="The statement",
+        )
+
+        return parser
+
+
+@cmd(".recommend-indexes")
+class _DotRecommendIndexes(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+
+        try:
+            if c_args.FILE is not None:
+                statements = list(SQLFileReader(c_args.FILE))
+            else:
+                statements = list(session.history)
+        except SQLReaderError as e:
+            session.write_error(f"Error: {e}")
+            raise REPLResetEvent
+
+        if not statements:
+            session.write_error("Error: no statements to look at; give a FILE")
+            raise REPLResetEvent
+
+        with IndexAdvisor(session.connection) as advisor:
+            recommendations = advisor.recommend(statements, c_args.max)
+
+        if not recommendations:
+            session.write_result("-- No indexes to recommend", mode="meta")
+
+        for recommendation in recommendations:
+            session.write_result(str(recommendation), mode="meta")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Suggest indexes for the SQL statements run so far, or those "
+            "in FILE, as CREATE INDEX statements, the most useful first.  Each is "
+            "tried on an in-memory copy of the schema and kept if the estimated "
+            "saving for the workload outweighs the extra cost to its writes",
+        )
+
+        parser.add_argument(
+            "--max",
+            type=int,
+            default=DEFAULT_MAX_INDEXES,
+            metavar="N",
+            help=f"Suggest at most N indexes (default: {DEFAULT_MAX_INDEXES})",
+        )
+        parser.add_argument("FILE", nargs="?", help="A file of SQL statements")
+
+        return parser
+
+
 @cmd(".output")
 class _DotOutput(DotCommand):
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
         c_args = self.parser.parse_args(cmd_args)
         dest = c_args.FILE
+
+        if c_args.buffer_size < 1:
+            session.write_error("Error: --buffer-size must be at least 1")
+            raise REPLResetEvent
+
+        session.writer.output_buffer_size = c_args.buffer_size
+        session.writer.background_output = c_args.background
         session.dest = dest
 
         raise REPLResetEvent
@@ -214,9 +939,24 @@ class _DotOutput(DotCommand):
         parser = DotCommandArgParser(
             prog=self.name,
             add_help=False,
-            description="Send output to FILE or stdout if FILE is omitted",
+            description=(
+                "Send output to FILE or stdout if FILE is omitted.  Files ending in "
+                ".gz, .xz or .bz2 are compressed."
+            ),
         )
 
+        parser.add_argument(
+            "--background",
+            action="store_true",
+            help="Write and compress the file on a separate thread",
+        )
+        parser.add_argument(
+            "--buffer-size",
+            type=int,
+            default=OUTPUT_BUFFER_SIZE,
+            metavar="BYTES",
+            help="Bytes buffered before writing to the file (default: 256 KiB)",
+        )
         parser.add_argument(
             "FILE", nargs="?", default="stdout", help="File to send output to"
         )
@@ -226,60 +966,95 @@ class _DotOutput(DotCommand):
 
 @cmd(".dump")
 class _DotDump(DotCommand):
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
         c_args = self.parser.parse_args(cmd_args)
         table_pattern = c_args.TABLE
-        data_only = c_args.data_only
         connection = session.connection
+        compression = "gzip" if c_args.gzip else "xz" if c_args.xz else None
+
+        # The current output takes text, and may be the terminal
+        if compression is not None and c_args.file is None:
+            session.write_error("Error: --gzip and --xz need --file")
+            raise REPLResetEvent
+
+        # iterdump() can't leave out the schema or be split up between workers
+        if table_pattern is None and (c_args.data_only or c_args.jobs > 1):
+            table_pattern = "%"
 
         if table_pattern is not None:
+            # Internal tables are created by SQLite; iter_internal_dump() brings
+            # along their rows
             table_sql = (
-                "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?"
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ? "
+                "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'"
             )
-            dump = []
-            tables = connection.execute(table_sql, (table_pattern,)).fetchall()
+            tables = [
+                row[0]
+                for row in connection.execute(table_sql, (table_pattern,)).fetchall()
+            ]
 
             if not tables:
                 raise REPLResetEvent
 
-            if data_only is False:
-                dump.append("BEGIN TRANSACTION;")
-
-            for table in tables:
-                table_name = table[0]
-
-                if data_only is False:
-                    schema_sql = (
-                        "SELECT sql FROM sqlite_master "
-                        "WHERE type = 'table' AND name = ?"
-                    )
-                    schema = connection.execute(schema_sql, (table_name,)).fetchone()
+        if c_args.file is None:
+            dest, close_dest = session.dest, False
+        else:
+            try:
+                dest, close_dest = open_dump_dest(c_args.file, compression), True
+            except OSError as e:
+                session.write_error(f"Error: cannot open {c_args.file}: {e}")
+                raise REPLResetEvent
 
-                    dump.append(schema[0] + ";")
+        try:
+            if table_pattern is None:
+                write_lines(dest, iter_full_dump(connection))
+            else:
+                self._dump_tables(tables, c_args, session, dest)
+        finally:
+            if close_dest:
+                dest.close()
+            else:
+                dest.flush()
 
-                tbl_info = connection.execute(
-                    "SELECT * FROM pragma_table_info(?)", (table_name,)
-                )
-                column_names = [str(row[1]) for row in tbl_info.fetchall()]
-                quotes = ",".join(["'||quote(" + col + ")||'" for col in column_names])
-                insert_statements_sql = (
-                    f"SELECT 'INSERT INTO {table_name} VALUES("
-                    + quotes
-                    + ");' FROM {table_name}"
-                )
-                insert_statements = connection.execute(insert_statements_sql)
+        raise REPLResetEvent
 
-                dump.extend([s[0] for s in insert_statements.fetchall()])
+    def _dump_tables(
+        self,
+        tables: list[str],
+        c_args: Namespace,
+        session: PyliteSession,
+        dest: TextIO,
+    ) -> None:
+        connection = session.connection
+        schema = not c_args.data_only
+        database = connection.execute("PRAGMA database_list").fetchone()[2]
 
-            if data_only is False:
-                dump.append("COMMIT;")
+        if schema:
+            dest.write("BEGIN TRANSACTION;\n")
 
-            session.write_result("\n".join(dump), mode="meta")
+        # Other connections wouldn't see changes in an open transaction
+        if c_args.jobs > 1 and database and not connection.in_transaction:
+            dump_tables_parallel(
+                database, tables, schema, c_args.jobs, dest, session.uri
+            )
         else:
-            for line in session.connection.iterdump():
-                session.write_result(line, mode="meta")
+            for table_name in tables:
+                write_lines(dest, iter_table_dump(connection, table_name, schema))
+
+        if c_args.TABLE is None:
+            write_lines(dest, iter_internal_dump(connection))
+
+        if schema:
+            if c_args.TABLE is None:
+                # Dumping everything, so bring along indexes, triggers and views too
+                other_sql = (
+                    "SELECT sql FROM sqlite_master "
+                    "WHERE type != 'table' AND sql IS NOT NULL"
+                )
+                for row in connection.execute(other_sql):
+                    dest.write(row[0] + ";\n")
 
-        raise REPLResetEvent
+            dest.write("COMMIT;\n")
 
     def get_parser(self) -> DotCommandArgParser:
         parser = DotCommandArgParser(
@@ -293,6 +1068,29 @@ class _DotDump(DotCommand):
             action="store_true",
             help="Output INSERT statements only",
         )
+        parser.add_argument(
+            "--file",
+            metavar="FILE",
+            help="Write the dump to FILE instead of the current output",
+        )
+        compression = parser.add_mutually_exclusive_group()
+        compression.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compress the dump with gzip; needs --file",
+        )
+        compression.add_argument(
+            "--xz",
+            action="store_true",
+            help="Compress the dump with xz; needs --file",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Dump tables in parallel using N read-only connections",
+        )
         parser.add_argument(
             "TABLE",
             nargs="?",
@@ -302,9 +1100,143 @@ class _DotDump(DotCommand):
         return parser
 
 
+class _PagedCopyCommand(DotCommand):
+    """Shared plumbing for commands that copy a database with the backup API"""
+
+    description = ""
+
+    def copy(
+        self,
+        source: Connection,
+        target: Connection,
+        c_args: Namespace,
+        session: PyliteSession,
+        name: str = "main",
+    ) -> None:
+        label = self.name.lstrip(".")
+
+        def progress(status: int, remaining: int, total: int) -> None:
+            done = total - remaining
+            percent = 100 * done // total if total else 100
+
+            print(
+                f"\r{label}: {percent:3d}% ({done}/{total} pages)",
+                end="",
+                file=sys.stderr,
+                flush=True,
+            )
+
+        if target.in_transaction:
+            target.commit()
+
+        try:
+            source.backup(
+                target,
+                pages=c_args.pages,
+                progress=None if c_args.quiet else progress,
+                name=name,
+                sleep=c_args.sleep,
+            )
+        except DatabaseError as e:
+            session.write_error(f"Error: {label} failed: {e}")
+        finally:
+            if not c_args.quiet:
+                print(file=sys.stderr)
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description=self.description,
+        )
+
+        parser.add_argument("FILE")
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=DEFAULT_BACKUP_PAGES,
+            metavar="N",
+            help="Pages copied per step, -1 to copy everything in one step",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            metavar="SECONDS",
+            help="Pause between steps so other connections can use the database",
+        )
+        parser.add_argument(
+            "--quiet",
+            action="store_true",
+            help="Don't display progress",
+        )
+
+        return parser
+
+
+@cmd(".backup")
+class _DotBackup(_PagedCopyCommand):
+    description = "Copy the database to FILE with SQLite's online backup API"
+
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+
+        try:
+            target = sqlite3.connect(c_args.FILE)
+        except DatabaseError as e:
+            session.write_error(f"Error: cannot open {c_args.FILE}: {e}")
+            raise REPLResetEvent
+
+        with closing(target):
+            self.copy(session.connection, target, c_args, session, name=c_args.db)
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = super().get_parser()
+
+        parser.add_argument(
+            "--db",
+            default="main",
+            help="Name of the attached database to copy (default: main)",
+        )
+
+        return parser
+
+
+@cmd(".restore")
+class _DotRestore(_PagedCopyCommand):
+    description = "Replace the database with the contents of FILE"
+
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+        from urllib.parse import quote
+
+        # The backup API writes pages directly, so the write guard never sees it
+        if session.readonly:
+            session.write_error(
+                f"Error: can't restore into the database: it was opened "
+                f"{session.open_mode}"
+            )
+            raise REPLResetEvent
+
+        source_uri = f"file:{quote(c_args.FILE)}?mode=ro"
+
+        try:
+            source = sqlite3.connect(source_uri, uri=True)
+        except DatabaseError as e:
+            session.write_error(f"Error: cannot open {c_args.FILE}: {e}")
+            raise REPLResetEvent
+
+        with closing(source):
+            self.copy(source, session.connection, c_args, session)
+
+        raise REPLResetEvent
+
+
 @cmd(".databases")
 class _DotDatabases(DotCommand):
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
         sql = "PRAGMA database_list;"
         result = session.connection.execute(sql).fetchall()
 
@@ -322,8 +1254,12 @@ class _DotDatabases(DotCommand):
 
             perms = "r/w" if writeable else "r/o"
             file = file or '""'
+            line = f"{name}: {file} {perms}"
 
-            session.write_result(f"{name}: {file} {perms}", mode="meta")
+            if name == "main" and session.uri is not None:
+                line += f" ({session.open_mode}, opened as {session.uri})"
+
+            session.write_result(line, mode="meta")
 
         raise REPLResetEvent
 
@@ -331,7 +1267,112 @@ class _DotDatabases(DotCommand):
         parser = DotCommandArgParser(
             prog=self.name,
             add_help=False,
-            description="List names and files of attached databases",
+            description="List names and files of attached databases, and how the "
+            "main database was opened",
+        )
+
+        return parser
+
+
+@cmd(".dbstat")
+class _DotDbstat(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+        schema = c_args.SCHEMA
+
+        try:
+            session.write_result(summary(session.connection, schema))
+
+            if not c_args.summary:
+                stats = object_stats(session.connection, schema)
+
+                if stats is None:
+                    session.write_error(
+                        "Sizes of tables and indexes need SQLite's dbstat virtual "
+                        "table, which this build of SQLite lacks"
+                    )
+                else:
+                    session.write_result(stats)
+        except DatabaseError as e:
+            session.write_error(f"Error: {e}")
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Show the size, free pages and cache settings of a database, "
+            "then the pages, bytes, unused space, overflow pages and fragmentation "
+            "(the percentage of pages out of order) of each table and index",
+        )
+
+        parser.add_argument(
+            "--summary",
+            action="store_true",
+            help="Show only the database-wide figures",
+        )
+        parser.add_argument(
+            "SCHEMA", nargs="?", default="main", help="Attached database to look at"
+        )
+
+        return parser
+
+
+@cmd(".tune")
+class _DotTune(DotCommand):
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        c_args = self.parser.parse_args(cmd_args)
+        profile = c_args.PROFILE
+        tuning = session.tuning
+        description = (("setting", None), ("before", None), ("after", None))
+
+        if profile is None:
+            label = tuning.profile or "none"
+            session.write_result(f"Profile: {label}", mode="meta")
+            columns = (("setting", None), ("value", None))
+            result = CachedResult(columns, tuning.current(), 0)
+            session.write_result(CachedCursor(result))
+        elif profile == "off":
+            before = tuning.current()
+
+            for name, error in tuning.restore():
+                session.write_error(f"Error: couldn't restore {name}: {error}")
+
+            changes = [
+                (name, old, new)
+                for (name, old), (_, new) in zip(before, tuning.current())
+            ]
+            session.write_result(CachedCursor(CachedResult(description, changes, 0)))
+        else:
+            try:
+                changes = tuning.apply(profile)
+            except DatabaseError as e:
+                session.write_error(f"Error: {e}")
+                raise REPLResetEvent
+
+            session.write_result(CachedCursor(CachedResult(description, changes, 0)))
+            wanted = TUNING_PROFILES[profile]["cached_statements"]
+
+            if wanted != tuning.cached_statements:
+                session.write_error(
+                    f"Note: cached_statements can only be changed when connecting; "
+                    f"start pylite with --profile {profile} for a cache of {wanted}"
+                )
+
+        raise REPLResetEvent
+
+    def get_parser(self) -> DotCommandArgParser:
+        parser = DotCommandArgParser(
+            prog=self.name,
+            add_help=False,
+            description="Apply a tuning profile to the connection and show what "
+            "changed, or show the current settings if PROFILE is omitted.  The "
+            "original settings are put back by .tune off and on exit",
+        )
+
+        parser.add_argument(
+            "PROFILE", nargs="?", choices=[*TUNING_PROFILES, "off"], default=None
         )
 
         return parser
@@ -339,7 +1380,10 @@ class _DotDatabases(DotCommand):
 
 @cmd(".help")
 class _DotHelp(DotCommand):
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
+        from prompt_toolkit import print_formatted_text
+        from prompt_toolkit.formatted_text import FormattedText
+
         c_args = self.parser.parse_args(cmd_args)
         topic_pattern = c_args.PATTERN
         show_all = c_args.all or not topic_pattern
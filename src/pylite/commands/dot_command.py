@@ -1,9 +1,11 @@
 import argparse
+import io
+import shlex
 import sys
 from typing import Never
 
 from pylite.exceptions import REPLResetEvent
-from pylite.session import PylitePromptSession
+from pylite.session import PyliteSession
 
 
 class DotCommandArgParser(argparse.ArgumentParser):
@@ -12,12 +14,41 @@ class DotCommandArgParser(argparse.ArgumentParser):
         raise REPLResetEvent
 
 
+def raw_remainder(text: str, skip: int) -> str:
+    """What follows the first ``skip`` shell-style tokens of ``text``, as typed
+
+    For arguments such as SQL, whose quotes would be lost by splitting them.
+    """
+    stream = io.StringIO(text)
+    lexer = shlex.shlex(stream, posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+
+    for _ in range(skip):
+        if lexer.get_token() is None:
+            return ""
+
+    return text[stream.tell() :].strip()
+
+
 class DotCommand:
     def __init__(self, name: str) -> None:
         self.name = name
-        self.parser = self.get_parser()
+        self._parser: DotCommandArgParser | None = None
+
+    @property
+    def parser(self) -> DotCommandArgParser:
+        # Built on first use rather than at registration, which keeps startup cheap
+        if self._parser is None:
+            self._parser = self.get_parser()
+
+        return self._parser
+
+    def run(self, text: str, cmd_args: list[str], session: PyliteSession) -> None:
+        """Run the command line ``text``, whose arguments split are ``cmd_args``"""
+        self.execute(cmd_args, session)
 
-    def execute(self, cmd_args: list[str], session: PylitePromptSession) -> None:
+    def execute(self, cmd_args: list[str], session: PyliteSession) -> None:
         raise NotImplementedError
 
     def get_parser(self) -> DotCommandArgParser:
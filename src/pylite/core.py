@@ -1,10 +1,17 @@
-import sqlite3
-
 from prompt_toolkit import HTML, print_formatted_text
 
 from pylite.commands import handle_dot_command
-from pylite.exceptions import REPLResetEvent
+from pylite.exceptions import (
+    BatchStatementError,
+    ReadOnlyDatabaseError,
+    REPLResetEvent,
+    SQLReaderError,
+    StatementCancelled,
+)
+from pylite.input import split_statements
+from pylite.runner import collect_parallel, restore_tuning, run_statements_in_thread
 from pylite.session import PylitePromptSession
+from pylite.tuning import connect
 
 
 def generate_welcome_message(database: str) -> HTML:
@@ -28,8 +35,12 @@ def welcome(database: str) -> None:
     print_formatted_text(msg)
 
 
-def repl(database: str) -> None:
-    session = PylitePromptSession(connection=sqlite3.connect(database))
+def repl(database: str, profile: str | None = None, uri: bool = False) -> None:
+    # Statements run on a worker thread, see run_statements_in_thread()
+    connection, tuning = connect(database, profile, uri, check_same_thread=False)
+    session = PylitePromptSession(
+        connection=connection, tuning=tuning, uri=database if uri else None
+    )
 
     welcome(database)
 
@@ -46,13 +57,27 @@ def repl(database: str) -> None:
         except EOFError:
             break  # Control-D pressed.
 
-        with session.connection:
-            try:
-                messages = session.connection.execute(text)
-            except Exception as e:
-                print(repr(e))
-            else:
-                session.write_result(messages)
-
+        try:
+            # Pasted input can hold several statements
+            statements = split_statements(text)
+
+            if session.parallel is not None:
+                for statement in statements:
+                    collect_parallel(session, statement)
+            elif statements:
+                run_statements_in_thread(session, statements, session.atomic_batches)
+        except (
+            BatchStatementError,
+            ReadOnlyDatabaseError,
+            SQLReaderError,
+            StatementCancelled,
+        ) as e:
+            session.write_error(f"Error: {e}")
+        except Exception as e:
+            print(repr(e))
+
+    # Flushes the buffers of an .output file and finishes its compressed stream
+    del session.dest
+    restore_tuning(session)
     session.connection.close()
     print("\nGoodBye!")
@@ -0,0 +1,102 @@
+import os
+from sqlite3 import Connection, Cursor, OperationalError
+
+from pylite.sqlutil import CachedCursor, CachedResult, quote_identifier
+
+# Settings and counters read with PRAGMA, in the order they're listed
+SUMMARY_PRAGMAS = (
+    "page_size",
+    "page_count",
+    "freelist_count",
+    "cache_size",
+    "cache_spill",
+    "mmap_size",
+    "journal_mode",
+    "synchronous",
+    "auto_vacuum",
+    "wal_autocheckpoint",
+)
+
+# Pages, bytes and fragmentation of each table and index, from the dbstat virtual
+# table.  A page counts as out of order when it doesn't directly follow the one
+# before it in the b-tree, as in sqlite3_analyzer.
+_OBJECT_STATS = """
+WITH pages AS (
+    SELECT
+        name,
+        pagetype,
+        pgsize,
+        payload,
+        unused,
+        pageno != lag(pageno) OVER (PARTITION BY name ORDER BY path) + 1 AS gap
+    FROM dbstat(?)
+)
+SELECT
+    pages.name,
+    coalesce(master.type, 'table') AS type,
+    count(*) AS pages,
+    sum(pgsize) AS bytes,
+    sum(payload) AS payload,
+    sum(unused) AS unused,
+    sum(pagetype = 'overflow') AS overflow_pages,
+    round(100.0 * coalesce(sum(gap), 0) / max(count(*) - 1, 1), 1) AS fragmentation
+FROM pages LEFT JOIN {schema}.sqlite_master AS master ON master.name = pages.name
+GROUP BY pages.name
+ORDER BY bytes DESC, pages.name
+"""
+
+
+def summary(connection: Connection, schema: str = "main") -> CachedCursor:
+    """Size, free space and cache settings of a database, one per row
+
+    Only PRAGMAs are used, so this works whether or not SQLite has dbstat.
+    """
+    prefix = quote_identifier(schema)
+    rows: list[tuple] = []
+    values = {}
+
+    for pragma in SUMMARY_PRAGMAS:
+        values[pragma] = connection.execute(f"PRAGMA {prefix}.{pragma}").fetchone()[0]
+        rows.append((pragma, values[pragma]))
+
+    page_size = values["page_size"]
+    cache_size = values["cache_size"]
+    rows += [
+        ("file_bytes", values["page_count"] * page_size),
+        ("freelist_bytes", values["freelist_count"] * page_size),
+        # A negative cache_size is in KiB rather than pages
+        (
+            "cache_bytes",
+            -cache_size * 1024 if cache_size < 0 else cache_size * page_size,
+        ),
+        ("wal_bytes", _wal_size(connection, schema, values["journal_mode"])),
+    ]
+
+    return CachedCursor(CachedResult((("name", None), ("value", None)), rows, 0))
+
+
+def object_stats(connection: Connection, schema: str = "main") -> Cursor | None:
+    """Space used by each table and index, or None if SQLite lacks dbstat"""
+    sql = _OBJECT_STATS.format(schema=quote_identifier(schema))
+
+    try:
+        return connection.execute(sql, (schema,))
+    except OperationalError as e:
+        if "no such table: dbstat" in str(e):
+            return None
+
+        raise
+
+
+def _wal_size(connection: Connection, schema: str, journal_mode: str) -> int | None:
+    if journal_mode.lower() != "wal":
+        return None
+
+    for _, name, file in connection.execute("PRAGMA database_list"):
+        if name == schema and file:
+            try:
+                return os.path.getsize(f"{file}-wal")
+            except OSError:  # not created yet, or already checkpointed and removed
+                return 0
+
+    return None
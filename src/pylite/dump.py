@@ -0,0 +1,130 @@
+import sqlite3
+from collections.abc import Callable, Iterator
+from contextlib import closing
+from importlib import import_module
+from itertools import islice
+from typing import IO, TextIO
+
+from pylite.pool import readonly_uri
+from pylite.sqlutil import quote_identifier
+
+# Rows fetched and written per batch while dumping a table
+DUMP_BATCH_SIZE = 1000
+
+# Internal tables that a full dump restores, and the statement that readies each
+# one for its rows, as in Connection.iterdump()
+INTERNAL_TABLES = {
+    "sqlite_sequence": 'DELETE FROM "sqlite_sequence";',
+    "sqlite_stat1": 'ANALYZE "sqlite_schema";',
+}
+
+# Compression formats and the stdlib modules providing them, imported when used
+COMPRESSORS = {"gzip": "gzip", "xz": "lzma"}
+
+
+def open_dump_dest(path: str, compression: str | None) -> TextIO:
+    """Open the file ``path`` for a dump, compressed with ``compression`` if given"""
+    if compression is None:
+        return open(path, "w")
+
+    opener: Callable[..., TextIO] = import_module(COMPRESSORS[compression]).open
+
+    return opener(path, "wt")
+
+
+def iter_table_dump(
+    connection: sqlite3.Connection, table_name: str, schema: bool = True
+) -> Iterator[list[str]]:
+    """Yield batches of SQL lines that recreate ``table_name``
+
+    The INSERT statements are assembled by SQLite itself with quote(), one row at a
+    time, so only one batch of rows is held in memory.
+    """
+    if schema:
+        schema_sql = "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?"
+        row = connection.execute(schema_sql, (table_name,)).fetchone()
+
+        yield [row[0] + ";"]
+
+    tbl_info = connection.execute("SELECT * FROM pragma_table_info(?)", (table_name,))
+    column_names = [str(row[1]) for row in tbl_info.fetchall()]
+    quotes = ",".join(
+        "'||quote(" + quote_identifier(col) + ")||'" for col in column_names
+    )
+    # The table name ends up inside a string literal as well as in the FROM clause
+    table_ident = quote_identifier(table_name)
+    table_literal = table_ident.replace("'", "''")
+    insert_statements_sql = (
+        f"SELECT 'INSERT INTO {table_literal} VALUES("
+        + quotes
+        + f");' FROM {table_ident}"
+    )
+    cursor = connection.execute(insert_statements_sql)
+
+    while batch := cursor.fetchmany(DUMP_BATCH_SIZE):
+        yield [s[0] for s in batch]
+
+
+def iter_full_dump(connection: sqlite3.Connection) -> Iterator[list[str]]:
+    """Yield batches of the lines produced by ``Connection.iterdump()``"""
+    lines = connection.iterdump()
+
+    while batch := list(islice(lines, DUMP_BATCH_SIZE)):
+        yield batch
+
+
+def iter_internal_dump(connection: sqlite3.Connection) -> Iterator[list[str]]:
+    """Yield batches of SQL lines that restore the rows of INTERNAL_TABLES
+
+    SQLite creates these tables itself, so only their rows are dumped.
+    """
+    sql = "SELECT name FROM sqlite_master WHERE type = 'table'"
+    existing = {row[0] for row in connection.execute(sql)}
+
+    for table_name, statement in INTERNAL_TABLES.items():
+        if table_name in existing:
+            yield [statement]
+            yield from iter_table_dump(connection, table_name, schema=False)
+
+
+def write_lines(dest: TextIO, batches: Iterator[list[str]]) -> None:
+    for batch in batches:
+        dest.write("\n".join(batch) + "\n")
+
+
+def dump_tables_parallel(
+    database: str,
+    tables: list[str],
+    schema: bool,
+    jobs: int,
+    dest: TextIO,
+    uri: str | None = None,
+) -> None:
+    """Dump ``tables`` from the database file at ``database`` using ``jobs`` threads
+
+    Each worker opens its own read-only connection, with ``uri`` if the session was
+    opened with one, and spools its table to a temporary file; the spooled dumps are
+    copied to ``dest`` in table order.  Each table is read in its own transaction,
+    so changes committed while the dump runs may show up in some tables and not
+    others.
+    """
+    import shutil
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    uri = readonly_uri(database, uri)
+
+    def dump_one(table_name: str) -> IO[str]:
+        spool = tempfile.TemporaryFile("w+")
+
+        with closing(sqlite3.connect(uri, uri=True)) as connection:
+            write_lines(spool, iter_table_dump(connection, table_name, schema))
+
+        spool.seek(0)
+
+        return spool
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for spool in pool.map(dump_one, tables):
+            with spool:
+                shutil.copyfileobj(spool, dest)
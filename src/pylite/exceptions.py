@@ -12,3 +12,15 @@ class SQLReaderError(PyliteException):
 
 class SQLResultWriterError(PyliteException):
     pass
+
+
+class StatementCancelled(PyliteException):
+    pass
+
+
+class ReadOnlyDatabaseError(PyliteException):
+    pass
+
+
+class BatchStatementError(PyliteException):
+    pass
@@ -0,0 +1,180 @@
+import re
+import time
+from sqlite3 import Connection
+
+from pylite.catalog import SchemaCatalog
+from pylite.progress import StatementProgress
+from pylite.sqlutil import is_query, quote_identifier
+
+# What's flagged next to plan steps that commonly explain a slow query
+FULL_SCAN = "full table scan"
+TEMP_BTREE = "temp B-tree"
+AUTOMATIC_INDEX = "automatic index"
+
+# "SCAN name" on its own: not through an index, a virtual table or constant rows
+_SCAN = re.compile(r"SCAN ([^\s(]\S*)$")
+# The table or alias a loop reads from
+_LOOP = re.compile(r"(?:SCAN|SEARCH) (?!CONSTANT ROW)(\S+)")
+# Subqueries and CTEs that are computed first and then scanned like a table
+_MATERIALIZED = re.compile(r"(?:MATERIALIZE|CO-ROUTINE) (\S+)$")
+
+
+class PlanStep:
+    def __init__(self, id: int, parent: int, detail: str) -> None:
+        self.id = id
+        self.parent = parent
+        self.detail = detail
+        self.children: list[PlanStep] = []
+        self.flags: list[str] = []
+        # Rows in the table read in full by a scan, or to build an automatic index,
+        # filled in by analyze()
+        self.table_rows: int | None = None
+
+
+class PlanRun:
+    """Measurements from running a statement for ``.explain --analyze``"""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.first_row: float | None = None
+        self.elapsed = 0.0
+        self.vm_steps = 0
+        self.program_size = 0
+
+
+def query_plan(connection: Connection, sql: str) -> list[PlanStep]:
+    """The top-level steps of the statement's query plan, with their flags set"""
+    steps: dict[int, PlanStep] = {}
+    roots: list[PlanStep] = []
+    materialized = set()
+
+    for id, parent, _, detail in connection.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        step = PlanStep(id, parent, detail)
+        steps[id] = step
+        siblings = steps[parent].children if parent in steps else roots
+        siblings.append(step)
+
+        if match := _MATERIALIZED.match(detail):
+            materialized.add(match.group(1))
+
+    for step in steps.values():
+        scan = _SCAN.match(step.detail)
+
+        if scan and scan.group(1) not in materialized:
+            step.flags.append(FULL_SCAN)
+
+        if "TEMP B-TREE" in step.detail:
+            step.flags.append(TEMP_BTREE)
+
+        if "AUTOMATIC" in step.detail:
+            step.flags.append(AUTOMATIC_INDEX)
+
+    return roots
+
+
+def loop_name(step: PlanStep) -> str | None:
+    """The table, alias or subquery a SCAN or SEARCH step loops over"""
+    loop = _LOOP.match(step.detail)
+
+    return loop.group(1) if loop is not None else None
+
+
+def render_plan(roots: list[PlanStep]) -> str:
+    """The plan drawn as a tree, the way the sqlite3 shell does"""
+    lines = ["QUERY PLAN"]
+    _render_steps(roots, "", lines)
+
+    return "\n".join(lines)
+
+
+def _render_steps(steps: list[PlanStep], indent: str, lines: list[str]) -> None:
+    for i, step in enumerate(steps):
+        last = i == len(steps) - 1
+        line = indent + ("`--" if last else "|--") + step.detail
+        notes = list(step.flags)
+
+        if step.table_rows is not None:
+            notes.append(f"{step.table_rows:,} rows in table")
+
+        if notes:
+            line += "  <-- " + ", ".join(notes)
+
+        lines.append(line)
+        _render_steps(step.children, indent + ("   " if last else "|  "), lines)
+
+
+def analyze(
+    connection: Connection,
+    catalog: SchemaCatalog,
+    sql: str,
+    roots: list[PlanStep],
+    progress: StatementProgress,
+    batch_size: int,
+) -> PlanRun:
+    """Run the statement, discarding its result, and measure it
+
+    Statements other than queries run inside a savepoint that is rolled back, so
+    they change nothing.  Steps in ``roots`` that read a whole table, as full scans
+    and automatic indexes do, get the number of rows in it.
+    """
+    run = PlanRun()
+    run.program_size = len(connection.execute(f"EXPLAIN {sql}").fetchall())
+    savepoint = not is_query(sql)
+
+    if savepoint:
+        connection.execute("SAVEPOINT pylite_explain")
+
+    try:
+        with progress:
+            start = time.perf_counter()
+            cursor = connection.execute(sql)
+
+            while batch := cursor.fetchmany(batch_size):
+                if run.first_row is None:
+                    run.first_row = time.perf_counter() - start
+
+                run.rows += len(batch)
+
+            run.elapsed = time.perf_counter() - start
+            run.vm_steps = progress.steps
+    finally:
+        if savepoint:
+            connection.execute("ROLLBACK TO pylite_explain")
+            connection.execute("RELEASE pylite_explain")
+
+    catalog.refresh()
+    _count_scanned_rows(connection, catalog, sql, roots)
+
+    return run
+
+
+def _count_scanned_rows(
+    connection: Connection, catalog: SchemaCatalog, sql: str, steps: list[PlanStep]
+) -> None:
+    for step in steps:
+        name = loop_name(step)
+        whole_table = FULL_SCAN in step.flags or AUTOMATIC_INDEX in step.flags
+
+        if whole_table and name is not None:
+            table = catalog.table_or_alias(name, sql)
+
+            if table is not None and table.type == "table":
+                database, name = map(quote_identifier, (table.database, table.name))
+                count_sql = f"SELECT count(*) FROM {database}.{name}"
+                step.table_rows = connection.execute(count_sql).fetchone()[0]
+
+        _count_scanned_rows(connection, catalog, sql, step.children)
+
+
+def render_run(run: PlanRun) -> str:
+    first_row = "-" if run.first_row is None else f"{run.first_row:.3f}s"
+
+    return "\n".join(
+        [
+            f"Rows returned: {run.rows:,}",
+            f"First row after: {first_row}",
+            f"Run time: {run.elapsed:.3f}s",
+            f"VM steps: about {run.vm_steps:,}",
+            f"Bytecode program: {run.program_size:,} instructions",
+        ]
+    )
@@ -4,3 +4,6 @@ from pylite.input.prompt_reader import (
 )
 from pylite.input.prompt_reader import DEFAULT_PROMPT_MESSAGE as DEFAULT_PROMPT_MESSAGE
 from pylite.input.prompt_reader import SQLPromptReader as SQLPromptReader
+from pylite.input.script_reader import SQLScriptReader as SQLScriptReader
+from pylite.input.splitter import SQLStatementSplitter as SQLStatementSplitter
+from pylite.input.splitter import split_statements as split_statements
@@ -0,0 +1,113 @@
+import re
+from collections.abc import Iterable, Iterator
+
+from prompt_toolkit.completion import CompleteEvent, Completer, Completion
+from prompt_toolkit.document import Document
+
+from pylite.catalog import SchemaCatalog
+
+# https://www.sqlite.org/lang_keywords.html
+SQL_KEYWORDS = sorted(
+    """
+    ABORT ACTION ADD AFTER ALL ALTER ALWAYS ANALYZE AND AS ASC ATTACH AUTOINCREMENT
+    BEFORE BEGIN BETWEEN BY CASCADE CASE CAST CHECK COLLATE COLUMN COMMIT CONFLICT
+    CONSTRAINT CREATE CROSS CURRENT CURRENT_DATE CURRENT_TIME CURRENT_TIMESTAMP
+    DATABASE DEFAULT DEFERRABLE DEFERRED DELETE DESC DETACH DISTINCT DO DROP EACH
+    ELSE END ESCAPE EXCEPT EXCLUDE EXCLUSIVE EXISTS EXPLAIN FAIL FILTER FIRST
+    FOLLOWING FOR FOREIGN FROM FULL GENERATED GLOB GROUP GROUPS HAVING IF IGNORE
+    IMMEDIATE IN INDEX INDEXED INITIALLY INNER INSERT INSTEAD INTERSECT INTO IS
+    ISNULL JOIN KEY LAST LEFT LIKE LIMIT MATCH MATERIALIZED NATURAL NO NOT NOTHING
+    NOTNULL NULL NULLS OF OFFSET ON OR ORDER OTHERS OUTER OVER PARTITION PLAN
+    PRAGMA PRECEDING PRIMARY QUERY RAISE RANGE RECURSIVE REFERENCES REGEXP REINDEX
+    RELEASE RENAME REPLACE RESTRICT RETURNING RIGHT ROLLBACK ROW ROWS SAVEPOINT
+    SELECT SET TABLE TEMP TEMPORARY THEN TIES TO TRANSACTION TRIGGER UNBOUNDED
+    UNION UNIQUE UPDATE USING VACUUM VALUES VIEW VIRTUAL WHEN WHERE WINDOW WITH
+    WITHOUT
+    """.split()
+)
+
+# An identifier being typed, possibly qualified with a table, alias or database
+_WORD_BEFORE_CURSOR = re.compile(r"(?:([A-Za-z_][\w$]*)\.)?([A-Za-z_][\w$]*)?$")
+_IDENTIFIER = re.compile(r"[A-Za-z_][\w$]*")
+
+
+class SQLCompleter(Completer):
+    """Completes SQL keywords, names from a SchemaCatalog and dot commands
+
+    Columns are offered for the tables and views named anywhere in the statement,
+    and after "name." for the table, view or alias called name.  Names after
+    "database." come from that database.
+    """
+
+    def __init__(self, catalog: SchemaCatalog) -> None:
+        self.catalog = catalog
+
+    def get_completions(
+        self, document: Document, complete_event: CompleteEvent
+    ) -> Iterator[Completion]:
+        text = document.text_before_cursor
+        match = _WORD_BEFORE_CURSOR.search(text)
+        assert match is not None  # to appease mypy, the pattern can match nothing
+
+        qualifier, word = match.group(1), match.group(2) or ""
+
+        if text.startswith(".") and " " not in text:
+            yield from _complete(text, self._dot_commands(), text)
+            return
+
+        self.catalog.refresh()
+
+        if qualifier is not None:
+            candidates = self._qualified(qualifier, document.text)
+        elif not word:
+            return
+        else:
+            candidates = self._unqualified(word, document.text)
+
+        yield from _complete(word, candidates, word)
+
+    def _unqualified(self, word: str, statement: str) -> Iterable[str]:
+        keywords = [k for k in SQL_KEYWORDS if k.startswith(word.upper())]
+
+        if word.islower():
+            keywords = [k.lower() for k in keywords]
+
+        columns = set()
+
+        for name in set(_IDENTIFIER.findall(statement)):
+            table = self.catalog.table(name)
+
+            if table is not None:
+                columns.update(self.catalog.columns(table))
+
+        return [*keywords, *self.catalog.names_starting_with(word), *sorted(columns)]
+
+    def _qualified(self, qualifier: str, statement: str) -> Iterable[str]:
+        if qualifier.lower() in (d.lower() for d in self.catalog.databases):
+            database = qualifier.lower()
+
+            return [
+                o.name
+                for o in self.catalog.objects
+                if o.database.lower() == database and o.type != "trigger"
+            ]
+
+        table = self.catalog.table_or_alias(qualifier, statement)
+
+        return self.catalog.columns(table) if table is not None else []
+
+    def _dot_commands(self) -> list[str]:
+        # Imported here since the commands import the session, which imports this
+        from pylite.commands.registry import cmd_registry
+
+        return sorted(cmd_registry.get_all())
+
+
+def _complete(word: str, candidates: Iterable[str], typed: str) -> Iterator[Completion]:
+    prefix = word.lower()
+    seen = set()
+
+    for candidate in candidates:
+        if candidate.lower().startswith(prefix) and candidate not in seen:
+            seen.add(candidate)
+            yield Completion(candidate, start_position=-len(typed))
@@ -1,8 +1,11 @@
 from pathlib import Path
-from typing import Iterator
 
 from pylite.exceptions import SQLReaderError
 from pylite.input.reader import SQLReader
+from pylite.input.splitter import SQLStatementSplitter
+
+# Files are read this many characters at a time and fed to the statement splitter
+READ_CHUNK_SIZE = 1 << 20
 
 
 class SQLFileReader(SQLReader):
@@ -15,11 +18,7 @@ class SQLFileReader(SQLReader):
         super().__init__(source)
 
     def __iter__(self):
-        with open(self.source, "r") as sf:
-            sql_gen = (line.split("--")[0].strip() for line in sf)
-
-            for line in sql_gen:
-                yield self.build_complete_statement(line, sql_gen)
+        with open(self.source, "r", buffering=READ_CHUNK_SIZE) as sf:
+            chunks = iter(lambda: sf.read(READ_CHUNK_SIZE), "")
 
-    def get_next(self, sql_src: Iterator[str]) -> str:
-        return next(sql_src)
+            yield from SQLStatementSplitter().split(chunks)
@@ -1,8 +1,13 @@
-from prompt_toolkit import PromptSession
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
 from pylite.exceptions import SQLReaderError
 from pylite.input.reader import SQLReader
 
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+
 DEFAULT_PROMPT_MESSAGE = "pylite> "
 DEFAULT_PROMPT_CONTINUATION = "   ...> "
 
@@ -0,0 +1,29 @@
+from collections.abc import Iterable, Iterator
+
+from pylite.input.reader import SQLReader
+from pylite.input.splitter import SQLStatementSplitter
+
+
+class SQLScriptReader(SQLReader):
+    """Reads a script of SQL statements and dot commands, e.g. from a pipe
+
+    Iterating yields one complete statement or dot command at a time, the same
+    units the interactive prompt hands back.  A dot command has to start on a line
+    of its own, outside of any statement.  Raises SQLReaderError if the script ends
+    partway through a statement.
+    """
+
+    def __init__(self, source: Iterable[str]) -> None:
+        super().__init__(source)
+
+    def __iter__(self) -> Iterator[str]:
+        assert self.source is not None  # to appease mypy
+        splitter = SQLStatementSplitter()
+
+        for line in self.source:
+            if not splitter.in_statement and line.lstrip().startswith("."):
+                yield line.strip()
+            else:
+                yield from splitter.feed(line)
+
+        yield from splitter.split([])
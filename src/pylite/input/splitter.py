@@ -0,0 +1,238 @@
+import re
+from collections.abc import Iterable, Iterator
+
+from pylite.exceptions import SQLReaderError
+
+# Scanner states
+_NORMAL = 0
+_LINE_COMMENT = 1
+_BLOCK_COMMENT = 2
+_QUOTED = 3
+
+# Characters that can change the scanner state while outside of quotes and comments
+_SPECIAL = re.compile(r"[;'\"`\[\-/]")
+# Same as above, but also picks out words.  Only used while the first few words of a
+# statement are unknown or while inside a trigger body, where BEGIN...END matters.
+_SPECIAL_OR_WORD = re.compile(r"[;'\"`\[\-/]|\w+")
+_PUNCTUATION = frozenset(";'\"`[-/")
+_CLOSING_QUOTE = {"'": "'", '"': '"', "`": "`", "[": "]"}
+
+
+class SQLStatementSplitter:
+    """Incrementally split SQL text into complete statements
+
+    Text is fed in arbitrarily sized chunks and every character is scanned exactly
+    once, so splitting is linear in the size of the input no matter how long a single
+    statement gets.  Quoted strings and identifiers, ``--`` and ``/* */`` comments and
+    ``CREATE TRIGGER ... BEGIN ... END;`` bodies are handled the same way
+    ``sqlite3.complete_statement`` handles them.
+    """
+
+    def __init__(self) -> None:
+        self._state = _NORMAL
+        self._close_quote = ""
+        self._pieces: list[str] = []  # scanned text of the current statement
+        self._tail = ""  # unscanned text carried over from the previous chunk
+        self._has_content = False  # current statement has more than space/comments
+        self._head: list[str] = []  # first words of the current statement
+        self._head_known = False
+        self._in_explain = False  # between a leading EXPLAIN and CREATE
+        self._in_trigger = False
+        self._after_semi = False  # last token of a trigger body was ;
+        self._after_end = False  # last token of a trigger body was END
+
+    def feed(self, chunk: str) -> list[str]:
+        """Scan ``chunk`` and return the statements it completed"""
+        text = self._tail + chunk
+        self._tail = ""
+        statements = []
+        start = 0  # where the current statement begins within text
+        pos = 0
+        length = len(text)
+
+        while pos < length:
+            state = self._state
+
+            if state == _QUOTED:
+                found = text.find(self._close_quote, pos)
+
+                if found == -1:
+                    pos = length
+                else:
+                    self._state = _NORMAL
+                    pos = found + 1
+            elif state == _LINE_COMMENT:
+                found = text.find("\n", pos)
+
+                if found == -1:
+                    pos = length
+                else:
+                    self._state = _NORMAL
+                    pos = found + 1
+            elif state == _BLOCK_COMMENT:
+                found = text.find("*/", pos)
+
+                if found == -1:
+                    # A trailing '*' may be the first half of the terminator
+                    pos = length - 1 if text.endswith("*") else length
+                    break
+                else:
+                    self._state = _NORMAL
+                    pos = found + 2
+            else:
+                if self._head_known and not self._in_trigger:
+                    match = _SPECIAL.search(text, pos)
+                else:
+                    match = _SPECIAL_OR_WORD.search(text, pos)
+
+                if match is None:
+                    if not self._has_content and text[pos:].strip():
+                        self._has_content = True
+                    pos = length
+                    break
+
+                token = match.group()
+                token_start = match.start()
+                is_word = token[0] not in _PUNCTUATION
+
+                if (not self._has_content or self._in_trigger) and text[
+                    pos:token_start
+                ].strip():
+                    # Something other than whitespace, i.e. operators or parentheses
+                    self._has_content = True
+                    self._after_end = False
+                    self._after_semi = False
+
+                if match.end() == length and (is_word or token in ("-", "/")):
+                    # Can't tell what this is until the next chunk arrives
+                    pos = token_start
+                    break
+
+                pos = match.end()
+
+                if token == ";":
+                    if not self._in_trigger or self._after_end:
+                        statement = "".join(self._pieces) + text[start:pos]
+                        self._pieces = []
+
+                        if self._has_content:
+                            statements.append(statement.strip())
+
+                        start = pos
+                        self._reset_statement()
+                    else:
+                        self._after_end = False
+                        self._after_semi = True
+                elif token in _CLOSING_QUOTE:
+                    self._state = _QUOTED
+                    self._close_quote = _CLOSING_QUOTE[token]
+                    self._has_content = True
+                    self._after_end = False
+                    self._after_semi = False
+                elif token == "-":
+                    if text.startswith("-", pos):
+                        self._state = _LINE_COMMENT
+                        pos += 1
+                    else:
+                        self._has_content = True
+                        self._after_end = False
+                        self._after_semi = False
+                elif token == "/":
+                    if text.startswith("*", pos):
+                        self._state = _BLOCK_COMMENT
+                        pos += 1
+                    else:
+                        self._has_content = True
+                        self._after_end = False
+                        self._after_semi = False
+                elif is_word:
+                    self._has_content = True
+                    self._on_word(token.upper())
+
+        self._pieces.append(text[start:pos])
+        self._tail = text[pos:]
+
+        return statements
+
+    @property
+    def in_statement(self) -> bool:
+        """True if part of a statement has been fed but not yet completed"""
+        return self._has_content or self._state != _NORMAL or bool(self._tail)
+
+    def finish(self) -> str | None:
+        """Flush the splitter at the end of input
+
+        Returns any trailing text that was not terminated by a semicolon, or None if
+        nothing but whitespace and comments was left over.
+        """
+        tail = self._tail
+        self._tail = ""
+        statement = "".join(self._pieces) + tail
+        # Anything held back in the normal state is the start of a token
+        has_content = self._has_content or (self._state == _NORMAL and bool(tail))
+
+        self._pieces = []
+        self._state = _NORMAL
+        self._reset_statement()
+
+        return statement.strip() if has_content else None
+
+    def split(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Yield the complete statements in ``chunks``
+
+        Raises SQLReaderError if the input ends in the middle of a statement.
+        """
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+        if self.finish() is not None:
+            raise SQLReaderError("Incomplete statement")
+
+    def _on_word(self, word: str) -> None:
+        if self._in_trigger:
+            # Only END straight after a ; ends the body, not the END of a CASE
+            self._after_end = self._after_semi and word == "END"
+            self._after_semi = False
+            return
+
+        if self._in_explain:
+            # Like sqlite3_complete(), skip any words between EXPLAIN and CREATE,
+            # such as QUERY PLAN
+            if word in ("EXPLAIN", "TEMP", "TEMPORARY", "TRIGGER", "END"):
+                self._head_known = True
+                return
+            elif word != "CREATE":
+                return
+
+            self._in_explain = False
+        elif not self._head and word == "EXPLAIN":
+            self._in_explain = True
+            return
+
+        self._head.append(word)
+
+        # [EXPLAIN ...] CREATE [TEMP|TEMPORARY] TRIGGER
+        if self._head[0] != "CREATE":
+            self._head_known = True
+        elif len(self._head) == 2 and self._head[1] in ("TEMP", "TEMPORARY"):
+            return
+        elif len(self._head) >= 2:
+            self._head_known = True
+            self._in_trigger = self._head[-1] == "TRIGGER"
+
+    def _reset_statement(self) -> None:
+        self._has_content = False
+        self._head = []
+        self._head_known = False
+        self._in_explain = False
+        self._in_trigger = False
+        self._after_semi = False
+        self._after_end = False
+
+
+def split_statements(text: str) -> list[str]:
+    """Split ``text`` into complete statements
+
+    Raises SQLReaderError if ``text`` ends with an unterminated statement.
+    """
+    return list(SQLStatementSplitter().split([text]))
@@ -0,0 +1,122 @@
+import atexit
+import io
+import weakref
+from contextlib import suppress
+from importlib import import_module
+from typing import IO, TextIO
+
+# Buffer between the output modes and the file, so that the many small writes of a
+# result reach the disk, compressor or background thread as large chunks
+OUTPUT_BUFFER_SIZE = 256 * 1024
+# Chunks the background writer may fall behind by before the formatting thread waits
+OUTPUT_QUEUE_SIZE = 16
+
+# File extensions that turn on compression, and the stdlib modules providing it
+COMPRESSED_EXTENSIONS = {".gz": "gzip", ".xz": "lzma", ".bz2": "bz2"}
+
+
+def open_output(
+    path: str, buffer_size: int = OUTPUT_BUFFER_SIZE, background: bool = False
+) -> TextIO:
+    """Open ``path`` for writing text, compressed if its extension calls for it
+
+    With ``background``, compressing and writing happen on a separate thread so
+    that they overlap with fetching and formatting the next rows.
+    """
+    for extension, module in COMPRESSED_EXTENSIONS.items():
+        if path.endswith(extension):
+            target: IO[bytes] = import_module(module).open(path, "wb")
+            break
+    else:
+        target = open(path, "wb", buffering=0)
+
+    raw = BackgroundWriter(target) if background else target
+    stream = io.TextIOWrapper(io.BufferedWriter(raw, buffer_size))  # type: ignore[arg-type]
+
+    if background:
+        _open_in_background.add(stream)
+
+    return stream
+
+
+# Streams written by a BackgroundWriter that are still open.  They're closed before
+# the interpreter shuts down, since a thread can't be waited for after that.
+_open_in_background: weakref.WeakSet[TextIO] = weakref.WeakSet()
+
+
+@atexit.register
+def _close_at_exit() -> None:
+    for stream in list(_open_in_background):
+        with suppress(OSError):
+            stream.close()
+
+
+class BackgroundWriter(io.RawIOBase):
+    """A binary stream that hands its writes to a thread through a bounded queue
+
+    Once ``OUTPUT_QUEUE_SIZE`` chunks are waiting, write() blocks until the thread
+    catches up.  An error raised on the thread is re-raised by the next call to
+    write(), flush() or close().  Closing waits for the queue to drain and closes
+    ``target`` too.
+    """
+
+    def __init__(self, target: IO[bytes], queue_size: int = OUTPUT_QUEUE_SIZE) -> None:
+        import threading
+        from queue import Queue
+
+        super().__init__()
+        self._target = target
+        self._queue: Queue[bytes | None] = Queue(maxsize=queue_size)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._run, name="pylite-output", daemon=True
+        )
+        self._thread.start()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._raise_error()
+        self._queue.put(bytes(data))
+
+        return len(data)
+
+    def flush(self) -> None:
+        if not self.closed:
+            self._queue.join()
+            self._raise_error()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            self._queue.put(None)
+            self._thread.join()
+            self._target.close()
+            self._raise_error()
+        finally:
+            super().close()
+
+    def _run(self) -> None:
+        while True:
+            chunk = self._queue.get()
+
+            try:
+                if chunk is None:
+                    return
+
+                if self._error is None:
+                    self._target.write(chunk)
+            except BaseException as e:
+                # Keep draining so that write() never blocks on a full queue
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+
+            raise error
@@ -0,0 +1,98 @@
+from collections import Counter
+from typing import Callable
+
+# Each function below looks at a result's column names, and for some a sample of its
+# rows, and returns a formatter that turns one row into text.  Formatters are called
+# with the row's values as separate arguments so that output modes can apply them to
+# a whole batch with itertools.starmap(), without building a dict or list per row.
+RowFormatter = Callable[..., str]
+
+
+def _escape_braces(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def delimited_formatter(width: int, colsep: str) -> RowFormatter:
+    """Values converted with str() and joined by ``colsep``"""
+    return _escape_braces(colsep).join(["{}"] * width).format
+
+
+def labelled_formatter(fields: tuple) -> RowFormatter:
+    """One "name = value" line per column, names right-justified
+
+    As in a dict, a repeated column name keeps its first position and its last
+    value.
+    """
+    justify = max(len(field) for field in fields)
+    last_index = {field: i for i, field in enumerate(fields)}
+    lines = [
+        _escape_braces(f"{field:>{justify}}") + f" = {{{last_index[field]}}}"
+        for field in dict.fromkeys(fields)
+    ]
+
+    return "\n".join(lines).format
+
+
+def json_formatter(
+    fields: tuple, sample: list[tuple], indent: int | None = None
+) -> RowFormatter:
+    """A JSON object per row, the same text json.dumps() would give for its dict
+
+    Keys are encoded once up front.  Each value is encoded by a C function chosen
+    for the type most common in its column in ``sample``, with json.dumps() as the
+    fallback for other types, NULLs and non-finite floats.  As in a dict, a repeated
+    column name keeps its first position and its last value.
+    """
+    import json
+    from json.encoder import encode_basestring_ascii
+
+    if indent is None:
+        item_sep, open_brace, close_brace = ", ", "{", "}"
+    else:
+        # Rows sit one level into the list, so their keys are two levels in
+        item_sep = ",\n" + " " * indent * 2
+        open_brace = " " * indent + "{\n" + " " * indent * 2
+        close_brace = "\n" + " " * indent + "}"
+
+    last_index = {field: i for i, field in enumerate(fields)}
+    args = ", ".join(f"v{i}" for i in range(len(fields)))
+    parts = []
+    literal = open_brace
+
+    for n, field in enumerate(dict.fromkeys(fields)):
+        i = last_index[field]
+        literal += ("" if n == 0 else item_sep) + encode_basestring_ascii(field) + ": "
+        parts.append(repr(literal))
+        parts.append(_json_value_expression(f"v{i}", _common_type(sample, i)))
+        literal = ""
+
+    parts.append(repr(close_brace))
+    source = f"def format_row({args}):\n    return " + " + ".join(parts)
+    namespace = {
+        "_str": encode_basestring_ascii,
+        "_int": int.__repr__,
+        "_float": float.__repr__,
+        "_any": json.dumps,
+    }
+    exec(source, namespace)
+
+    return namespace["format_row"]
+
+
+def _common_type(sample: list[tuple], index: int) -> type | None:
+    kinds = Counter(type(row[index]) for row in sample if row[index] is not None)
+
+    return kinds.most_common(1)[0][0] if kinds else None
+
+
+def _json_value_expression(name: str, kind: type | None) -> str:
+    if kind is str:
+        return f"(_str({name}) if {name}.__class__ is str else _any({name}))"
+    elif kind is int:
+        return f"(_int({name}) if {name}.__class__ is int else _any({name}))"
+    elif kind is float:
+        # x - x is only 0 for finite floats; json.dumps() spells out NaN and Infinity
+        check = f"{name}.__class__ is float and {name} - {name} == 0"
+        return f"(_float({name}) if {check} else _any({name}))"
+
+    return f"_any({name})"
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-import csv
-import json
-from typing import TYPE_CHECKING, Callable, TypeVar
+from itertools import chain, islice, starmap
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, TypeVar
 
-from tabulate import tabulate
+from pylite.output.formatters import (
+    RowFormatter,
+    delimited_formatter,
+    json_formatter,
+    labelled_formatter,
+)
 
 if TYPE_CHECKING:
     from pylite.output import SQLResultWriter
 
+# Modules only some output modes need (csv, json, tabulate) are imported inside those
+# modes so that they don't add to startup time.
+
 
 OUTPUT_MODES = dict()
 T = TypeVar("T", bound=Callable)
@@ -24,105 +31,173 @@ def output_mode(mode: str) -> Callable[[T], T]:
 
 
 @output_mode("default")
-def _write_default(rows: list[tuple[str, ...]], writer: SQLResultWriter) -> None:
-    headers = rows[0]
-    data = rows[1:]
-
-    print(tabulate(data, headers=headers, tablefmt="grid"), file=writer.dest)
+def _write_default(rows: Iterator[tuple], writer: SQLResultWriter) -> None:
+    headers = next(rows)
+    dest = writer.dest
+    # Widths are fixed by the first batch, so cells further down that don't fit are
+    # cut off rather than forcing the whole result to be measured up front.
+    sample = list(islice(rows, writer.batch_size))
+    layout = _TableLayout(headers, sample, max_width=writer.max_col_width)
+    border = "+" + "+".join("-" * (w + 2) for w in layout.widths) + "+\n"
+    header_border = "+" + "+".join("=" * (w + 2) for w in layout.widths) + "+\n"
 
+    dest.write(border + layout.format_row(headers) + header_border)
 
-@output_mode("list")
-def _write_list(rows: list[tuple[str, ...]], writer: SQLResultWriter) -> None:
-    data = rows[1:]
-    str_data = []
+    for batch in _batched(chain(sample, rows), writer.batch_size):
+        dest.write(border.join(layout.format_row(row) for row in batch) + border)
 
-    for row in data:
-        str_data.append(writer.colsep.join(map(str, row)))
 
-    print(writer.rowsep.join(str_data), file=writer.dest)
+@output_mode("list")
+def _write_list(rows: Iterator[tuple], writer: SQLResultWriter) -> None:
+    headers = next(rows)  # only their number matters to this mode
+    format_row = delimited_formatter(len(headers), writer.colsep)
+    _write_formatted(rows, format_row, writer, "", writer.rowsep, "\n")
 
 
 @output_mode("line")
-def _write_lines(rows: list[tuple[str, ...]], writer: SQLResultWriter) -> None:
-    fields = rows[0]
-    dict_data = rows_to_dict(rows)
-    line_data = []
-    justify = max(len(field) for field in fields)
-
-    for row in dict_data:
-        lines = [" ".join([f"{k:>{justify}}", "=", f"{v}"]) for k, v in row.items()]
-        row_as_lines = "\n".join(lines)
-
-        line_data.append(row_as_lines)
-
-    print("\n\n".join(line_data), file=writer.dest)
+def _write_lines(rows: Iterator[tuple], writer: SQLResultWriter) -> None:
+    format_row = labelled_formatter(next(rows))
+    _write_formatted(rows, format_row, writer, "", "\n\n", "\n")
 
 
 @output_mode("json")
-def _write_json(rows: list[tuple[str, ...]], writer: SQLResultWriter) -> None:
-    dict_data = rows_to_dict(rows)
-
-    print(
-        "[" + ",\n".join(json.dumps(row) for row in dict_data) + "]", file=writer.dest
-    )
+def _write_json(rows: Iterator[tuple], writer: SQLResultWriter) -> None:
+    fields = next(rows)
+    sample = list(islice(rows, writer.batch_size))
+    format_row = json_formatter(fields, sample)
+    _write_formatted(chain(sample, rows), format_row, writer, "[", ",\n", "]\n")
 
 
 @output_mode("json-pretty")
-def _write_json_pretty(rows: list[tuple[str, ...]], writer: SQLResultWriter) -> None:
-    dict_data = rows_to_dict(rows)
-
-    print(json.dumps(dict_data, indent=2), file=writer.dest)
+def _write_json_pretty(rows: Iterator[tuple], writer: SQLResultWriter) -> None:
+    fields = next(rows)
+    sample = list(islice(rows, writer.batch_size))
+    format_row = json_formatter(fields, sample, indent=2)
+    rows = chain(sample, rows)
+    _write_formatted(rows, format_row, writer, "[\n", ",\n", "\n]\n")
 
 
 @output_mode("python")
-def _write_python_list(rows: list[tuple[str, ...]], writer: SQLResultWriter) -> None:
-    data = rows[1:]
+def _write_python_list(rows: Iterator[tuple], writer: SQLResultWriter) -> None:
+    next(rows)  # headers are not part of this mode
+    dest = writer.dest
 
-    for row in data:
-        print(row, file=writer.dest)
+    for batch in _batched(rows, writer.batch_size):
+        dest.write("\n".join(map(repr, batch)) + "\n")
 
 
 @output_mode("markdown")
-def _write_markdown(rows: list[tuple[str, ...]], writer: SQLResultWriter) -> None:
-    headers = rows[0]
-    data = rows[1:]
+def _write_markdown(rows: Iterator[tuple], writer: SQLResultWriter) -> None:
+    headers = next(rows)
+    dest = writer.dest
+    # Column widths and alignment come from the first batch only so that rows can be
+    # written as they are fetched.  Longer cells further down simply widen their own
+    # line, which is still valid markdown.
+    sample = list(islice(rows, writer.batch_size))
+    layout = _TableLayout(headers, sample)
 
-    print(tabulate(data, headers=headers, tablefmt="github"), file=writer.dest)
+    dest.write(layout.format_row(headers))
+    dest.write("|" + "|".join("-" * (w + 2) for w in layout.widths) + "|\n")
+
+    for batch in _batched(chain(sample, rows), writer.batch_size):
+        dest.write("".join(layout.format_row(row) for row in batch))
 
 
 @output_mode("html")
-def _write_html(rows: list[tuple[str, ...]], writer: SQLResultWriter) -> None:
-    headers = rows[0]
-    data = rows[1:]
+def _write_html(rows: Iterator[tuple], writer: SQLResultWriter) -> None:
+    from tabulate import tabulate
+
+    headers = next(rows)
+    data = list(rows)
 
     print(tabulate(data, headers=headers, tablefmt="html"), file=writer.dest)
 
 
 @output_mode("csv")
-def _write_csv(rows: list[tuple[str, ...]], writer: SQLResultWriter) -> None:
-    data = rows[1:]
+def _write_csv(rows: Iterator[tuple], writer: SQLResultWriter) -> None:
+    import csv
+
+    next(rows)  # headers are not part of this mode
     w = csv.writer(writer.dest, quoting=csv.QUOTE_NONNUMERIC)
 
-    w.writerows(data)
+    w.writerows(rows)
 
 
 @output_mode("tsv")
-def _write_tsv(rows: list[tuple[str, ...]], writer: SQLResultWriter) -> None:
-    data = rows[1:]
+def _write_tsv(rows: Iterator[tuple], writer: SQLResultWriter) -> None:
+    import csv
+
+    next(rows)  # headers are not part of this mode
     w = csv.writer(writer.dest, delimiter="\t", quoting=csv.QUOTE_NONNUMERIC)
 
-    w.writerows(data)
+    w.writerows(rows)
+
+
+def _write_formatted(
+    rows: Iterator[tuple],
+    format_row: RowFormatter,
+    writer: SQLResultWriter,
+    start: str,
+    sep: str,
+    end: str,
+) -> None:
+    """Write ``start``, the formatted rows separated by ``sep``, then ``end``"""
+    dest = writer.dest
+    lead = start
+
+    for batch in _batched(rows, writer.batch_size):
+        dest.write(lead + sep.join(starmap(format_row, batch)))
+        lead = sep
+
+    dest.write(end)
+
+
+class _TableLayout:
+    """Column widths and alignment for a table, derived from a sample of its rows"""
+
+    def __init__(
+        self, headers: tuple, sample: list[tuple], max_width: int | None = None
+    ) -> None:
+        self.max_width = max_width
+        self.widths = [len(str(h)) for h in headers]
+        self.numeric = [bool(sample)] * len(headers)
+
+        for row in sample:
+            for i, value in enumerate(row):
+                self.widths[i] = max(self.widths[i], len(_cell(value)))
+
+                if value is not None and not isinstance(value, (int, float)):
+                    self.numeric[i] = False
+
+        if max_width is not None:
+            self.widths = [min(w, max_width) for w in self.widths]
+
+        cells = [
+            f"{{:>{w}}}" if numeric else f"{{:<{w}}}"
+            for w, numeric in zip(self.widths, self.numeric)
+        ]
+        self._template = "| " + " | ".join(cells) + " |\n"
+
+    def format_row(self, row: tuple) -> str:
+        cells = ["" if v is None else str(v).replace("\n", " ") for v in row]
+
+        if self.max_width is not None:
+            for i, (text, width) in enumerate(zip(cells, self.widths)):
+                if len(text) > width:
+                    cells[i] = text[: max(width - 3, 0)] + "..."[:width]
+
+        return self._template.format(*cells)
+
 
+def _cell(value: object) -> str:
+    return "" if value is None else str(value).replace("\n", " ")
 
-def rows_to_dict(rows: list[tuple]) -> list[dict[str, str]]:
-    fields = rows[0]
-    data = rows[1:]
-    dict_data = []
 
-    for row in data:
-        dict_data.append(dict(zip(fields, row)))
+def _batched(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    it = iter(rows)
 
-    return dict_data
+    while batch := list(islice(it, size)):
+        yield batch
 
 
 def get_valid_output_modes() -> list[str]:
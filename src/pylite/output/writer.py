@@ -1,10 +1,23 @@
 import sys
 from io import TextIOWrapper
+from itertools import chain
 from sqlite3 import Cursor
-from typing import TextIO
+from typing import Iterator, TextIO
 
 from pylite.exceptions import SQLResultWriterError
+from pylite.output.destinations import OUTPUT_BUFFER_SIZE, open_output
 from pylite.output.modes import OUTPUT_MODES, get_valid_output_modes
+from pylite.progress import StatementProgress
+from pylite.sqlutil import ResultCursor
+from pylite.timer import StatementTimer, TimedStream
+
+# Number of rows pulled from the cursor at a time when streaming results
+DEFAULT_BATCH_SIZE = 1000
+# Widest a column may get in the "default" grid mode before its cells are cut off
+DEFAULT_MAX_COL_WIDTH = 80
+# Used by .pager when $PAGER isn't set.  -F quits straight away if everything fits
+# on one screen, so short results look the same as without a pager.
+DEFAULT_PAGER = "less -FRSX"
 
 
 class SQLResultWriter:
@@ -14,34 +27,133 @@ class SQLResultWriter:
         dest: str = "stdout",
         colsep: str = "|",
         rowsep: str = "\n",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_col_width: int = DEFAULT_MAX_COL_WIDTH,
     ) -> None:
         # Temporary defaults for internal attributes
         self._dest: TextIO = sys.stdout
         self._dest_name: str = dest  # track this as a string
         self._mode = "default"
+        # How files named with .output are opened, read when dest is set
+        self.output_buffer_size: int = OUTPUT_BUFFER_SIZE
+        self.background_output: bool = False
 
         # Use the setter logic in case they're initialized to non-default values
         self.mode = mode
         self.dest = dest  # type: ignore[assignment]
         self.colsep: str = colsep
         self.rowsep: str = rowsep
-
-    def write_result(self, data: str | Cursor, mode: str | None = None) -> None:
+        self.batch_size: int = batch_size
+        self.max_col_width: int = max_col_width
+        # Set while a statement is being timed with .timer
+        self.timer: StatementTimer | None = None
+        # Set while a statement's progress is being tracked
+        self.progress: StatementProgress | None = None
+        # Command that results shown on the terminal are piped through, if any
+        self.pager: str | None = None
+
+    def write_result(
+        self, data: str | Cursor | ResultCursor, mode: str | None = None
+    ) -> None:
         output_mode = mode or self.mode
 
         if output_mode == "meta":
             print(data, file=self.dest)
-        elif isinstance(data, Cursor):  # to appease mypy
-            rows = data.fetchall()
+        elif isinstance(data, (Cursor, ResultCursor)):  # to appease mypy
+            # Peek at the first batch so that empty results produce no output at all
+            first_batch = self._fetch_batch(data)
 
-            if len(rows) > 0:
+            if len(first_batch) > 0:
                 fields = tuple(col[0] for col in data.description)
-                rows = [fields] + rows
+                rows = chain([fields], first_batch, self._iter_batches(data))
 
-                OUTPUT_MODES[output_mode](rows, self)
+                if self.progress is not None:
+                    self.progress.output_started(self.dest)
+
+                if self.pager is not None and self._dest is sys.stdout:
+                    if sys.stdout.isatty():
+                        self._write_paged(rows, output_mode, self.pager)
+                        return
+
+                self._write_rows(rows, output_mode)
         else:  # should never get here
             raise TypeError("Invalid data type provided to write_result()")
 
+    def _fetch_batch(self, cursor: Cursor | ResultCursor) -> list[tuple]:
+        if self.timer is None:
+            batch = cursor.fetchmany(self.batch_size)
+        else:
+            with self.timer.measure("fetch"):
+                batch = cursor.fetchmany(self.batch_size)
+
+            self.timer.rows += len(batch)
+
+        if self.progress is not None:
+            self.progress.rows += len(batch)
+
+        return batch
+
+    def _iter_batches(self, cursor: Cursor | ResultCursor) -> Iterator[tuple]:
+        while batch := self._fetch_batch(cursor):
+            yield from batch
+
+    def _write_rows(self, rows: Iterator[tuple], output_mode: str) -> None:
+        if self.timer is None:
+            OUTPUT_MODES[output_mode](rows, self)
+        else:
+            self._write_timed(rows, output_mode, self.timer)
+
+    def _write_paged(self, rows: Iterator[tuple], output_mode: str, pager: str) -> None:
+        """Write the result to a pager process through a pipe
+
+        Rows are only fetched as fast as the pager reads them, which is as fast as
+        the user scrolls once the pipe's buffer has filled up.  Quitting the pager
+        abandons the rest of the result.
+        """
+        import shlex
+        import subprocess
+
+        try:
+            process = subprocess.Popen(
+                shlex.split(pager), stdin=subprocess.PIPE, text=True
+            )
+        except OSError as e:
+            raise SQLResultWriterError(f"Failed to start pager {pager}: {e}")
+
+        assert process.stdin is not None  # to appease mypy
+
+        original_dest = self._dest
+        self._dest = process.stdin  # type: ignore[assignment]
+
+        try:
+            self._write_rows(rows, output_mode)
+        except BrokenPipeError:
+            pass  # The pager was closed before the end of the result
+        finally:
+            self._dest = original_dest
+
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+            process.wait()
+
+    def _write_timed(
+        self, rows: Iterator[tuple], output_mode: str, timer: StatementTimer
+    ) -> None:
+        original_dest = self._dest
+
+        # Timing every write() has a cost of its own, so only do it when asked to
+        if timer.verbose:
+            self._dest = TimedStream(original_dest, timer)  # type: ignore[assignment]
+
+        try:
+            with timer.measure("format", "fetch", "write"):
+                OUTPUT_MODES[output_mode](rows, self)
+        finally:
+            self._dest = original_dest
+
     def write_error(self, message: str) -> None:
         original_dest = self._dest
 
@@ -100,7 +212,9 @@ class SQLResultWriter:
             self._dest = getattr(sys, new_dest)
         else:
             try:
-                self._dest = open(new_dest, "w")
+                self._dest = open_output(
+                    new_dest, self.output_buffer_size, self.background_output
+                )
             except OSError as e:
                 raise SQLResultWriterError(f"Failed to open file {new_dest}: {e}")
 
@@ -0,0 +1,99 @@
+import sqlite3
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pylite.access import database_uri
+from pylite.progress import StatementProgress
+from pylite.sqlutil import CachedCursor, CachedResult
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+def readonly_uri(database: str, uri: str | None = None) -> str:
+    """A URI that opens the database file at ``database`` read-only
+
+    If the session opened the database with ``uri``, that is used instead, so that
+    options such as immutable=1 carry over.
+    """
+    if uri is not None:
+        return database_uri(uri, readonly=True, uri=True)
+
+    from urllib.parse import quote
+
+    return f"file:{quote(str(Path(database).resolve()))}?mode=ro"
+
+
+class ReadOnlyPool:
+    """Read-only connections to one database file for running queries in parallel
+
+    Each of the ``size`` worker threads borrows a connection, runs one query and
+    fetches its whole result before handing the connection back.  SQLite releases
+    the GIL while it steps through a statement, so queries really do run side by
+    side.  Readers don't block each other in any journal mode, although in WAL mode
+    they don't block a writer either.  If the session opened the database with a
+    URI, it's given as ``uri`` so that options such as immutable=1 carry over.  Used
+    as a context manager, which closes the connections.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        size: int,
+        timeout: float | None = None,
+        uri: str | None = None,
+    ) -> None:
+        # Imported here to keep them off the startup path
+        from concurrent.futures import ThreadPoolExecutor
+        from queue import SimpleQueue
+
+        self.database = database
+        self.size = size
+        self.timeout = timeout
+        self._connections: SimpleQueue[sqlite3.Connection] = SimpleQueue()
+        self._opened: list[sqlite3.Connection] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="pylite-pool"
+        )
+
+        uri = readonly_uri(database, uri)
+
+        for _ in range(size):
+            connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._opened.append(connection)
+            self._connections.put(connection)
+
+    def __enter__(self) -> "ReadOnlyPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            # Don't wait for queries nobody is going to look at
+            for connection in self._opened:
+                connection.interrupt()
+
+        self.close()
+
+    def submit(self, sql: str) -> "Future[CachedCursor]":
+        """Start running ``sql``; the future's result replays its rows"""
+        return self._executor.submit(self._run, sql)
+
+    def close(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+        for connection in self._opened:
+            connection.close()
+
+        self._opened.clear()
+
+    def _run(self, sql: str) -> CachedCursor:
+        connection = self._connections.get()
+
+        try:
+            with StatementProgress(connection, self.timeout):
+                cursor = connection.execute(sql)
+                rows = cursor.fetchall()
+
+            return CachedCursor(CachedResult(cursor.description, rows, 0))
+        finally:
+            self._connections.put(connection)
@@ -0,0 +1,116 @@
+import sys
+import time
+from sqlite3 import Connection, OperationalError
+from typing import TextIO
+
+from pylite.exceptions import StatementCancelled
+
+# Virtual machine instructions SQLite executes between calls to the progress handler
+PROGRESS_INTERVAL = 10_000
+# Seconds a statement runs before its progress is shown
+PROGRESS_DELAY = 1.0
+# Seconds between updates of the progress line
+PROGRESS_REFRESH = 0.2
+
+
+class StatementProgress:
+    """Progress handler for one statement, with cancellation and a time limit
+
+    While installed on a connection (it's a context manager), SQLite calls it every
+    ``PROGRESS_INTERVAL`` VM instructions.  It aborts the statement once
+    ``cancel()`` has been called or ``timeout`` seconds have passed, and turns the
+    resulting "interrupted" error into StatementCancelled.  If ``stream`` is given,
+    a line with the elapsed time, VM steps and rows fetched so far is kept up to
+    date on it once the statement has run for ``PROGRESS_DELAY`` seconds.
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        timeout: float | None = None,
+        stream: TextIO | None = None,
+    ) -> None:
+        self.connection = connection
+        self.timeout = timeout
+        self.stream = stream
+        self.steps = 0
+        self.rows = 0
+        self.cancelled = False
+        self.timed_out = False
+        self._started = time.monotonic()
+        self._next_draw = self._started + PROGRESS_DELAY
+        self._drawn = False
+
+    def __enter__(self) -> "StatementProgress":
+        self._started = time.monotonic()
+        self._next_draw = self._started + PROGRESS_DELAY
+        self.connection.set_progress_handler(self, PROGRESS_INTERVAL)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.connection.set_progress_handler(None, 0)
+        self.clear()
+
+        if exc_type is not None and issubclass(exc_type, OperationalError):
+            if self.timed_out:
+                message = f"statement timed out after {self.timeout:g}s"
+                raise StatementCancelled(message) from exc_value
+            elif self.cancelled:
+                raise StatementCancelled("interrupted") from exc_value
+
+    def __call__(self) -> int:
+        self.steps += PROGRESS_INTERVAL
+        now = time.monotonic()
+
+        if self.cancelled:
+            return 1
+
+        if self.timeout and now - self._started > self.timeout:
+            self.timed_out = True
+
+            return 1
+
+        if self.stream is not None and now >= self._next_draw:
+            self._draw(now)
+
+        return 0
+
+    def cancel(self) -> None:
+        """Abort the statement from another thread"""
+        self.cancelled = True
+        self.connection.interrupt()
+
+    def output_started(self, dest: TextIO) -> None:
+        """Called before results are written to ``dest``
+
+        Clears the progress line, and stops drawing it if the results are going to
+        the same terminal.
+        """
+        self.clear()
+
+        if dest.isatty():
+            self.stream = None
+
+    def clear(self) -> None:
+        if self._drawn and self.stream is not None:
+            self.stream.write("\r\x1b[K")
+            self.stream.flush()
+
+        self._drawn = False
+
+    def _draw(self, now: float) -> None:
+        assert self.stream is not None  # to appease mypy
+
+        elapsed = now - self._started
+        self.stream.write(
+            f"\r\x1b[K{elapsed:.1f}s  {self.steps:,} VM steps  {self.rows:,} rows"
+        )
+        self.stream.flush()
+        self._drawn = True
+        self._next_draw = now + PROGRESS_REFRESH
+
+
+def progress_stream() -> TextIO | None:
+    """Where to draw progress: standard error, provided it's a terminal"""
+    return sys.stderr if sys.stderr.isatty() else None
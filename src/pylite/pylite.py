@@ -1,12 +1,156 @@
+import argparse
+import os
 import sys
 
-from pylite.core import repl
+from pylite.access import database_uri
+from pylite.tuning import TUNING_PROFILES
+
+# Entry points whose import cost --startup-profile reports
+STARTUP_MODULES = {"batch": "pylite.runner", "interactive": "pylite.core"}
 
 
 def main():
-    if len(sys.argv) < 2:
-        db = ":memory:"
-    else:
-        db = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        prog="pylite",
+        description="Simple SQLite REPL",
+        epilog="If SQL or --cmd is given, or standard input is not a terminal, the "
+        "statements are run without starting the interactive prompt.",
+    )
+
+    parser.add_argument(
+        "database",
+        nargs="?",
+        default=":memory:",
+        help="Database file to open (default: a transient in-memory database)",
+    )
+    parser.add_argument(
+        "sql",
+        nargs="*",
+        metavar="SQL",
+        help="SQL statements or dot commands to run",
+    )
+    parser.add_argument(
+        "-c",
+        "--cmd",
+        action="append",
+        default=[],
+        metavar="COMMAND",
+        help="Run COMMAND before any SQL arguments; may be repeated",
+    )
+    parser.add_argument(
+        "--bail",
+        action="store_true",
+        help="Stop at the first error when running non-interactively",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="When running non-interactively, run consecutive queries side by side "
+        "on N read-only connections",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=TUNING_PROFILES,
+        help="Tune the connection for a kind of work; see .tune",
+    )
+    parser.add_argument(
+        "--readonly",
+        action="store_true",
+        help="Open the database read-only; statements that write to it are refused",
+    )
+    parser.add_argument(
+        "--immutable",
+        action="store_true",
+        help="Open the database read-only and without any locking or checks for "
+        "changes, which is only safe if nothing else can change the file",
+    )
+    parser.add_argument(
+        "--uri",
+        action="store_true",
+        help="Treat DATABASE as a SQLite URI, such as file:data.db?nolock=1",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Report how long pylite takes to import and exit",
+    )
+    args = parser.parse_intermixed_args()
+
+    if args.startup_profile:
+        return startup_profile()
+
+    database = args.database
+    uri = args.uri or args.readonly or args.immutable
+
+    if uri:
+        if database == ":memory:" and not args.uri:
+            parser.error("--readonly and --immutable need a database file")
+
+        # SQLite only says it's "unable to open database file"
+        if not args.uri and not os.path.exists(database):
+            parser.error(f"{database}: no such file")
+
+        database = database_uri(database, args.readonly, args.immutable, args.uri)
+
+    commands = args.cmd + args.sql
+
+    if commands or not sys.stdin.isatty():
+        # Imported here so that non-interactive runs never load prompt_toolkit's
+        # REPL machinery
+        from pylite.runner import run_batch
+
+        return run_batch(
+            database,
+            commands,
+            bail=args.bail,
+            jobs=args.jobs,
+            profile=args.profile,
+            uri=uri,
+        )
+
+    from pylite.core import repl
+
+    repl(database, args.profile, uri)
+
+
+def startup_profile(top: int = 10) -> int:
+    """Print -X importtime figures for the batch and interactive startup paths
+
+    Each path is imported in a fresh interpreter, so the numbers include loading the
+    standard library modules it pulls in.
+    """
+    import subprocess
+
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+
+    for label, module in STARTUP_MODULES.items():
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+        timings = []  # (self, cumulative, name) in microseconds
+
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+
+            fields = line[len("import time:") :].split("|")
+            timings.append((int(fields[0]), int(fields[1]), fields[2].strip()))
+
+        total = sum(t[0] for t in timings)
+
+        print(f"{label} startup (import {module}): {total / 1000:.1f} ms")
+
+        for self_us, cumulative_us, name in sorted(timings, reverse=True)[:top]:
+            print(
+                f"  {self_us / 1000:7.1f} ms self {cumulative_us / 1000:7.1f} ms  {name}"
+            )
 
-    repl(db)
+    return 0
@@ -0,0 +1,325 @@
+import sqlite3
+import sys
+from collections.abc import Callable, Iterable
+from contextlib import nullcontext
+
+from pylite.commands import handle_dot_command
+from pylite.exceptions import (
+    BatchStatementError,
+    PyliteException,
+    REPLResetEvent,
+    StatementCancelled,
+)
+from pylite.input import SQLScriptReader
+from pylite.pool import ReadOnlyPool
+from pylite.progress import StatementProgress
+from pylite.session import PyliteSession
+from pylite.sqlutil import is_query
+from pylite.tuning import connect
+
+# Savepoint that holds the statements of an atomic batch, see run_statements()
+BATCH_SAVEPOINT = "pylite_batch"
+
+
+def run_statement(
+    session: PyliteSession,
+    text: str,
+    progress: StatementProgress | None = None,
+    commit: bool = True,
+) -> None:
+    """Execute one SQL statement and write its result
+
+    The statement runs in its own transaction, which is rolled back if it fails,
+    unless ``commit`` is false and the caller takes care of the transaction.  Errors
+    are left to the caller; a statement that is cancelled or runs out of time raises
+    StatementCancelled.
+    """
+    if progress is None:
+        progress = session.new_progress()
+
+    with session.connection if commit else nullcontext(), progress:
+        session.writer.progress = progress
+        session.start_timer()
+
+        try:
+            with session.timed("execute"):
+                result = session.execute(text)
+
+            session.write_result(result)
+        finally:
+            session.stop_timer()
+            session.writer.progress = None
+
+
+def run_statements(
+    session: PyliteSession,
+    statements: list[str],
+    atomic: bool = False,
+    new_progress: Callable[[], StatementProgress] | None = None,
+) -> None:
+    """Execute ``statements`` in turn, writing each result as soon as it's ready
+
+    Each statement commits on its own, unless ``atomic``, when they all run in one
+    transaction that is rolled back if any of them fails.  The first error stops
+    the rest from running; with more than one statement, it's raised as
+    BatchStatementError saying which statement failed.
+    """
+    if new_progress is None:
+        new_progress = session.new_progress
+
+    count = len(statements)
+    atomic = atomic and count > 1
+
+    if atomic:
+        session.connection.execute(f"SAVEPOINT {BATCH_SAVEPOINT}")
+
+    try:
+        for index, text in enumerate(statements, 1):
+            try:
+                run_statement(session, text, new_progress(), commit=not atomic)
+            except (sqlite3.Error, PyliteException) as e:
+                if count == 1:
+                    raise
+
+                message = f"in statement {index} of {count}: {e}"
+
+                if atomic:
+                    message += "; the batch was rolled back"
+
+                raise BatchStatementError(message) from e
+    except BaseException:
+        # Some errors roll back the whole transaction, savepoint included
+        if atomic and session.connection.in_transaction:
+            session.connection.execute(f"ROLLBACK TO {BATCH_SAVEPOINT}")
+            session.connection.execute(f"RELEASE {BATCH_SAVEPOINT}")
+
+        raise
+
+    if atomic:
+        session.connection.execute(f"RELEASE {BATCH_SAVEPOINT}")
+
+
+def run_statements_in_thread(
+    session: PyliteSession, statements: list[str], atomic: bool = False
+) -> None:
+    """Like run_statements(), but on a worker thread so that Ctrl-C can cancel it
+
+    Ctrl-C cancels the statement that is running and keeps the ones after it from
+    starting.  The session's connection has to be opened with
+    ``check_same_thread=False``.
+    """
+    import threading
+
+    errors: list[BaseException] = []
+    # Waiting on an event rather than join(), which can lose track of the thread
+    # when it's interrupted
+    done = threading.Event()
+    cancelled = threading.Event()
+    lock = threading.Lock()
+    current: StatementProgress | None = None
+
+    def new_progress() -> StatementProgress:
+        nonlocal current
+        progress = session.new_progress()
+
+        with lock:
+            if cancelled.is_set():
+                raise StatementCancelled("interrupted")
+
+            current = progress
+
+        return progress
+
+    def work() -> None:
+        try:
+            run_statements(session, statements, atomic, new_progress)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            done.set()
+
+    worker = threading.Thread(target=work, name="pylite-statement", daemon=True)
+    worker.start()
+
+    while not done.is_set():
+        try:
+            done.wait(0.1)
+        except KeyboardInterrupt:
+            with lock:
+                cancelled.set()
+
+                if current is not None:
+                    current.cancel()
+
+    worker.join()
+
+    if errors:
+        raise errors[0]
+
+
+def run_queries(
+    session: PyliteSession, queries: list[str], jobs: int, bail: bool = False
+) -> int:
+    """Run ``queries`` side by side on up to ``jobs`` read-only connections
+
+    Results are written in the order the queries were given, each one once it and
+    everything before it has finished.  The queries run one at a time on the
+    session's own connection when the database isn't a file or a transaction is
+    open, since other connections wouldn't see its changes.  Returns 0 if every
+    query succeeded and 1 otherwise; with ``bail``, nothing is written after the
+    first error.
+    """
+    status = 0
+    database = session.connection.execute("PRAGMA database_list").fetchone()[2]
+
+    if (
+        jobs < 2
+        or len(queries) < 2
+        or not database
+        or session.connection.in_transaction
+    ):
+        for text in queries:
+            try:
+                run_statement(session, text)
+            except (sqlite3.Error, PyliteException) as e:
+                session.write_error(f"Error: {e}")
+                status = 1
+
+                if bail:
+                    break
+
+        return status
+
+    session.history.extend(queries)
+
+    with ReadOnlyPool(
+        database, min(jobs, len(queries)), session.statement_timeout, session.uri
+    ) as pool:
+        futures = [pool.submit(text) for text in queries]
+
+        for future in futures:
+            try:
+                session.write_result(future.result())
+            except (sqlite3.Error, PyliteException) as e:
+                session.write_error(f"Error: {e}")
+                status = 1
+
+                if bail:
+                    break
+
+    return status
+
+
+def collect_parallel(session: PyliteSession, text: str) -> None:
+    """Add a statement to the open .parallel block"""
+    assert session.parallel is not None  # to appease mypy
+
+    if is_query(text):
+        session.parallel.append(text)
+    else:
+        session.write_error("Error: only queries can be run in a .parallel block")
+
+
+def run_script(
+    session: PyliteSession, lines: Iterable[str], bail: bool = False, jobs: int = 1
+) -> int:
+    """Run SQL statements and dot commands without an interactive prompt
+
+    Returns 0 if everything succeeded and 1 otherwise.  With ``bail``, stops at the
+    first error instead of carrying on with the rest of the script.  With ``jobs``
+    above 1, each run of consecutive queries is spread over that many read-only
+    connections by run_queries().
+    """
+    status = 0
+    script = iter(SQLScriptReader(lines))
+    # Consecutive queries waiting to be run together
+    queries: list[str] = []
+
+    while True:
+        try:
+            text = next(script, None)
+
+            if jobs > 1 and text is not None and _is_parallel_query(text):
+                queries.append(text)
+                continue
+
+            if queries:
+                pending, queries = queries, []
+
+                if run_queries(session, pending, jobs, bail):
+                    status = 1
+
+                    if bail:
+                        break
+
+            if text is None:
+                break
+            elif text.startswith("."):
+                handle_dot_command(text, session)
+            elif session.parallel is not None:
+                collect_parallel(session, text)
+            else:
+                run_statement(session, text)
+        except REPLResetEvent:
+            continue  # Normal end of a dot command
+        except EOFError:
+            break  # .quit
+        except (sqlite3.Error, PyliteException, OSError) as e:
+            session.write_error(f"Error: {e}")
+            status = 1
+
+            if bail:
+                break
+
+    sys.stdout.flush()
+
+    return status
+
+
+def run_batch(
+    database: str,
+    commands: list[str] | None = None,
+    bail: bool = False,
+    jobs: int = 1,
+    profile: str | None = None,
+    uri: bool = False,
+) -> int:
+    """Run ``commands``, or the script on standard input if there are none
+
+    With ``uri``, ``database`` is a URI rather than a file name.
+    """
+    connection, tuning = connect(database, profile, uri)
+    session = PyliteSession(
+        connection=connection, tuning=tuning, uri=database if uri else None
+    )
+
+    try:
+        if commands:
+            lines: Iterable[str] = [_as_script_line(c) for c in commands]
+        else:
+            lines = sys.stdin
+
+        return run_script(session, lines, bail=bail, jobs=jobs)
+    finally:
+        # Flushes the buffers of an .output file and finishes its compressed stream
+        del session.dest
+        restore_tuning(session)
+        session.connection.close()
+
+
+def restore_tuning(session: PyliteSession) -> None:
+    """Undo .tune and --profile before the session's connection is closed"""
+    for name, error in session.tuning.restore():
+        session.write_error(f"Error: couldn't restore {name}: {error}")
+
+
+def _is_parallel_query(text: str) -> bool:
+    return not text.startswith(".") and is_query(text)
+
+
+def _as_script_line(command: str) -> str:
+    # Statements given on the command line don't need a trailing semicolon
+    if not command.lstrip().startswith(".") and not sqlite3.complete_statement(command):
+        command += "\n;"
+
+    return command + "\n"
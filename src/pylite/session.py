@@ -1,40 +1,105 @@
-from sqlite3 import Connection
-from typing import Any, TextIO
+from __future__ import annotations
 
-from prompt_toolkit import PromptSession
-from prompt_toolkit.lexers import PygmentsLexer
-from prompt_toolkit.styles import Style
-from pygments.lexers.sql import SqlLexer
+import sys
+from collections import deque
+from contextlib import contextmanager
+from importlib.util import find_spec
+from sqlite3 import Connection, Cursor, DatabaseError
+from typing import TYPE_CHECKING, Any, Iterator, TextIO
 
+from pylite.access import READ_WRITE, ReadOnlyGuard, open_mode
+from pylite.cache import ResultCache
+from pylite.catalog import SchemaCatalog
+from pylite.columnar import fetch_columns, to_numpy
+from pylite.exceptions import ReadOnlyDatabaseError
 from pylite.input import (
     DEFAULT_PROMPT_CONTINUATION,
     DEFAULT_PROMPT_MESSAGE,
     SQLPromptReader,
 )
 from pylite.output import SQLResultWriter
+from pylite.progress import StatementProgress, progress_stream
+from pylite.sqlutil import ResultCursor
+from pylite.timer import StatementTimer
+from pylite.tuning import ConnectionTuning
 
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
 
-class PylitePromptSession:
-    def __init__(self, connection: Connection) -> None:
+# Statements kept in PyliteSession.history, for .recommend-indexes
+HISTORY_SIZE = 1000
+
+
+class PyliteSession:
+    """A connection plus the output settings that dot commands operate on
+
+    Doesn't create any prompt_toolkit objects, which makes it suitable for
+    non-interactive runs.  PylitePromptSession adds the interactive prompt.
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        tuning: ConnectionTuning | None = None,
+        uri: str | None = None,
+    ) -> None:
         self.connection = connection
-        self.style = Style.from_dict(
-            {
-                "pygments.keyword": "#33C3FF",
-                "pygments.literal.string": "#FF5833",
-            }
-        )
-        self.session: PromptSession = PromptSession(
-            lexer=PygmentsLexer(SqlLexer),
-            style=self.style,
-            include_default_pygments_style=False,
-        )
-        self.reader = SQLPromptReader(self.session)
+        # The URI the database was opened with, if it wasn't opened by file name
+        self.uri = uri
+        self.open_mode = open_mode(uri)
+        self.write_guard: ReadOnlyGuard | None = None
+
+        if self.open_mode != READ_WRITE:
+            self.write_guard = ReadOnlyGuard()
+            connection.set_authorizer(self.write_guard)
+
+        # Set by .tune and --profile, and undone when the session ends
+        self.tuning = tuning or ConnectionTuning(connection)
         self.writer = SQLResultWriter()
+        self.timer_mode = "off"
+        self.catalog = SchemaCatalog(connection)
+        # Set by .cache on; queries go straight to the connection otherwise
+        self.cache: ResultCache | None = None
+        # Seconds a statement may run before it's cancelled; None for no limit
+        self.statement_timeout: float | None = None
+        self.show_progress = True
+        # Set by .atomic on; input with several statements then runs as one
+        # transaction
+        self.atomic_batches = False
+        # Queries collected by an open .parallel block, and how many may run at once
+        self.parallel: list[str] | None = None
+        self.parallel_jobs = 1
+        # The most recent SQL statements run with execute(), oldest first
+        self.history: deque[str] = deque(maxlen=HISTORY_SIZE)
 
-    def prompt(self) -> str:
-        text = self.reader.prompt()
+    @property
+    def readonly(self) -> bool:
+        return self.write_guard is not None
 
-        return text
+    def execute(self, sql: str, params: Any = ()) -> Cursor | ResultCursor:
+        self.history.append(sql)
+
+        if self.write_guard is None:
+            return self._execute(sql, params)
+
+        self.write_guard.refused = None
+
+        try:
+            return self._execute(sql, params)
+        except DatabaseError as e:
+            if self.write_guard.refused is None:
+                raise
+
+            raise ReadOnlyDatabaseError(
+                f"can't write to {self.write_guard.refused}: the database was "
+                f"opened {self.open_mode}"
+            ) from e
+
+    def _execute(self, sql: str, params: Any) -> Cursor | ResultCursor:
+        if self.cache is None:
+            return self.connection.execute(sql, params)
+
+        return self.cache.execute(self.connection, sql, params)
 
     def write_result(self, data: Any, mode: str | None = None) -> None:
         self.writer.write_result(data, mode)
@@ -42,29 +107,51 @@ class PylitePromptSession:
     def write_error(self, message: str) -> None:
         self.writer.write_error(message)
 
-    @property
-    def message(self) -> str:
-        return self.reader.message
+    def fetch_columns(
+        self, sql: str, params: Any = (), numpy: bool | None = None
+    ) -> dict[str, Any]:
+        """Run a query and return its result column by column, keyed by name
 
-    @message.setter
-    def message(self, new_message: str):
-        self.reader.message = new_message
+        Integer and float columns come back as typed arrays without a per-value
+        Python object.  These are NumPy arrays if ``numpy`` is true, or if it is
+        None and NumPy is installed, and ``array.array`` otherwise.  Columns
+        holding anything else are object arrays or lists.
+        """
+        columns = fetch_columns(self.execute(sql, params), self.writer.batch_size)
 
-    @message.deleter
-    def message(self) -> None:
-        self.reader.message = DEFAULT_PROMPT_MESSAGE
+        if numpy is None:
+            numpy = find_spec("numpy") is not None
 
-    @property
-    def continuation(self) -> str:
-        return self.reader.continuation
+        if numpy:
+            return to_numpy(columns)
 
-    @continuation.setter
-    def continuation(self, new_continuation: str) -> None:
-        self.reader.continuation = new_continuation
+        return {column.name: column.values for column in columns}
 
-    @continuation.deleter
-    def continuation(self) -> None:
-        self.reader.continuation = DEFAULT_PROMPT_CONTINUATION
+    def new_progress(self) -> StatementProgress:
+        stream = progress_stream() if self.show_progress else None
+
+        return StatementProgress(self.connection, self.statement_timeout, stream)
+
+    def start_timer(self) -> None:
+        if self.timer_mode == "off":
+            self.writer.timer = None
+        else:
+            self.writer.timer = StatementTimer(verbose=self.timer_mode == "verbose")
+
+    def stop_timer(self) -> None:
+        timer = self.writer.timer
+        self.writer.timer = None
+
+        if timer is not None:
+            print(timer.report(), file=sys.stderr)
+
+    @contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        if self.writer.timer is None:
+            yield
+        else:
+            with self.writer.timer.measure(phase):
+                yield
 
     @property
     def mode(self) -> str:
@@ -105,3 +192,65 @@ class PylitePromptSession:
     @rowsep.setter
     def rowsep(self, new_rowsep: str) -> None:
         self.writer.rowsep = new_rowsep
+
+
+class PylitePromptSession(PyliteSession):
+    def __init__(
+        self,
+        connection: Connection,
+        tuning: ConnectionTuning | None = None,
+        uri: str | None = None,
+    ) -> None:
+        # prompt_toolkit and Pygments are only loaded once an interactive session is
+        # actually started
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.lexers import PygmentsLexer
+        from prompt_toolkit.styles import Style
+        from pygments.lexers.sql import SqlLexer
+
+        from pylite.input.completer import SQLCompleter
+
+        super().__init__(connection, tuning, uri)
+
+        self.style = Style.from_dict(
+            {
+                "pygments.keyword": "#33C3FF",
+                "pygments.literal.string": "#FF5833",
+            }
+        )
+        self.session: PromptSession = PromptSession(
+            lexer=PygmentsLexer(SqlLexer),
+            completer=SQLCompleter(self.catalog),
+            style=self.style,
+            include_default_pygments_style=False,
+        )
+        self.reader = SQLPromptReader(self.session)
+
+    def prompt(self) -> str:
+        text = self.reader.prompt()
+
+        return text
+
+    @property
+    def message(self) -> str:
+        return self.reader.message
+
+    @message.setter
+    def message(self, new_message: str):
+        self.reader.message = new_message
+
+    @message.deleter
+    def message(self) -> None:
+        self.reader.message = DEFAULT_PROMPT_MESSAGE
+
+    @property
+    def continuation(self) -> str:
+        return self.reader.continuation
+
+    @continuation.setter
+    def continuation(self, new_continuation: str) -> None:
+        self.reader.continuation = new_continuation
+
+    @continuation.deleter
+    def continuation(self) -> None:
+        self.reader.continuation = DEFAULT_PROMPT_CONTINUATION
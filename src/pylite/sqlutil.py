@@ -0,0 +1,74 @@
+import re
+from itertools import islice
+from typing import Any, Iterator
+
+# Statements that only read.  A WITH clause can lead into a write, so those count
+# as queries only when no writing keyword shows up anywhere in them.
+_QUERY = re.compile(r"(?:SELECT|VALUES|WITH)\b", re.IGNORECASE)
+_WRITE_KEYWORD = re.compile(r"\b(?:INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+# String literals and quoted identifiers are kept as they are; comments and runs of
+# whitespace outside of them collapse to a single space
+_NORMALIZE = re.compile(
+    r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|(?:--[^\n]*|/\*.*?\*/|\s+)+", re.DOTALL
+)
+
+
+def normalize_sql(sql: str) -> str:
+    normalized = _NORMALIZE.sub(lambda m: m.group(1) or " ", sql)
+
+    return normalized.strip().rstrip(";").rstrip()
+
+
+def is_query(sql: str) -> bool:
+    return is_normalized_query(normalize_sql(sql))
+
+
+def is_normalized_query(normalized: str) -> bool:
+    if not _QUERY.match(normalized):
+        return False
+
+    return not (normalized[:4].upper() == "WITH" and _WRITE_KEYWORD.search(normalized))
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class CachedResult:
+    def __init__(self, description: Any, rows: list[tuple], size: int) -> None:
+        self.description = description
+        self.rows = rows
+        self.size = size
+
+
+class ResultCursor:
+    """The parts of the Cursor interface that SQLResultWriter relies on"""
+
+    description: Any
+
+    def fetchmany(self, size: int = 1) -> list[tuple]:
+        raise NotImplementedError
+
+    def fetchall(self) -> list[tuple]:
+        rows = []
+
+        while batch := self.fetchmany(1000):
+            rows.extend(batch)
+
+        return rows
+
+    def __iter__(self) -> Iterator[tuple]:
+        while batch := self.fetchmany(1000):
+            yield from batch
+
+
+class CachedCursor(ResultCursor):
+    """Replays a cached result"""
+
+    def __init__(self, entry: CachedResult) -> None:
+        self.description = entry.description
+        self._rows = iter(entry.rows)
+
+    def fetchmany(self, size: int = 1) -> list[tuple]:
+        return list(islice(self._rows, size))
@@ -0,0 +1,81 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, TextIO
+
+TIMER_MODES = ("off", "on", "verbose")
+PHASES = ("execute", "fetch", "format", "write")
+
+
+class StatementTimer:
+    """Wall and CPU time spent on one statement, broken down by phase
+
+    ``execute`` covers running the statement up to its first row, ``fetch`` pulling
+    rows off the cursor, ``write`` handing text to the destination and ``format``
+    whatever the output mode spends in between.
+    """
+
+    def __init__(self, verbose: bool = False) -> None:
+        self.verbose = verbose
+        self.rows = 0
+        self.wall = dict.fromkeys(PHASES, 0.0)
+        self.cpu = dict.fromkeys(PHASES, 0.0)
+
+    @contextmanager
+    def measure(self, phase: str, *nested: str) -> Iterator[None]:
+        """Charge the time spent in the block to ``phase``
+
+        Time recorded for any of the ``nested`` phases while the block runs is not
+        counted twice.
+        """
+        nested_wall = sum(self.wall[p] for p in nested)
+        nested_cpu = sum(self.cpu[p] for p in nested)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        try:
+            yield
+        finally:
+            self.add(phase, wall_start, cpu_start)
+            self.wall[phase] -= sum(self.wall[p] for p in nested) - nested_wall
+            self.cpu[phase] -= sum(self.cpu[p] for p in nested) - nested_cpu
+
+    def add(self, phase: str, wall_start: float, cpu_start: float) -> None:
+        self.wall[phase] += time.perf_counter() - wall_start
+        self.cpu[phase] += time.process_time() - cpu_start
+
+    def report(self) -> str:
+        real = sum(self.wall.values())
+        cpu = sum(self.cpu.values())
+        lines = [f"Run Time: real {real:.3f} cpu {cpu:.3f}"]
+
+        if self.verbose:
+            for phase in PHASES:
+                lines.append(
+                    f"  {phase:<8} real {self.wall[phase]:.3f} cpu {self.cpu[phase]:.3f}"
+                )
+
+            rate = self.rows / real if real > 0 else 0.0
+            lines.append(f"  rows     {self.rows} ({rate:,.0f} rows/s)")
+
+        return "\n".join(lines)
+
+
+class TimedStream:
+    """Wraps an output stream and charges time spent in write() to a timer"""
+
+    def __init__(self, stream: TextIO, timer: StatementTimer) -> None:
+        self._stream = stream
+        self._timer = timer
+
+    def write(self, text: str) -> int:
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        try:
+            return self._stream.write(text)
+        finally:
+            self._timer.add("write", wall_start, cpu_start)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
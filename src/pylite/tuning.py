@@ -0,0 +1,164 @@
+import sqlite3
+from sqlite3 import Connection
+from typing import Any
+
+from pylite.access import READ_WRITE, open_mode
+
+# Size of the prepared statement cache Python gives a connection by default
+DEFAULT_CACHED_STATEMENTS = 128
+
+# Settings applied together by .tune PROFILE and --profile, in this order.  All but
+# cached_statements are PRAGMAs.  That one is the size of the connection's prepared
+# statement cache, which Python only lets be chosen when connecting, so it takes
+# effect with --profile alone.
+TUNING_PROFILES: dict[str, dict[str, Any]] = {
+    "safe-default": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -2000,  # SQLite's default of about 2 MiB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "threads": 0,
+        "query_only": "OFF",
+        "cached_statements": DEFAULT_CACHED_STATEMENTS,
+    },
+    "bulk-load": {
+        "journal_mode": "WAL",
+        # Nothing is synced until the OS gets to it: a crash can lose the last
+        # transactions, but not corrupt the database in WAL mode
+        "synchronous": "OFF",
+        "cache_size": -262144,  # 256 MiB
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "threads": 4,  # helper threads for the sorts that CREATE INDEX does
+        "query_only": "OFF",
+        "cached_statements": 256,
+    },
+    "analytics-readonly": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -1048576,  # 1 GiB
+        "mmap_size": 1 << 30,
+        "temp_store": "MEMORY",
+        "threads": 4,
+        "query_only": "ON",
+        "cached_statements": 512,
+    },
+}
+
+# PRAGMAs that read back as a number standing for one of these names
+_NAMED_VALUES = {
+    "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+    "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+    "query_only": ("OFF", "ON"),
+}
+
+
+def connect(
+    database: str, profile: str | None = None, uri: bool = False, **kwargs: Any
+) -> tuple[Connection, "ConnectionTuning"]:
+    """Open ``database``, or the URI it is with ``uri``, with a profile's settings"""
+    cached_statements = DEFAULT_CACHED_STATEMENTS
+
+    if profile is not None:
+        cached_statements = TUNING_PROFILES[profile]["cached_statements"]
+
+    connection = sqlite3.connect(
+        database, cached_statements=cached_statements, uri=uri, **kwargs
+    )
+    readonly = uri and open_mode(database) != READ_WRITE
+    tuning = ConnectionTuning(connection, cached_statements, readonly)
+
+    if profile is not None:
+        tuning.apply(profile)
+
+    return connection, tuning
+
+
+class ConnectionTuning:
+    """Profiles applied to a connection, and the settings they replaced
+
+    The first value seen for each setting is kept, so ``restore()`` puts back the
+    connection's own settings however many profiles were applied since.  The
+    journal mode is stored in the database file, so it's left alone on read-only
+    connections.
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+        readonly: bool = False,
+    ) -> None:
+        self.connection = connection
+        self.cached_statements = cached_statements
+        self.readonly = readonly
+        self.profile: str | None = None
+        self._original: dict[str, Any] = {}
+
+    def current(self) -> list[tuple[str, Any]]:
+        """Each setting a profile covers, with its value on the connection"""
+        settings = TUNING_PROFILES["safe-default"]
+
+        return [(name, self._read(name)) for name in settings]
+
+    def apply(self, profile: str) -> list[tuple[str, Any, Any]]:
+        """Apply ``profile`` and return (setting, before, after) for each setting"""
+        changes = []
+
+        for name, value in TUNING_PROFILES[profile].items():
+            before = self._read(name)
+
+            if name != "cached_statements" and not (
+                self.readonly and name == "journal_mode"
+            ):
+                if name not in self._original:
+                    self._original[name] = self._read_raw(name)
+
+                self.connection.execute(f"PRAGMA {name} = {value}")
+
+            changes.append((name, before, self._read(name)))
+
+        self.profile = profile
+
+        return changes
+
+    def restore(self) -> list[tuple[str, sqlite3.Error]]:
+        """Put back the settings from before the first profile was applied
+
+        Settings are restored in reverse order, so that query_only is turned off
+        before the journal mode changes.  Returns the ones that couldn't be.
+        """
+        failures = []
+
+        for name, value in reversed(self._original.items()):
+            if value is None:
+                continue
+
+            try:
+                self.connection.execute(f"PRAGMA {name} = {value}")
+            except sqlite3.Error as e:
+                failures.append((name, e))
+
+        self._original.clear()
+        self.profile = None
+
+        return failures
+
+    def _read(self, name: str) -> Any:
+        if name == "cached_statements":
+            return self.cached_statements
+
+        value = self._read_raw(name)
+        names = _NAMED_VALUES.get(name)
+
+        if names is not None and isinstance(value, int) and 0 <= value < len(names):
+            return names[value]
+
+        return value
+
+    def _read_raw(self, name: str) -> Any:
+        row = self.connection.execute(f"PRAGMA {name}").fetchone()
+
+        # mmap_size reads back nothing when memory-mapping isn't available
+        return row[0] if row is not None else None
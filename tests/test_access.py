@@ -0,0 +1,49 @@
+import sqlite3
+
+import pytest
+
+from pylite.access import IMMUTABLE, READ_ONLY, READ_WRITE, database_uri, open_mode
+from pylite.exceptions import ReadOnlyDatabaseError
+from pylite.session import PyliteSession
+
+
+def test_database_uri_and_open_mode(tmp_path):
+    path = tmp_path / "a b.db"
+
+    assert database_uri(str(path), readonly=True) == f"file:{tmp_path}/a%20b.db?mode=ro"
+    assert database_uri("file:x.db?nolock=1", immutable=True, uri=True) == (
+        "file:x.db?nolock=1&immutable=1"
+    )
+    assert open_mode(None) == READ_WRITE
+    assert open_mode("file:x.db?nolock=1") == READ_WRITE
+    assert open_mode("file:x.db?mode=ro") == READ_ONLY
+    assert open_mode("file:x.db?immutable=true") == IMMUTABLE
+
+
+def test_readonly_session_refuses_writes_to_main(tmp_path):
+    path = str(tmp_path / "t.db")
+    sqlite3.connect(path).executescript("CREATE TABLE t(a); INSERT INTO t VALUES (1);")
+    uri = database_uri(path, readonly=True)
+    session = PyliteSession(sqlite3.connect(uri, uri=True), uri=uri)
+
+    assert session.readonly
+    assert session.execute("SELECT a FROM t").fetchall() == [(1,)]
+
+    with pytest.raises(ReadOnlyDatabaseError, match="can't write to t"):
+        session.execute("UPDATE t SET a = 2")
+
+    session.execute("CREATE TEMP TABLE scratch(a)")
+    session.execute("INSERT INTO scratch SELECT a FROM t")
+
+    assert session.execute("SELECT * FROM scratch").fetchall() == [(1,)]
+
+
+def test_readonly_session_allows_pragma_functions(tmp_path):
+    path = str(tmp_path / "t.db")
+    sqlite3.connect(path).execute("CREATE TABLE t(a, b)")
+    uri = database_uri(path, immutable=True)
+    session = PyliteSession(sqlite3.connect(uri, uri=True), uri=uri)
+
+    columns = session.execute("SELECT name FROM pragma_table_info('t')").fetchall()
+
+    assert columns == [("a",), ("b",)]
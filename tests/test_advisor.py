@@ -0,0 +1,54 @@
+import sqlite3
+
+import pytest
+
+from pylite.advisor import IndexAdvisor
+
+
+def test_recommends_index_for_filter_and_order():
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(
+        "CREATE TABLE orders(id INTEGER PRIMARY KEY, customer_id, created_at);"
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000)"
+        "INSERT INTO orders SELECT i, i % 100, i FROM n;"
+    )
+    workload = [
+        "SELECT * FROM orders WHERE customer_id = 1 ORDER BY created_at DESC",
+        "SELECT * FROM orders WHERE id = 5",
+    ]
+
+    recommendations = IndexAdvisor(connection).recommend(workload)
+
+    assert [r.sql for r in recommendations] == [
+        'CREATE INDEX "idx_orders_customer_id_created_at" '
+        'ON "orders"("customer_id", "created_at" DESC)'
+    ]
+    assert recommendations[0].cost_after < recommendations[0].cost_before
+    # The schema copy is in memory; the database itself is left alone
+    assert connection.execute("SELECT count(*) FROM sqlite_master").fetchone() == (1,)
+
+
+def test_write_heavy_workload_gets_no_index():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE log(at, message)")
+    workload = ["SELECT * FROM log WHERE at = 1"] + [
+        "INSERT INTO log VALUES (1, 'x')"
+    ] * 10
+
+    assert IndexAdvisor(connection).recommend(workload) == []
+
+
+def test_sizes_only_the_tables_the_workload_mentions():
+    connection = sqlite3.connect(":memory:")
+    connection.executescript("CREATE TABLE log(at, message); CREATE TABLE other(x);")
+    statements: list[str] = []
+    connection.set_trace_callback(statements.append)
+
+    with IndexAdvisor(connection) as advisor:
+        advisor.recommend(["SELECT * FROM log WHERE at = 1"])
+
+    assert 'SELECT count(*) FROM "log"' in statements
+    assert 'SELECT count(*) FROM "other"' not in statements
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        advisor.copy.execute("SELECT 1")
@@ -0,0 +1,52 @@
+import sqlite3
+
+import pytest
+
+from pylite.access import database_uri
+from pylite.commands import handle_dot_command
+from pylite.exceptions import REPLResetEvent
+from pylite.session import PyliteSession
+
+
+def run(session, command):
+    with pytest.raises(REPLResetEvent):
+        handle_dot_command(command, session)
+
+
+def test_backup_and_restore_round_trip(tmp_path):
+    session = PyliteSession(sqlite3.connect(tmp_path / "t.db"))
+    session.connection.executescript(
+        "CREATE TABLE t(a); INSERT INTO t VALUES (1), (2); CREATE INDEX t_a ON t(a);"
+    )
+    backup = tmp_path / "backup.db"
+
+    run(session, f".backup --quiet --pages 1 {backup}")
+    session.connection.executescript("DROP TABLE t; CREATE TABLE u(b);")
+    run(session, f".restore --quiet {backup}")
+
+    assert session.connection.execute(
+        "SELECT type, name FROM sqlite_master ORDER BY name"
+    ).fetchall() == [("table", "t"), ("index", "t_a")]
+    assert session.connection.execute("SELECT * FROM t").fetchall() == [(1,), (2,)]
+
+
+@pytest.mark.parametrize(
+    "mode, label",
+    [({"readonly": True}, "read-only"), ({"immutable": True}, "immutable")],
+)
+def test_restore_into_readonly_session_is_refused(tmp_path, capsys, mode, label):
+    path = str(tmp_path / "t.db")
+    sqlite3.connect(path).execute("CREATE TABLE t(a)")
+    sqlite3.connect(tmp_path / "other.db").execute("CREATE TABLE u(b)")
+    uri = database_uri(path, **mode)
+    session = PyliteSession(sqlite3.connect(uri, uri=True), uri=uri)
+
+    run(session, f".restore --quiet {tmp_path / 'other.db'}")
+
+    assert (
+        f"Error: can't restore into the database: it was opened {label}"
+        in capsys.readouterr().err
+    )
+    assert sqlite3.connect(path).execute(
+        "SELECT name FROM sqlite_master"
+    ).fetchall() == [("t",)]
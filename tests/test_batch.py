@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+from pylite.input import SQLScriptReader
+from pylite.runner import run_script
+from pylite.session import PyliteSession
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+SCRIPT = """\
+.mode list
+CREATE TABLE t(x);
+INSERT INTO t VALUES (1),
+  (2);
+SELECT sum(x) FROM t;
+SELECT * FROM nope;
+.mode csv
+SELECT 'a', 'b';
+"""
+
+
+def run_pylite(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+
+    return subprocess.run(
+        [sys.executable, "-m", "pylite", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        stdin=subprocess.DEVNULL,
+    )
+
+
+def test_script_reader_yields_statements_and_dot_commands():
+    assert list(SQLScriptReader(SCRIPT.splitlines(keepends=True))) == [
+        ".mode list",
+        "CREATE TABLE t(x);",
+        "INSERT INTO t VALUES (1),\n  (2);",
+        "SELECT sum(x) FROM t;",
+        "SELECT * FROM nope;",
+        ".mode csv",
+        "SELECT 'a', 'b';",
+    ]
+
+
+def test_errors_set_the_status_and_the_script_carries_on(capsys):
+    session = PyliteSession(sqlite3.connect(":memory:"))
+
+    status = run_script(session, SCRIPT.splitlines(keepends=True))
+
+    captured = capsys.readouterr()
+    assert status == 1
+    assert captured.out.split() == ["3", '"a","b"']
+    assert "no such table: nope" in captured.err
+
+
+def test_bail_stops_at_the_first_error(capsys):
+    session = PyliteSession(sqlite3.connect(":memory:"))
+
+    status = run_script(session, SCRIPT.splitlines(keepends=True), bail=True)
+
+    assert status == 1
+    assert capsys.readouterr().out.split() == ["3"]
+
+
+def test_command_line_options_commands_and_exit_status(tmp_path):
+    database = str(tmp_path / "t.db")
+
+    # --cmd runs before the SQL arguments, wherever it is given, and options may
+    # follow the database
+    result = run_pylite(
+        database, "SELECT 1", "--cmd", ".mode list", "--bail", "SELECT 2"
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["1", "2"]
+
+    result = run_pylite(database, "--bail", "SELECT * FROM nope", "SELECT 2")
+
+    assert result.returncode == 1
+    assert result.stdout == ""
+    assert "no such table: nope" in result.stderr
+
+
+def test_read_keeps_its_writes(tmp_path):
+    database = str(tmp_path / "t.db")
+    script = tmp_path / "load.sql"
+    script.write_text("CREATE TABLE t(x);\nINSERT INTO t VALUES (1), (2);\n")
+
+    result = run_pylite(database, "-c", f".read {script}")
+
+    assert result.returncode == 0, result.stderr
+    assert sqlite3.connect(database).execute("SELECT count(*) FROM t").fetchone() == (
+        2,
+    )
@@ -0,0 +1,46 @@
+import sqlite3
+
+import pytest
+
+from pylite.exceptions import BatchStatementError
+from pylite.input import split_statements
+from pylite.runner import run_statements, run_statements_in_thread
+from pylite.session import PyliteSession
+
+SCRIPT = """
+CREATE TABLE t(x);
+INSERT INTO t VALUES (1), (2);
+SELECT sum(x) FROM t;
+INSERT INTO nope VALUES (3);
+SELECT 'not reached';
+"""
+
+
+def test_results_are_written_per_statement(capsys):
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    session = PyliteSession(connection)
+    session.mode = "list"
+
+    with pytest.raises(BatchStatementError, match="in statement 4 of 5: no such"):
+        run_statements_in_thread(session, split_statements(SCRIPT))
+
+    assert capsys.readouterr().out.split() == ["3"]
+    # Statements before the failing one were committed
+    assert connection.execute("SELECT count(*) FROM t").fetchone() == (2,)
+
+
+def test_atomic_batch_is_rolled_back():
+    connection = sqlite3.connect(":memory:")
+    session = PyliteSession(connection)
+    session.mode = "list"
+
+    with pytest.raises(BatchStatementError, match="the batch was rolled back"):
+        run_statements(session, split_statements(SCRIPT), atomic=True)
+
+    assert not connection.in_transaction
+    assert connection.execute("SELECT * FROM sqlite_master").fetchall() == []
+
+    run_statements(session, split_statements(SCRIPT)[:3], atomic=True)
+
+    assert not connection.in_transaction
+    assert connection.execute("SELECT count(*) FROM t").fetchone() == (2,)
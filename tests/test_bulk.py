@@ -0,0 +1,89 @@
+import sqlite3
+
+import pytest
+
+from pylite.bulk import BulkLoader, parse_literal_insert
+from pylite.commands import handle_dot_command
+from pylite.exceptions import REPLResetEvent
+from pylite.session import PyliteSession
+
+DUMP = """\
+BEGIN TRANSACTION;
+CREATE TABLE t(a, b);
+INSERT INTO "t" VALUES(1,'it''s');
+INSERT INTO "t" VALUES(2,X'00ff');
+INSERT INTO "t" VALUES(3,NULL);
+INSERT INTO t SELECT a + 3, b FROM t;
+COMMIT;
+END;
+"""
+
+
+def read(session, command):
+    with pytest.raises(REPLResetEvent):
+        handle_dot_command(command, session)
+
+
+def test_literal_inserts_become_parameters():
+    assert parse_literal_insert(
+        """INSERT INTO "t" VALUES(-1,2.5e3,'a''b',X'01');"""
+    ) == (
+        'INSERT INTO "t" VALUES(?,?,?,?)',
+        [-1, 2500.0, "a'b", b"\x01"],
+    )
+
+    for sql in (
+        "INSERT INTO t VALUES(1 + 1)",
+        "INSERT INTO t VALUES(1), (2)",
+        "INSERT INTO t VALUES(99999999999999999999)",
+        "INSERT INTO t SELECT 1",
+    ):
+        assert parse_literal_insert(sql) is None
+
+
+def test_read_bulk_loads_the_file_and_reports_rows(tmp_path, capsys):
+    session = PyliteSession(sqlite3.connect(":memory:"))
+    dump_file = tmp_path / "dump.sql"
+    dump_file.write_text(DUMP)
+
+    # BEGIN, COMMIT and END in the file would end the load's own transaction
+    read(session, f".read --bulk {dump_file}")
+
+    assert session.connection.execute("SELECT * FROM t ORDER BY a").fetchall() == [
+        (1, "it's"),
+        (2, b"\x00\xff"),
+        (3, None),
+        (4, "it's"),
+        (5, b"\x00\xff"),
+        (6, None),
+    ]
+    assert not session.connection.in_transaction
+    assert f"Loaded 6 rows from {dump_file}" in capsys.readouterr().err
+
+
+def test_failing_batch_rolls_back_the_whole_load(tmp_path, capsys):
+    session = PyliteSession(sqlite3.connect(":memory:"))
+    session.connection.execute("CREATE TABLE t(a PRIMARY KEY)")
+    session.connection.commit()
+    dump_file = tmp_path / "dump.sql"
+    dump_file.write_text("".join(f"INSERT INTO t VALUES({i % 5});\n" for i in range(8)))
+
+    read(session, f".read --bulk {dump_file}")
+
+    assert "UNIQUE constraint failed" in capsys.readouterr().err
+    assert session.connection.execute("SELECT count(*) FROM t").fetchone() == (0,)
+
+
+def test_loader_batches_and_commits_every_n_rows():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t(a)")
+    statements: list[str] = []
+    connection.set_trace_callback(statements.append)
+
+    with BulkLoader(connection, batch_size=4, commit_every=4) as loader:
+        for i in range(10):
+            loader.insert("INSERT INTO t VALUES (?)", (i,))
+
+    assert loader.rows_written == 10
+    assert statements.count("COMMIT") == 3
+    assert connection.execute("SELECT count(*) FROM t").fetchone() == (10,)
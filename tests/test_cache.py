@@ -0,0 +1,75 @@
+import sqlite3
+
+from pylite.cache import ResultCache
+from pylite.sqlutil import CachedCursor, normalize_sql
+
+
+def run(cache, connection, sql):
+    cursor = cache.execute(connection, sql)
+
+    return cursor, cursor.fetchmany(100)
+
+
+def test_normalize_sql_keeps_literals():
+    sql = "SELECT  'a  b' -- comment\n FROM t;"
+
+    assert normalize_sql(sql) == "SELECT 'a  b' FROM t"
+
+
+def test_repeated_query_is_served_from_cache():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (x)")
+    connection.execute("INSERT INTO t VALUES (1), (2)")
+    cache = ResultCache()
+
+    _, first = run(cache, connection, "SELECT x FROM t")
+    cursor, second = run(cache, connection, "SELECT x  FROM t;")
+
+    assert isinstance(cursor, CachedCursor)
+    assert first == second == [(1,), (2,)]
+    assert cache.hits == 1
+
+
+def test_write_invalidates_cache():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (x)")
+    cache = ResultCache()
+
+    run(cache, connection, "SELECT count(*) FROM t")
+    connection.execute("INSERT INTO t VALUES (1)")
+    cursor, rows = run(cache, connection, "SELECT count(*) FROM t")
+
+    assert not isinstance(cursor, CachedCursor)
+    assert rows == [(1,)]
+
+
+def test_temp_and_attached_schema_changes_invalidate_cache():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (x)")
+    connection.execute("INSERT INTO t VALUES (1)")
+    cache = ResultCache()
+
+    run(cache, connection, "SELECT count(*) FROM t")
+    # Shadows main.t without changing anything in main
+    connection.execute("CREATE TEMP TABLE t AS SELECT 1 UNION ALL SELECT 2")
+
+    assert run(cache, connection, "SELECT count(*) FROM t")[1] == [(2,)]
+
+    connection.execute("ATTACH ':memory:' AS other")
+    cursor, _ = run(cache, connection, "SELECT count(*) FROM t")
+
+    assert not isinstance(cursor, CachedCursor)
+
+
+def test_lru_eviction_by_rows():
+    connection = sqlite3.connect(":memory:")
+    cache = ResultCache(max_rows=2)
+
+    run(cache, connection, "SELECT 1")
+    run(cache, connection, "SELECT 2")
+    run(cache, connection, "SELECT 1")
+    run(cache, connection, "SELECT 3")
+
+    assert cache.stats()["entries"] == 2
+    assert isinstance(run(cache, connection, "SELECT 1")[0], CachedCursor)
+    assert not isinstance(run(cache, connection, "SELECT 2")[0], CachedCursor)
@@ -0,0 +1,32 @@
+import sqlite3
+
+from pylite.catalog import SchemaCatalog
+
+
+def test_find_uses_like_semantics():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE Pokemon (id)")
+    connection.execute("CREATE TABLE moves (id)")
+    catalog = SchemaCatalog(connection)
+
+    assert [t.name for t in catalog.find("table", "POK%")] == ["Pokemon"]
+    assert [t.name for t in catalog.find("table", "m_ves")] == ["moves"]
+
+
+def test_catalog_follows_schema_changes():
+    connection = sqlite3.connect(":memory:")
+    catalog = SchemaCatalog(connection)
+
+    assert catalog.find("table") == []
+
+    connection.execute("CREATE TABLE t (a, b)")
+    catalog.refresh()
+    table = catalog.table("T")
+
+    assert table is not None
+    assert catalog.columns(table) == ["a", "b"]
+
+    connection.execute("ALTER TABLE t ADD COLUMN c")
+    catalog.refresh()
+
+    assert catalog.columns(table) == ["a", "b", "c"]
@@ -0,0 +1,54 @@
+import ast
+import io
+import math
+import sqlite3
+from array import array
+
+import pytest
+
+from pylite.columnar import fetch_columns, write_npy
+from pylite.commands import handle_dot_command
+from pylite.exceptions import REPLResetEvent
+from pylite.session import PyliteSession
+
+
+def test_columns_widen_as_values_require():
+    connection = sqlite3.connect(":memory:")
+    cursor = connection.execute(
+        "SELECT 1, 1, 1 UNION ALL SELECT 2, 2.5, 'x' UNION ALL SELECT 3, NULL, 3"
+    )
+
+    ints, floats, mixed = fetch_columns(cursor, batch_size=1)
+
+    assert ints.values == array("q", [1, 2, 3])
+    assert floats.values[:2] == array("d", [1.0, 2.5])
+    assert math.isnan(floats.values[2])
+    assert mixed.values == [1, "x", 3]
+
+
+def test_npy_header_and_data():
+    connection = sqlite3.connect(":memory:")
+    cursor = connection.execute("SELECT 'ab' UNION ALL SELECT 'c'")
+    (column,) = fetch_columns(cursor, batch_size=10)
+    dest = io.BytesIO()
+
+    write_npy(dest, column)
+
+    data = dest.getvalue()
+    header_length = int.from_bytes(data[8:10], "little")
+    header = ast.literal_eval(data[10 : 10 + header_length].decode("latin1"))
+    assert data[:8] == b"\x93NUMPY\x01\x00"
+    assert (10 + header_length) % 64 == 0
+    assert header == {"descr": "<U2", "fortran_order": False, "shape": (2,)}
+    assert data[10 + header_length :] == "abc\0".encode("utf-32-le")
+
+
+def test_export_takes_sql_as_typed(tmp_path, capsys):
+    session = PyliteSession(sqlite3.connect(":memory:"))
+    path = tmp_path / "out.npy"
+
+    with pytest.raises(REPLResetEvent):
+        handle_dot_command(f".export --quiet {path} SELECT 'a  b' AS \"x\"", session)
+
+    assert capsys.readouterr().err == ""
+    assert "a  b".encode("utf-32-le") in path.read_bytes()
@@ -0,0 +1,34 @@
+import sqlite3
+
+import pytest
+
+from pylite.dbstat import object_stats, summary
+
+
+def test_summary_and_object_stats(tmp_path):
+    connection = sqlite3.connect(tmp_path / "test.db")
+    connection.executescript(
+        "PRAGMA page_size = 1024; PRAGMA journal_mode = wal;"
+        "CREATE TABLE t(a); CREATE INDEX t_a ON t(a);"
+        "INSERT INTO t VALUES (randomblob(3000)), (1), (2);"
+    )
+
+    settings = dict(summary(connection).fetchall())
+
+    assert settings["page_size"] == 1024
+    assert settings["journal_mode"] == "wal"
+    assert settings["file_bytes"] == settings["page_count"] * 1024
+    assert settings["wal_bytes"] > 0
+
+    stats = object_stats(connection)
+
+    if stats is None:
+        pytest.skip("SQLite was built without dbstat")
+
+    names = [d[0] for d in stats.description]
+    rows = {row[0]: dict(zip(names, row)) for row in stats}
+
+    assert rows["t"]["type"] == "table"
+    assert rows["t"]["overflow_pages"] > 0
+    assert rows["t_a"]["type"] == "index"
+    assert rows["t"]["bytes"] == rows["t"]["pages"] * 1024
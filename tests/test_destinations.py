@@ -0,0 +1,34 @@
+import gzip
+import lzma
+
+import pytest
+
+from pylite.output.destinations import open_output
+
+
+@pytest.mark.parametrize("background", [False, True])
+@pytest.mark.parametrize(
+    "name, opener", [("out.txt.gz", gzip.open), ("out.txt.xz", lzma.open)]
+)
+def test_compressed_output_round_trips(tmp_path, name, opener, background):
+    path = tmp_path / name
+    text = "".join(f"{i}|row {i}\n" for i in range(10_000))
+
+    dest = open_output(str(path), buffer_size=4096, background=background)
+    dest.write(text)
+    dest.close()
+
+    with opener(path, "rt") as f:
+        assert f.read() == text
+
+
+def test_background_write_errors_reach_the_caller():
+    dest = open_output("/dev/full", buffer_size=16, background=True)
+
+    with pytest.raises(OSError):
+        for _ in range(100):
+            dest.write("x" * 100)
+            dest.flush()
+
+    with pytest.raises(OSError):
+        dest.close()
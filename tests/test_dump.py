@@ -0,0 +1,56 @@
+import gzip
+import sqlite3
+
+import pytest
+
+from pylite.commands import handle_dot_command
+from pylite.exceptions import REPLResetEvent
+from pylite.session import PyliteSession
+
+
+def test_parallel_dump_round_trips(tmp_path):
+    connection = sqlite3.connect(tmp_path / "source.db")
+    connection.executescript(
+        "CREATE TABLE a(id INTEGER PRIMARY KEY AUTOINCREMENT, name);"
+        "CREATE TABLE b(x, y);"
+        "CREATE INDEX b_x ON b(x);"
+        "INSERT INTO a(name) VALUES ('one'), ('it''s');"
+        "INSERT INTO b VALUES (1, 2.5), (2, NULL), (2, x'00ff');"
+        "DELETE FROM a WHERE id = 1;"
+        "ANALYZE;"
+    )
+    session = PyliteSession(connection)
+    dump_file = tmp_path / "dump.sql"
+
+    with pytest.raises(REPLResetEvent):
+        handle_dot_command(f".dump --jobs 2 --file {dump_file}", session)
+
+    restored = sqlite3.connect(tmp_path / "restored.db")
+    restored.executescript(dump_file.read_text())
+
+    for sql in (
+        "SELECT type, name, sql FROM sqlite_master ORDER BY name",
+        "SELECT * FROM a",
+        "SELECT * FROM b",
+        "SELECT * FROM sqlite_sequence",
+        "SELECT * FROM sqlite_stat1 ORDER BY idx",
+    ):
+        assert restored.execute(sql).fetchall() == connection.execute(sql).fetchall()
+
+
+def test_compression_needs_a_file(tmp_path, capsys):
+    session = PyliteSession(sqlite3.connect(":memory:"))
+    session.connection.execute("CREATE TABLE t(x)")
+    dump_file = tmp_path / "dump.sql.gz"
+
+    with pytest.raises(REPLResetEvent):
+        handle_dot_command(".dump --gzip", session)
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Error: --gzip and --xz need --file" in captured.err
+
+    with pytest.raises(REPLResetEvent):
+        handle_dot_command(f".dump --gzip --file {dump_file}", session)
+
+    assert "CREATE TABLE t(x);" in gzip.decompress(dump_file.read_bytes()).decode()
@@ -0,0 +1,75 @@
+import sqlite3
+
+import pytest
+
+from pylite.catalog import SchemaCatalog
+from pylite.commands import handle_dot_command
+from pylite.exceptions import REPLResetEvent
+from pylite.explain import analyze, query_plan, render_plan
+from pylite.progress import StatementProgress
+from pylite.session import PyliteSession
+
+
+def test_plan_flags_scans_temp_btrees_and_automatic_indexes():
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(
+        "CREATE TABLE t(a, b); CREATE TABLE u(a, b); CREATE INDEX u_a ON u(a);"
+        "INSERT INTO t VALUES (1, 2), (3, 4);"
+    )
+    sql = "SELECT * FROM t x JOIN t y ON x.b = y.b JOIN u ON u.a = x.a ORDER BY y.a"
+
+    plan = query_plan(connection, sql)
+
+    assert {step.detail: step.flags for step in plan} == {
+        "SCAN x": ["full table scan"],
+        "SEARCH y USING AUTOMATIC COVERING INDEX (b=?)": ["automatic index"],
+        "SEARCH u USING INDEX u_a (a=?)": [],
+        "USE TEMP B-TREE FOR ORDER BY": ["temp B-tree"],
+    }
+
+    run = analyze(
+        connection,
+        SchemaCatalog(connection),
+        sql,
+        plan,
+        StatementProgress(connection),
+        10,
+    )
+
+    lines = render_plan(plan).splitlines()
+
+    assert run.rows == 0
+    assert lines[0] == "QUERY PLAN"
+    assert "|--SCAN x  <-- full table scan, 2 rows in table" in lines
+    assert lines[-1] == "`--USE TEMP B-TREE FOR ORDER BY  <-- temp B-tree"
+
+
+def test_analyzed_writes_are_rolled_back():
+    connection = sqlite3.connect(":memory:")
+    connection.executescript("CREATE TABLE t(a); INSERT INTO t VALUES (1), (2);")
+    sql = "DELETE FROM t"
+
+    analyze(
+        connection,
+        SchemaCatalog(connection),
+        sql,
+        query_plan(connection, sql),
+        StatementProgress(connection),
+        10,
+    )
+
+    assert connection.execute("SELECT count(*) FROM t").fetchone() == (2,)
+
+
+def test_command_takes_sql_as_typed(capsys):
+    session = PyliteSession(sqlite3.connect(":memory:"))
+    session.connection.execute("CREATE TABLE t(a, b)")
+
+    with pytest.raises(REPLResetEvent):
+        handle_dot_command(
+            """.explain --analyze SELECT "a" FROM t WHERE b = 'x';""", session
+        )
+
+    captured = capsys.readouterr()
+    assert captured.err == ""
+    assert "SCAN t  <-- full table scan" in captured.out
@@ -0,0 +1,102 @@
+import sqlite3
+
+import pytest
+
+from pylite.commands import handle_dot_command
+from pylite.exceptions import REPLResetEvent
+from pylite.session import PyliteSession
+
+
+def run(session, command):
+    with pytest.raises(REPLResetEvent):
+        handle_dot_command(command, session)
+
+
+@pytest.fixture
+def session():
+    return PyliteSession(sqlite3.connect(":memory:"))
+
+
+def test_header_creates_text_columns(session, tmp_path):
+    data = tmp_path / "people.csv"
+    data.write_text("id,name\n1,ann\n2,bob\n")
+
+    run(session, f".import {data} people")
+
+    connection = session.connection
+    assert connection.execute(
+        "SELECT type FROM pragma_table_info('people')"
+    ).fetchall() == [
+        ("TEXT",),
+        ("TEXT",),
+    ]
+    assert connection.execute("SELECT * FROM people").fetchall() == [
+        ("1", "ann"),
+        ("2", "bob"),
+    ]
+
+
+def test_infer_types(session, tmp_path):
+    data = tmp_path / "scores.tsv"
+    data.write_text("id\tscore\tnote\n1\t2.5\tx\n2\t3\t\n")
+
+    run(session, f".import --infer-types {data} scores")
+
+    connection = session.connection
+    columns = connection.execute("SELECT name, type FROM pragma_table_info('scores')")
+    assert columns.fetchall() == [
+        ("id", "INTEGER"),
+        ("score", "REAL"),
+        ("note", "TEXT"),
+    ]
+    assert connection.execute("SELECT id, score FROM scores").fetchall() == [
+        (1, 2.5),
+        (2, 3.0),
+    ]
+
+
+def test_existing_table_takes_rows_in_column_order(session, tmp_path):
+    session.connection.execute("CREATE TABLE t(a INTEGER, b)")
+    data = tmp_path / "t.csv"
+    data.write_text("x,y\n1,2\n")
+
+    run(session, f".import {data} t")
+
+    assert session.connection.execute("SELECT * FROM t").fetchall() == [(1, "2")]
+
+
+def test_bad_row_rolls_back_the_import(session, tmp_path, capsys):
+    session.connection.execute("CREATE TABLE t(a NOT NULL)")
+    data = tmp_path / "t.ndjson"
+    data.write_text('{"a": 1}\n{"a": 2}\n{"b": 3}\n')
+
+    run(session, f".import {data} t")
+
+    assert "import rolled back" in capsys.readouterr().err
+    assert session.connection.execute("SELECT count(*) FROM t").fetchone() == (0,)
+
+
+def test_ndjson_columns_cover_keys_of_later_objects(session, tmp_path, capsys):
+    data = tmp_path / "events.ndjson"
+    data.write_text('{"a": 1, "b": {"x": 1}}\n{"a": 2, "c": 3}\n{"d": 4}\n')
+
+    run(session, f".import --sample 2 {data} events")
+
+    assert session.connection.execute("SELECT * FROM events").fetchall() == [
+        (1, '{"x": 1}', None),
+        (2, None, 3),
+        (None, None, None),
+    ]
+    assert "left out: d" in capsys.readouterr().err
+
+
+def test_ndjson_line_that_is_not_an_object(session, tmp_path, capsys):
+    data = tmp_path / "t.ndjson"
+    data.write_text('{"a": 1}\n\n[1, 2]\n')
+
+    run(session, f".import {data} t")
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert f"Error: {data}: line 3: not a JSON object" in captured.err
+    assert session.connection.execute("SELECT name FROM sqlite_schema").fetchall() == []
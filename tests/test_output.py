@@ -0,0 +1,101 @@
+import io
+import json
+import sqlite3
+
+from pylite.output import SQLResultWriter
+
+
+def make_writer(**kwargs) -> tuple[SQLResultWriter, io.StringIO]:
+    writer = SQLResultWriter(**kwargs)
+    buf = io.StringIO()
+    writer._dest = buf
+
+    return writer, buf
+
+
+def test_list_mode_streams_across_batches():
+    conn = sqlite3.connect(":memory:")
+    writer, buf = make_writer(mode="list", batch_size=2)
+
+    sql = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 5)"
+
+    writer.write_result(conn.execute(sql + " SELECT i, 'x' FROM n"))
+
+    assert buf.getvalue() == "1|x\n2|x\n3|x\n4|x\n5|x\n"
+
+
+def test_default_mode_truncates_wide_cells():
+    conn = sqlite3.connect(":memory:")
+    writer, buf = make_writer(max_col_width=8)
+
+    writer.write_result(conn.execute("SELECT 'abcdefghijkl' AS col"))
+
+    assert buf.getvalue() == (
+        "+----------+\n| col      |\n+==========+\n| abcde... |\n+----------+\n"
+    )
+
+
+def test_json_modes_match_json_dumps():
+    conn = sqlite3.connect(":memory:")
+    sql = (
+        "SELECT 1 AS a, 'x\"y' AS b, 2.5 AS a, NULL AS c "
+        "UNION ALL SELECT 'mixed', 'é', 1e999, 3"
+    )
+    expected = [
+        {"a": 2.5, "b": 'x"y', "c": None},
+        {"a": float("inf"), "b": "é", "c": 3},
+    ]
+
+    for mode, indent in (("json", None), ("json-pretty", 2)):
+        writer, buf = make_writer(mode=mode, batch_size=1)
+        writer.write_result(conn.execute(sql))
+
+        if indent is None:
+            text = "[" + ",\n".join(json.dumps(row) for row in expected) + "]\n"
+        else:
+            text = json.dumps(expected, indent=indent) + "\n"
+
+        assert buf.getvalue() == text
+
+
+class CountingCursor(sqlite3.Cursor):
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.fetches: list[int] = []
+
+    def fetchmany(self, size=1):
+        batch = super().fetchmany(size)
+        self.fetches.append(len(batch))
+
+        return batch
+
+
+def test_default_mode_fetches_in_batches_and_sizes_columns_from_the_first():
+    conn = sqlite3.connect(":memory:")
+    writer, buf = make_writer(batch_size=2, max_col_width=8)
+    cursor = conn.cursor(CountingCursor)
+
+    cursor.execute(
+        "SELECT 'ab' AS c UNION ALL SELECT 'a' "
+        "UNION ALL SELECT 'abcdef' UNION ALL SELECT 'abcdefghijkl' UNION ALL SELECT 'b'"
+    )
+    writer.write_result(cursor)
+
+    # Only the first batch is measured, so later rows are cut off to its widths
+    # rather than at max_col_width
+    assert cursor.fetches == [2, 2, 1, 0]
+    assert buf.getvalue() == (
+        "+----+\n| c  |\n+====+\n"
+        "| ab |\n+----+\n| a  |\n+----+\n"
+        "| .. |\n+----+\n| .. |\n+----+\n| b  |\n+----+\n"
+    )
+
+
+def test_empty_result_writes_nothing():
+    conn = sqlite3.connect(":memory:")
+
+    for mode in ("default", "list", "json", "markdown"):
+        writer, buf = make_writer(mode=mode)
+        writer.write_result(conn.execute("SELECT 1 AS a WHERE 0"))
+
+        assert buf.getvalue() == ""
@@ -0,0 +1,92 @@
+import io
+import shlex
+import sqlite3
+import sys
+
+import pytest
+
+from pylite.commands import handle_dot_command
+from pylite.exceptions import REPLResetEvent
+from pylite.output.writer import DEFAULT_PAGER
+from pylite.session import PyliteSession
+
+SQL = "SELECT 1 UNION ALL SELECT 2"
+
+
+class Terminal(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+def run(session, command):
+    with pytest.raises(REPLResetEvent):
+        handle_dot_command(command, session)
+
+
+def stub_pager(path) -> str:
+    """A pager command that saves what it's given to ``path``"""
+    script = f"import sys; open({str(path)!r}, 'w').write(sys.stdin.read())"
+
+    return shlex.join([sys.executable, "-c", script])
+
+
+def make_session(monkeypatch, stdout: io.StringIO) -> PyliteSession:
+    monkeypatch.setattr(sys, "stdout", stdout)
+    session = PyliteSession(sqlite3.connect(":memory:"))
+    session.writer.mode = "list"
+
+    return session
+
+
+def test_pager_on_and_off(monkeypatch):
+    session = make_session(monkeypatch, io.StringIO())
+
+    monkeypatch.setenv("PAGER", "more")
+    run(session, ".pager on")
+    assert session.writer.pager == "more"
+
+    monkeypatch.delenv("PAGER")
+    run(session, ".pager on")
+    assert session.writer.pager == DEFAULT_PAGER
+
+    run(session, ".pager off")
+    assert session.writer.pager is None
+
+
+def test_results_on_a_terminal_go_through_the_pager(monkeypatch, tmp_path):
+    stdout = Terminal()
+    session = make_session(monkeypatch, stdout)
+    paged = tmp_path / "paged.txt"
+
+    run(session, f".pager {stub_pager(paged)}")
+    session.write_result(session.execute(SQL))
+
+    assert paged.read_text() == "1\n2\n"
+    assert stdout.getvalue() == ""
+
+    # Nothing to page
+    paged.unlink()
+    session.write_result(session.execute("SELECT 1 WHERE 0"))
+
+    assert not paged.exists()
+
+
+def test_pager_is_skipped_off_the_terminal(monkeypatch, tmp_path):
+    stdout = io.StringIO()
+    session = make_session(monkeypatch, stdout)
+    paged = tmp_path / "paged.txt"
+
+    run(session, f".pager {stub_pager(paged)}")
+    session.write_result(session.execute(SQL))
+
+    assert stdout.getvalue() == "1\n2\n"
+
+    # Nor are results sent to a file
+    monkeypatch.setattr(sys, "stdout", Terminal())
+    output = tmp_path / "out.txt"
+    session.writer.dest = str(output)
+    session.write_result(session.execute(SQL))
+    del session.writer.dest
+
+    assert output.read_text() == "1\n2\n"
+    assert not paged.exists()
@@ -0,0 +1,34 @@
+import sqlite3
+
+from pylite.runner import run_queries
+from pylite.session import PyliteSession
+
+
+def test_results_are_written_in_submission_order(tmp_path, capsys):
+    database = tmp_path / "test.db"
+    connection = sqlite3.connect(database)
+    connection.execute("CREATE TABLE t (x)")
+    connection.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(1000)])
+    connection.commit()
+    session = PyliteSession(connection)
+    session.mode = "list"
+    queries = [f"SELECT {i}, count(*) FROM t a, t b WHERE a.x < {i}" for i in range(8)]
+
+    status = run_queries(session, queries, jobs=4)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert status == 0
+    assert [line.split("|")[0] for line in lines] == [str(i) for i in range(8)]
+
+
+def test_errors_are_reported_in_place(tmp_path, capsys):
+    connection = sqlite3.connect(tmp_path / "test.db")
+    session = PyliteSession(connection)
+    session.mode = "list"
+
+    status = run_queries(session, ["SELECT 1", "SELECT * FROM nope", "SELECT 3"], 2)
+
+    captured = capsys.readouterr()
+    assert status == 1
+    assert "no such table: nope" in captured.err
+    assert captured.out.split() == ["1", "3"]
@@ -0,0 +1,39 @@
+import sqlite3
+import threading
+
+import pytest
+
+from pylite.exceptions import StatementCancelled
+from pylite.progress import StatementProgress
+from pylite.runner import run_statement
+from pylite.session import PyliteSession
+
+# Takes minutes to run to the end
+LONG_QUERY = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1e10) "
+    "SELECT count(*) FROM n"
+)
+
+
+def test_statement_times_out_and_the_connection_still_works(capsys):
+    session = PyliteSession(sqlite3.connect(":memory:"))
+    session.statement_timeout = 0.05
+
+    with pytest.raises(StatementCancelled, match="timed out after 0.05s"):
+        run_statement(session, LONG_QUERY)
+
+    session.writer.mode = "list"
+    run_statement(session, "SELECT 1 + 1")
+
+    assert capsys.readouterr().out == "2\n"
+
+
+def test_cancel_interrupts_the_statement():
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+
+    with pytest.raises(StatementCancelled, match="interrupted"):
+        with StatementProgress(connection) as progress:
+            threading.Timer(0.05, progress.cancel).start()
+            connection.execute(LONG_QUERY).fetchall()
+
+    assert connection.execute("SELECT 1").fetchall() == [(1,)]
@@ -0,0 +1,66 @@
+import sqlite3
+
+import pytest
+
+from pylite.exceptions import SQLReaderError
+from pylite.input import SQLStatementSplitter, split_statements
+
+SCRIPT = """\
+-- leading comment; with a semicolon
+INSERT INTO t VALUES('a -- b; c', "x;y", [p;q]); /* block; comment */
+CREATE TRIGGER tr AFTER INSERT ON t BEGIN
+  INSERT INTO u VALUES(1);
+END;
+SELECT 'it''s';
+"""
+
+
+def test_split_statements():
+    statements = split_statements(SCRIPT)
+
+    assert len(statements) == 3
+    assert statements[0].endswith("""VALUES('a -- b; c', "x;y", [p;q]);""")
+    assert statements[1].endswith("INSERT INTO u VALUES(1);\nEND;")
+    assert statements[2] == "SELECT 'it''s';"
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 64])
+def test_chunk_boundaries_do_not_matter(size):
+    chunks = (SCRIPT[i : i + size] for i in range(0, len(SCRIPT), size))
+
+    assert list(SQLStatementSplitter().split(chunks)) == split_statements(SCRIPT)
+
+
+def test_incomplete_statement():
+    with pytest.raises(SQLReaderError):
+        split_statements("SELECT 1; SELECT 2")
+
+
+@pytest.mark.parametrize(
+    "prefix",
+    [
+        "EXPLAIN CREATE TRIGGER",
+        "EXPLAIN QUERY PLAN CREATE TRIGGER",
+        "explain create temp trigger",
+    ],
+)
+def test_explained_trigger_is_one_statement(prefix):
+    sql = f"{prefix} tr AFTER INSERT ON t BEGIN SELECT 1; END;"
+
+    assert split_statements(sql + " SELECT 2;") == [sql, "SELECT 2;"]
+
+
+def test_explain_of_other_statements():
+    sql = "EXPLAIN SELECT 1; EXPLAIN QUERY PLAN SELECT 2; EXPLAIN CREATE TABLE t(a);"
+
+    assert len(split_statements(sql)) == 3
+
+
+def test_case_end_inside_trigger_body():
+    trigger = (
+        "CREATE TRIGGER tr AFTER INSERT ON t BEGIN "
+        "UPDATE t SET a = CASE WHEN new.a > 0 THEN 1 ELSE 0 END; END;"
+    )
+
+    assert split_statements(trigger + "\nSELECT 1;") == [trigger, "SELECT 1;"]
+    assert sqlite3.complete_statement(trigger)
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def test_batch_startup_skips_interactive_modules():
+    code = (
+        "import sys, pylite.runner; "
+        "print(' '.join(m for m in ('prompt_toolkit', 'pygments', 'tabulate') "
+        "if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
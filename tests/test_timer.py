@@ -0,0 +1,55 @@
+import re
+import sqlite3
+
+import pytest
+
+from pylite.commands import handle_dot_command
+from pylite.exceptions import REPLResetEvent
+from pylite.runner import run_statement
+from pylite.session import PyliteSession
+
+SQL = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 5) "
+    "SELECT i FROM n"
+)
+
+
+def run(session, command):
+    with pytest.raises(REPLResetEvent):
+        handle_dot_command(command, session)
+
+
+def test_timer_on_reports_the_run_time(capsys):
+    session = PyliteSession(sqlite3.connect(":memory:"))
+    session.writer.mode = "list"
+
+    run(session, ".timer on")
+    run_statement(session, SQL)
+
+    captured = capsys.readouterr()
+    assert captured.out == "1\n2\n3\n4\n5\n"
+    assert re.fullmatch(r"Run Time: real \d+\.\d{3} cpu \d+\.\d{3}\n", captured.err)
+
+    run(session, ".timer off")
+    run_statement(session, SQL)
+
+    assert capsys.readouterr().err == ""
+
+
+def test_verbose_timer_breaks_the_time_down(capsys):
+    session = PyliteSession(sqlite3.connect(":memory:"))
+    session.writer.mode = "list"
+
+    run(session, ".timer verbose")
+    run_statement(session, SQL)
+
+    lines = capsys.readouterr().err.splitlines()
+    assert lines[0].startswith("Run Time: real ")
+    assert [line.split()[0] for line in lines[1:]] == [
+        "execute",
+        "fetch",
+        "format",
+        "write",
+        "rows",
+    ]
+    assert lines[-1].startswith("  rows     5 (")
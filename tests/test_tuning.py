@@ -0,0 +1,16 @@
+from pylite.tuning import connect
+
+
+def test_profile_is_applied_and_restored(tmp_path):
+    connection, tuning = connect(str(tmp_path / "t.db"), "bulk-load")
+
+    assert dict(tuning.current())["synchronous"] == "OFF"
+    assert dict(tuning.current())["cached_statements"] == 256
+
+    changes = tuning.apply("analytics-readonly")
+
+    assert ("query_only", "OFF", "ON") in changes
+    assert tuning.restore() == []
+    assert dict(tuning.current())["journal_mode"] == "delete"
+    assert dict(tuning.current())["synchronous"] == "FULL"
+    assert dict(tuning.current())["query_only"] == "OFF"